@@ -1,40 +1,24 @@
+from LCRstartup import StartupTimer
+startup = StartupTimer("LCR-Measurement")
+import os
 import sys
-import pandas as pd
-import PySimpleGUI as sg
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QTableView, QVBoxLayout, QWidget, QTabWidget, 
     QGroupBox, QRadioButton, QComboBox, QLineEdit, QPushButton, QLabel, QMessageBox, QHBoxLayout
 )
-from PyQt5.QtCore import QAbstractTableModel, Qt
+from PyQt5.QtCore import Qt, QTimer
+from LCRseries import E_SERIES_NAMES, nearest_standard_value
+from LCRunits import COMPONENT_UNITS, QUANTITY_TYPES, convert_units, get_units
 
 # Program 5: Database inspection interface_GUI/J0124-89P13
 #def program_5():
 
-# Model for displaying Pandas DataFrame in QTableView
-class PandasModel(QAbstractTableModel):
-    def __init__(self, data):
-        super(PandasModel, self).__init__()
-        self._data = data
-
-    def rowCount(self, parent=None):
-        return self._data.shape[0]
-
-    def columnCount(self, parent=None):
-        return self._data.shape[1]
+# pandas (LCR Help View) and PySimpleGUI (closing popup) are imported where
+# they are used: the calculators are painted first and the Help View is
+# filled in right after.
 
-    def data(self, index, role=Qt.DisplayRole):
-        if index.isValid():
-            if role == Qt.DisplayRole:
-                return str(self._data.iloc[index.row(), index.column()])
-        return None
-
-    def headerData(self, section, orientation, role=Qt.DisplayRole):
-        if role == Qt.DisplayRole:
-            if orientation == Qt.Horizontal:
-                return self._data.columns[section]
-            if orientation == Qt.Vertical:
-                return self._data.index[section]
-        return None
+# Mounter part-library export for the LCR Help View (sample data is shown if it is missing)
+LIBRARY_PATH = sys.argv[1] if len(sys.argv) > 1 else r"D:\NX_BACKWORK\Database_File\SMT_LCR\PartLibrary.csv"
 
 # Calculators for component tolerances
 def calculate_with_tolerance(value, lower_tolerance, upper_tolerance):
@@ -43,37 +27,27 @@ def calculate_with_tolerance(value, lower_tolerance, upper_tolerance):
     return lower_value, upper_value
 
 def capacitor_calculator(value, unit, lower_tolerance, upper_tolerance):
-    units = {"F": 1, "mF": 1e-3, "µF": 1e-6, "uF": 1e-6, "nF": 1e-9, "pF": 1e-12}
-    value_in_farads = value * units[unit]
+    value_in_farads = value * COMPONENT_UNITS["Capacitor"][unit]
     lower, upper = calculate_with_tolerance(value_in_farads, lower_tolerance, upper_tolerance)
     return value_in_farads, lower, upper
 
 def resistor_calculator(value, unit, lower_tolerance, upper_tolerance):
-    units = {"Ω": 1, "ohm": 1, "mΩ": 1e-3, "kΩ": 1e3, "MΩ": 1e6}
-    value_in_ohms = value * units[unit]
+    value_in_ohms = value * COMPONENT_UNITS["Resistor"][unit]
     lower, upper = calculate_with_tolerance(value_in_ohms, lower_tolerance, upper_tolerance)
     return value_in_ohms, lower, upper
 
 def inductor_calculator(value, unit, lower_tolerance, upper_tolerance):
-    units = {"H": 1, "mH": 1e-3, "µH": 1e-6, "uH":1e-6, "nH": 1e-9, "kH": 1e3}
-    value_in_henries = value * units[unit]
+    value_in_henries = value * COMPONENT_UNITS["Inductor"][unit]
     lower, upper = calculate_with_tolerance(value_in_henries, lower_tolerance, upper_tolerance)
     return value_in_henries, lower, upper
 
 # Unit conversion for LCR
 def lcr_unit_conversion(value, from_unit, to_unit, unit_type):
-    conversion_factors = {
-        "Capacitance": {"F": 1, "mF": 1e-3, "µF": 1e-6, "uF":1e-6, "nF": 1e-9, "pF": 1e-12},
-        "Resistance": {"Ω": 1, "ohm": 1, "mΩ": 1e-3, "kΩ": 1e3, "MΩ": 1e6},
-        "Inductance": {"H": 1, "mH": 1e-3, "µH": 1e-6, "uH":1e-6, "nH": 1e-9, "kH": 1e3}
-    }
-    factor_from = conversion_factors[unit_type][from_unit]
-    factor_to = conversion_factors[unit_type][to_unit]
-    return value * (factor_from / factor_to)
+    return convert_units(value, from_unit, to_unit, QUANTITY_TYPES[unit_type])
 
 # Main window class with tabs
 class MainWindow(QMainWindow):
-    def __init__(self, df):
+    def __init__(self, df=None):
         super().__init__()
 
         self.setWindowTitle("Component Calculator and LCR Help View")
@@ -101,15 +75,125 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.lcr_help_tab, "LCR Help View")
         lcr_layout = QVBoxLayout(self.lcr_help_tab)
 
-        # Create QTableView for LCR data
+        # Filter bar: substring match, or "min..max" for a numeric range
+        filter_layout = QHBoxLayout()
+        self.filter_column_combo = QComboBox(self)
+        self.filter_input = QLineEdit(self)
+        self.filter_input.setPlaceholderText("Text to match, or min..max for a range")
+        self.filter_input.returnPressed.connect(self.apply_filter)
+        apply_filter_btn = QPushButton("Apply Filter", self)
+        apply_filter_btn.clicked.connect(self.apply_filter)
+        clear_filter_btn = QPushButton("Clear Filters", self)
+        clear_filter_btn.clicked.connect(self.clear_filters)
+        self.filter_status_label = QLabel(self)
+        filter_layout.addWidget(QLabel("Filter Column:"))
+        filter_layout.addWidget(self.filter_column_combo)
+        filter_layout.addWidget(self.filter_input, 1)
+        filter_layout.addWidget(apply_filter_btn)
+        filter_layout.addWidget(clear_filter_btn)
+        filter_layout.addWidget(self.filter_status_label)
+        lcr_layout.addLayout(filter_layout)
+
+        self.library_status_label = QLabel(self)
+        lcr_layout.addWidget(self.library_status_label)
+        self.library_loader = None
+
+        # Create QTableView for LCR data (header click sorts through the model)
         self.table_view = QTableView()
-        model = PandasModel(df)
-        self.table_view.setModel(model)
+        self.model = None  # set by set_help_data
         lcr_layout.addWidget(self.table_view)
+        if df is not None:
+            self.set_help_data(df)
 
         # Show window maximized
         self.showMaximized()
 
+    def set_help_data(self, df):
+        """Show a frame in the LCR Help View."""
+        from LCRmodel import PandasModel
+
+        self.model = PandasModel(df)
+        self.table_view.setModel(self.model)
+        self.table_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table_view.setSortingEnabled(True)
+        self.filter_column_combo.clear()
+        self.filter_column_combo.addItems([str(column) for column in df.columns])
+        self.update_filter_status()
+
+    def load_library(self, path):
+        """Load a part-library export in the background; rows fill in as chunks are parsed."""
+        from LCRmodel import LibraryLoader
+
+        self.library_status_label.setText(f"Loading part library {path} ...")
+        self.library_rows = 0
+        self.library_loader = LibraryLoader(path, parent=self)
+        self.library_loader.chunk_loaded.connect(self.on_library_chunk)
+        self.library_loader.loading_finished.connect(lambda rows, cached: self.on_library_loaded(path, rows, cached))
+        self.library_loader.loading_failed.connect(
+            lambda error: self.library_status_label.setText(f"Could not load part library {path}: {error}"))
+        self.library_loader.start()
+
+    def on_library_chunk(self, chunk):
+        if self.library_rows == 0:
+            # First chunk replaces the sample data, whose sort no longer applies
+            self.model.set_frame(chunk.reset_index(drop=True))
+            self.table_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+            self.filter_column_combo.clear()
+            self.filter_column_combo.addItems([str(column) for column in chunk.columns])
+        else:
+            self.model.append_frame(chunk)
+        self.library_rows += len(chunk)
+        self.library_status_label.setText(f"Loading part library ... {self.library_rows} parts")
+        self.update_filter_status()
+
+    def on_library_loaded(self, path, rows, cached):
+        # The chunks are joined once here; the compacted copy follows from a second thread
+        library = self.model.finish_loading()
+        self.library_status_label.setText(f"{rows} parts loaded from {path}" + (" (cached snapshot)" if cached else ""))
+        self.update_filter_status()
+        if cached:
+            return
+        from LCRmodel import LibraryCompactor
+
+        self.library_compactor = LibraryCompactor(path, library, parent=self)
+        self.library_compactor.library_compacted.connect(
+            lambda library, report: self.on_library_compacted(path, rows, library, report))
+        self.library_compactor.start()
+
+    def on_library_compacted(self, path, rows, library, report):
+        # Same rows as the loaded chunks, held as categoricals / small ints
+        self.model.replace_frame(library)
+        self.library_status_label.setText(f"{rows} parts loaded from {path}, memory {report}")
+
+    def apply_filter(self):
+        if self.model is None:
+            return
+        column = self.filter_column_combo.currentIndex()
+        text = self.filter_input.text().strip()
+        if ".." in text:
+            try:
+                minimum, maximum = (float(part) if part.strip() else None for part in text.split("..", 1))
+            except ValueError:
+                QMessageBox.warning(self, "Input Error", "Please enter a range as min..max, e.g. -6..0")
+                return
+            self.model.set_filter(column, (minimum, maximum))
+        else:
+            self.model.set_filter(column, text)
+        self.update_filter_status()
+
+    def clear_filters(self):
+        self.filter_input.clear()
+        if self.model is None:
+            return
+        self.model.clear_filters()
+        self.update_filter_status()
+
+    def update_filter_status(self):
+        if self.model is None:
+            self.filter_status_label.setText("Loading ...")
+            return
+        self.filter_status_label.setText(f"{self.model.visible_rows()} of {self.model.total_rows()} rows")
+
 # Component Calculator with tolerance calculations
 class ComponentCalculator(QWidget):
     def __init__(self):
@@ -155,6 +239,13 @@ class ComponentCalculator(QWidget):
         layout.addWidget(QLabel("Enter Upper Tolerance (%):"))
         layout.addWidget(self.upper_tolerance_input)
 
+        # E-series used to report the nearest standard value
+        self.series_combo = QComboBox(self)
+        self.series_combo.addItems(E_SERIES_NAMES)
+        self.series_combo.setCurrentText("E24")
+        layout.addWidget(QLabel("Standard Value Series:"))
+        layout.addWidget(self.series_combo)
+
         # Calculate button
         calculate_btn = QPushButton("Calculate", self)
         calculate_btn.clicked.connect(self.calculate_result)
@@ -173,12 +264,7 @@ class ComponentCalculator(QWidget):
 
     def update_unit_combo(self, component_type):
         self.unit_combo.clear()
-        if component_type == "Capacitor":
-            self.unit_combo.addItems(["F", "mF", "µF", "uF", "nF", "pF"])
-        elif component_type == "Resistor":
-            self.unit_combo.addItems(["Ω", "ohm", "mΩ", "kΩ", "MΩ"])
-        elif component_type == "Inductor":
-            self.unit_combo.addItems(["H", "mH", "µH", "uH", "nH", "kH"])
+        self.unit_combo.addItems(get_units(component_type))
 
     def calculate_result(self):
         try:
@@ -197,6 +283,13 @@ class ComponentCalculator(QWidget):
             result_text = (f"Value: {result_value} {unit}\n"
                         f"Lower Tolerance Value: {lower_value} {unit}\n"
                         f"Upper Tolerance Value: {upper_value} {unit}")
+
+            # Nearest standard value, to catch mis-kitted reels
+            series = self.series_combo.currentText()
+            standard_value = nearest_standard_value(value, series)
+            if standard_value == standard_value:  # not nan
+                deviation = (value - standard_value) / standard_value * 100
+                result_text += f"\nNearest {series} Value: {standard_value:g} {unit} ({deviation:+.2f}%)"
             self.result_label.setText(result_text)
         except ValueError:
             QMessageBox.warning(self, "Input Error", "Please enter valid numeric values.")
@@ -246,12 +339,7 @@ class LCRUnitConverter(QWidget):
         self.from_unit_combo.clear()
         self.to_unit_combo.clear()
 
-        if unit_type == "Capacitance":
-            units = ["F", "mF", "µF", "uF", "nF", "pF"]
-        elif unit_type == "Resistance":
-            units = ["Ω", "ohm", "mΩ", "kΩ", "MΩ"]
-        elif unit_type == "Inductance":
-            units = ["H", "mH", "µH", "uH", "nH", "kH"]
+        units = get_units(QUANTITY_TYPES[unit_type])
 
         self.from_unit_combo.addItems(units)
         self.to_unit_combo.addItems(units)
@@ -273,6 +361,8 @@ class LCRUnitConverter(QWidget):
 
 # Create sample data for LCR Help View
 def create_data():
+    import pandas as pd
+
     columns = [
             'PartNumberName', 'VenderLotName', 'VENDERLOTPARTNUMBER.Basic settings_Part ShapeName',
             'VENDERLOTPARTNUMBER.Basic settings_PackageName', 'VENDERLOTPARTNUMBER.Basic settings_Barcode Label',
@@ -309,10 +399,29 @@ def create_data():
 
 #if __name__ == '__main__':
 app = QApplication(sys.argv)
-df = create_data()
-main_window = MainWindow(df)
+main_window = MainWindow()
 main_window.show()
+startup.mark("window built")
+
+def load_help_view():
+    # Runs from the event loop, after the window has been painted
+    if startup.first_paint():
+        app.quit()
+        return
+    import pandas as pd
+    from LCRlibrary import decode_library
+
+    df = create_data()
+    df = pd.concat([df, decode_library(df)], axis=1)
+    main_window.set_help_data(df)
+    if os.path.exists(LIBRARY_PATH):
+        main_window.load_library(LIBRARY_PATH)
+
+QTimer.singleShot(0, load_help_view)
 #sys.exit(app.exec_())
 app.exec_()
+if startup.exiting:
+    sys.exit()
+import PySimpleGUI as sg
 sg.Popup('Copyright (C) <2024>  <BALA GANESH>', 'Thanks For using LCR Tolerance Hint')
 sys.exit()
\ No newline at end of file
@@ -3,9 +3,11 @@ from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QPushButton,
     QTabWidget, QMessageBox, QTableView
 )
-from PyQt5.QtCore import Qt, QAbstractTableModel
+from PyQt5.QtCore import Qt
 import pandas as pd
 import math
+from LCRmodel import PandasModel
+from LCRunits import convert_units, get_units, parse_series
 
 
 # Utility functions
@@ -15,47 +17,6 @@ def calculate_with_tolerance(value, tolerance):
     max_value = value + (value * tolerance / 100)
     return min_value, max_value
 
-def get_units(component_type):
-    """Return a list of units based on the component type."""
-    units_map = {
-        "Capacitor": ["F", "mF", "µF", "uF", "nF", "pF"],
-        "Resistor": ["Ω", "ohm", "mΩ", "kΩ", "MΩ"],
-        "Inductor": ["H", "mH", "µH", "uH", "nH", "kH"]
-    }
-    return units_map.get(component_type, [])
-
-def convert_units(value, from_unit, to_unit):
-    """Convert between different units."""
-    unit_factors = {
-        "F": 1, "mF": 1e-3, "µF": 1e-6, "uF": 1e-6, "nF": 1e-9, "pF": 1e-12,
-        "Ω": 1, "ohm": 1, "mΩ": 1e-3, "kΩ": 1e3, "MΩ": 1e6,
-        "H": 1, "mH": 1e-3, "µH": 1e-6, "uH": 1e-6, "nH": 1e-9, "kH": 1e3
-    }
-    return value * unit_factors[from_unit] / unit_factors[to_unit]
-
-# Pandas Model for QTableView
-class PandasModel(QAbstractTableModel):
-    def __init__(self, data):
-        super().__init__()
-        self._data = data
-
-    def rowCount(self, parent=None):
-        return self._data.shape[0]
-
-    def columnCount(self, parent=None):
-        return self._data.shape[1]
-
-    def data(self, index, role=Qt.DisplayRole):
-        if role == Qt.DisplayRole:
-            return str(self._data.iloc[index.row(), index.column()])
-
-    def headerData(self, section, orientation, role=Qt.DisplayRole):
-        if role == Qt.DisplayRole:
-            if orientation == Qt.Horizontal:
-                return self._data.columns[section]
-            if orientation == Qt.Vertical:
-                return str(self._data.index[section])
-
 # Component Calculator Tab
 class ComponentCalculator(QWidget):
     def __init__(self):
@@ -174,6 +135,8 @@ class DataViewer(QWidget):
         self.table_view = QTableView()
         self.model = PandasModel(data)
         self.table_view.setModel(self.model)
+        self.table_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table_view.setSortingEnabled(True)
 
         layout.addWidget(self.table_view)
         self.setLayout(layout)
@@ -199,7 +162,10 @@ def create_data():
         "Value": ["10uF", "1kΩ", "10mH"],
         "Tolerance": ["5%", "1%", "10%"]
     }
-    return pd.DataFrame(data)
+    df = pd.DataFrame(data)
+    parsed = parse_series(df["Value"])
+    df["SI Value"] = parsed["Value"].map("{:.3e}".format) + " " + parsed["Unit"]
+    return df
 
 def main():
     app = QApplication(sys.argv)
@@ -0,0 +1,226 @@
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from LCRperf import span
+from LCRsearch import RECORD_COLUMNS, normalize_material, normalize_materials
+
+# Archive of old correction records: zstd-compressed Parquet, one folder per
+# month (hive style, month=2024-07), sorted by material and time inside a
+# month so each row group covers a narrow range of materials. Queries push
+# time, material, line and component predicates down to pyarrow, which
+# skips whole month folders and row groups whose statistics cannot match.
+#
+# pyarrow is optional: only compaction and queries need it.
+
+ARCHIVE_DIR = r"D:\NX_BACKWORK\Database_File\SMT_LCR\LCR-Correction Archive"
+ARCHIVE_AFTER_DAYS = 180
+ROW_GROUP_ROWS = 5000
+
+# Record Timestamp formats: when saved, and when mailed (see LCRsearch.timestamp)
+TIMESTAMP_FORMATS = ("%Y-%m-%d %I:%M %p", "%Y-%m-%d %H:%M:%S")
+
+# Columns added for the query predicates
+ARCHIVE_COLUMNS = RECORD_COLUMNS + ["Time", "Key", "Component"]
+
+# Base unit of the Standard Value -> component
+COMPONENTS = {"F": "Capacitor", "Ω": "Resistor", "H": "Inductor"}
+
+
+def _pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.dataset
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise ImportError("The correction archive needs pyarrow (pip install pyarrow)") from None
+    return pyarrow
+
+
+def parse_timestamps(series):
+    """Record Timestamp text -> datetimes (NaT when unreadable)."""
+    times = pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+    text = series.astype(str).str.strip()
+    for pattern in TIMESTAMP_FORMATS:
+        missing = times.isna()
+        times[missing] = pd.to_datetime(text[missing], format=pattern, errors="coerce")
+    return times
+
+
+def archive_frame(records):
+    """Add the Time, Key and Component query columns to correction records (all text)."""
+    from LCRunits import parse_series
+
+    records = records.reindex(columns=list(dict.fromkeys(RECORD_COLUMNS + list(records.columns))))
+    records = records.astype(object).where(records.notna(), None)
+    units = parse_series(records["Standard Value"].fillna(""))["Unit"]
+    return records.assign(Time=parse_timestamps(records["Timestamp"]),
+                          Key=normalize_materials(records["Material"]),
+                          Component=units.map(COMPONENTS).fillna("").to_numpy())
+
+
+def write_partitions(frame, archive_dir, run_id):
+    """Write an archive frame as one Parquet file per month; returns the paths written."""
+    pa = _pyarrow()
+
+    paths = []
+    frame = frame.sort_values(["Key", "Time"], kind="stable")
+    for month, part in frame.groupby(frame["Time"].dt.strftime("%Y-%m"), sort=True):
+        folder = os.path.join(archive_dir, f"month={month}")
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"part-{run_id}.parquet")
+        text_columns = [column for column in part.columns if column != "Time"]
+        table = pa.Table.from_pandas(part.astype({column: "string" for column in text_columns}), preserve_index=False)
+        with span("archive write", month=month, rows=len(part)):
+            pa.parquet.write_table(table, path, compression="zstd", row_group_size=ROW_GROUP_ROWS,
+                                   write_statistics=True)
+        paths.append(path)
+    return paths
+
+
+def compact_records(record_path, archive_dir=ARCHIVE_DIR, older_than_days=ARCHIVE_AFTER_DAYS, now=None):
+    """Move records older than ``older_than_days`` from the record workbook into the archive.
+
+    The archive is written first; the workbook is then rewritten with the
+    remaining records. When the workbook cannot be replaced (open in
+    Excel) the new archive files are removed again, so nothing is counted
+    twice. Returns the number of records archived.
+    """
+    _pyarrow()
+    with span("record read"):
+        records = pd.read_excel(record_path, dtype=str)
+    frame = archive_frame(records)
+    cutoff = (now or datetime.now()) - timedelta(days=older_than_days)
+    old = (frame["Time"] < cutoff).to_numpy()  # records without a readable time stay in the workbook
+    if not old.any():
+        return 0
+
+    paths = write_partitions(frame[old], archive_dir, (now or datetime.now()).strftime("%Y%m%d-%H%M%S"))
+    temp_path = record_path + ".tmp.xlsx"
+    try:
+        with span("record write", rows=int((~old).sum())):
+            records[~old].to_excel(temp_path, index=False)
+        os.replace(temp_path, record_path)
+    except OSError:
+        for path in paths:
+            os.remove(path)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return int(old.sum())
+
+
+def _to_list(value):
+    return None if value is None else list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def query_filter(start=None, end=None, materials=None, lines=None, components=None, partitions=True):
+    """pyarrow filter for query(): times as datetimes, the others as strings or lists of strings.
+
+    With ``partitions=False`` the month folder conditions are left out, for
+    filtering the row groups of one file.
+    """
+    ds = _pyarrow().dataset
+    conditions = []
+    if start is not None:
+        conditions.append(ds.field("Time") >= pd.Timestamp(start))
+        if partitions:
+            conditions.append(ds.field("month") >= f"{start:%Y-%m}")
+    if end is not None:
+        conditions.append(ds.field("Time") < pd.Timestamp(end))
+        if partitions:
+            conditions.append(ds.field("month") <= f"{end:%Y-%m}")
+    if materials is not None:
+        conditions.append(ds.field("Key").isin([normalize_material(material) for material in _to_list(materials)]))
+    if lines is not None:
+        conditions.append(ds.field("Line").isin(_to_list(lines)))
+    if components is not None:
+        conditions.append(ds.field("Component").isin(_to_list(components)))
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def open_archive(archive_dir=ARCHIVE_DIR):
+    ds = _pyarrow().dataset
+    return ds.dataset(archive_dir, format="parquet", partitioning="hive")
+
+
+def query(archive_dir=ARCHIVE_DIR, start=None, end=None, materials=None, lines=None, components=None, columns=None):
+    """Archived records matching every given predicate, as a DataFrame sorted by time.
+
+    ``start`` is inclusive and ``end`` exclusive, e.g. Q3 2024 is
+    start=datetime(2024, 7, 1), end=datetime(2024, 10, 1).
+    """
+    if not os.path.isdir(archive_dir):
+        return pd.DataFrame(columns=columns or ARCHIVE_COLUMNS)
+    expression = query_filter(start, end, materials, lines, components)
+    with span("archive query"):
+        table = open_archive(archive_dir).to_table(filter=expression, columns=columns)
+    df = table.to_pandas()
+    return df.drop(columns=["month"], errors="ignore").sort_values("Time", kind="stable", ignore_index=True) \
+        if "Time" in df.columns else df
+
+
+def scan_stats(archive_dir=ARCHIVE_DIR, **predicates):
+    """(row groups in the archive, row groups a query with ``predicates`` has to read)."""
+    expression = query_filter(**predicates)
+    dataset = open_archive(archive_dir)
+    total = sum(fragment.metadata.num_row_groups for fragment in dataset.get_fragments())
+    if expression is None:
+        return total, total
+    row_filter = query_filter(**predicates, partitions=False)
+    read = sum(len(fragment.split_by_row_group(row_filter)) for fragment in dataset.get_fragments(expression))
+    return total, read
+
+
+def _date(text):
+    return datetime.strptime(text, "%Y-%m-%d")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old correction records to Parquet and query the archive.")
+    parser.add_argument("--archive", default=ARCHIVE_DIR, help="Archive folder (default next to the record file)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compact = commands.add_parser("compact", help="Move old records from the record workbook into the archive")
+    compact.add_argument("record_file", help="LCR-Correction Record workbook")
+    compact.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS,
+                         help=f"Archive records older than this many days (default {ARCHIVE_AFTER_DAYS})")
+
+    search = commands.add_parser("query", help="Query the archive")
+    search.add_argument("--start", type=_date, help="From this date (YYYY-MM-DD)")
+    search.add_argument("--end", type=_date, help="Up to, not including, this date (YYYY-MM-DD)")
+    search.add_argument("--material", action="append", help="Material (repeatable)")
+    search.add_argument("--line", action="append", help="Line (repeatable)")
+    search.add_argument("--component", action="append", choices=sorted(COMPONENTS.values()), help="Component type")
+    search.add_argument("--output", help="Write the matching records to this .xlsx/.csv")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "compact":
+            archived = compact_records(args.record_file, args.archive, args.days)
+            print(f"{archived} record(s) archived to {args.archive}")
+            return
+        predicates = dict(start=args.start, end=args.end, materials=args.material, lines=args.line,
+                          components=args.component)
+        df = query(args.archive, **predicates)
+        total, read = scan_stats(args.archive, **predicates)
+    except (ImportError, OSError) as e:
+        raise SystemExit(str(e))
+    print(f"{len(df)} record(s); {read} of {total} row groups read", file=sys.stderr)
+    if args.output:
+        if args.output.lower().endswith(".csv"):
+            df.to_csv(args.output, index=False, encoding="utf-8-sig")
+        else:
+            df.to_excel(args.output, index=False)
+    else:
+        print(df[RECORD_COLUMNS].to_string(index=False, max_rows=50))
+
+
+if __name__ == "__main__":
+    main()
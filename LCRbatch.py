@@ -0,0 +1,103 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from LCRcalc import batch_convert, tolerance_limits, unit_factors
+from LCRlibrary import iter_table_chunks
+from LCRunits import ALL_UNITS, COMPONENT_UNITS, UNIT_BASES, parse_series
+
+# Headless counterpart of the Component Calculator and LCR Unit Converter tabs.
+# Input is read in chunks and every chunk is written out before the next one
+# is read, so memory stays constant whatever the spreadsheet size.
+
+
+def _values_in_si(chunk, value_col, unit_col, component_type):
+    """Return SI values of a chunk: value x unit, or parsed "10uF"-style text when no unit column."""
+    if unit_col:
+        values = pd.to_numeric(chunk[value_col], errors="coerce").to_numpy(dtype=float)
+        return values * unit_factors(chunk[unit_col].fillna("").astype(str).to_numpy(), component_type)
+    return parse_series(chunk[value_col])["Value"].to_numpy()
+
+
+def tolerance_chunk(chunk, args):
+    """Add Nominal/Lower/Upper (SI) columns to one chunk."""
+    nominal = _values_in_si(chunk, args.value_col, args.unit_col, args.component)
+    lower_col = args.lower_col or args.tolerance_col
+    upper_col = args.upper_col or args.tolerance_col
+    lower_tolerance = pd.to_numeric(chunk[lower_col], errors="coerce") if lower_col else args.tolerance
+    upper_tolerance = pd.to_numeric(chunk[upper_col], errors="coerce") if upper_col else args.tolerance
+
+    lower, upper = tolerance_limits(nominal, lower_tolerance, upper_tolerance)
+    return chunk.assign(**{"Nominal (SI)": nominal, "Lower Limit (SI)": lower, "Upper Limit (SI)": upper})
+
+
+def convert_chunk(chunk, args):
+    """Add a converted value column to one chunk."""
+    # "2.2nH" or "4.7kΩ" cannot become nF: values whose own unit is of another quantity are blanked out
+    target = UNIT_BASES[args.to_unit]
+    if args.unit_col:
+        values = pd.to_numeric(chunk[args.value_col], errors="coerce").to_numpy(dtype=float)
+        from_units = chunk[args.unit_col].fillna("").astype(str)
+        converted = batch_convert(values, from_units.to_numpy(), args.to_unit, args.component)
+        converted[(from_units.map(UNIT_BASES) != target).to_numpy()] = np.nan
+    else:
+        parsed = parse_series(chunk[args.value_col])
+        converted = parsed["Value"].to_numpy() / unit_factors(args.to_unit, args.component)
+        converted[((parsed["Unit"] != "") & (parsed["Unit"] != target)).to_numpy()] = np.nan
+    return chunk.assign(**{f"Value ({args.to_unit})": converted})
+
+
+def run(args):
+    """Stream the input through the selected calculation; returns (rows, seconds)."""
+    process = tolerance_chunk if args.command == "tolerance" else convert_chunk
+    to_stdout = args.output_file == "-"
+    rows = 0
+    start = time.perf_counter()
+    for chunk in iter_table_chunks(args.input_file, args.chunksize):
+        result = process(chunk, args)
+        result.to_csv(sys.stdout if to_stdout else args.output_file, mode="a" if rows else "w",
+                      header=rows == 0, index=False, lineterminator="\n")
+        rows += len(result)
+        if args.progress:
+            elapsed = time.perf_counter() - start
+            print(f"{rows} rows, {rows / elapsed:,.0f} rows/s", file=sys.stderr)
+    return rows, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch tolerance and unit conversion for CSV/xlsx files.")
+    parser.add_argument("--chunksize", type=int, default=50000, help="Rows per chunk (default 50000)")
+    parser.add_argument("--component", choices=list(COMPONENT_UNITS),
+                        help="Restrict units to one component type")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    tolerance = commands.add_parser("tolerance", help="Compute nominal, lower and upper limits in SI units")
+    convert = commands.add_parser("convert", help="Convert values to another unit")
+    for command in (tolerance, convert):
+        command.add_argument("input_file", help="Input .csv or .xlsx")
+        command.add_argument("output_file", help="Output .csv, or - for stdout")
+        command.add_argument("--value-col", default="Value", help="Value column (default Value)")
+        command.add_argument("--unit-col", help="Unit column; without it values are parsed as text such as 10uF or 4k7")
+        command.add_argument("--progress", action="store_true", help="Report progress after every chunk")
+
+    tolerance.add_argument("--tolerance-col", help="Symmetric tolerance column (%%)")
+    tolerance.add_argument("--lower-col", help="Lower tolerance column (%%)")
+    tolerance.add_argument("--upper-col", help="Upper tolerance column (%%)")
+    tolerance.add_argument("--tolerance", type=float, default=np.nan,
+                           help="Tolerance (%%) used when no tolerance column is given")
+    convert.add_argument("--to-unit", required=True, help="Target unit, e.g. nF")
+
+    args = parser.parse_args()
+    if args.command == "convert":
+        known = COMPONENT_UNITS[args.component] if args.component else ALL_UNITS
+        if args.to_unit not in known:
+            parser.error(f"unknown --to-unit {args.to_unit!r}; choose from {', '.join(known)}")
+    rows, seconds = run(args)
+    print(f"{rows} rows in {seconds:.2f} s ({rows / seconds if seconds else 0:,.0f} rows/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from LCRcalc import batch_tolerance
+from LCRcheck import evaluate_measurements
+from LCRsearch import RECORD_COLUMNS, append_record, list_bom_files, render_mail, search_file
+
+# Benchmarks on synthetic data shaped like the production exports: an
+# SMT_BOM folder (both header layouts) and a correction record workbook.
+# Results are one JSON object so runs can be compared across releases.
+
+HEADER_LAYOUTS = [("Material", "Long. Description"), ("Internal P/N", "Description")]
+DESCRIPTION_WORDS = ["CAP CER", "RES CHIP", "IND PWR", "FERRITE", "DIODE", "IC"]
+VALUE_TEXT = ["10uF", "100nF", "4.7kΩ", "10Ω", "2.2uH", "1uF"]
+
+
+def _materials(rng, count):
+    return [str(number) for number in rng.integers(10000000, 99999999, count)]
+
+
+def make_bom_folder(folder, files=10, rows=5000, seed=0):
+    """Write ``files`` BOM workbooks of ``rows`` rows each, alternating the two header layouts.
+
+    Materials are drawn from a shared pool so the same material appears in
+    several files, as on the line. Returns the material pool.
+    """
+    rng = np.random.default_rng(seed)
+    pool = _materials(rng, max(1, files * rows // 5))
+    os.makedirs(folder, exist_ok=True)
+    for number in range(files):
+        material_col, desc_col = HEADER_LAYOUTS[number % len(HEADER_LAYOUTS)]
+        picks = rng.integers(0, len(pool), rows)
+        df = pd.DataFrame({
+            "Item": np.arange(1, rows + 1),
+            material_col: [pool[pick] for pick in picks],
+            desc_col: [f"{DESCRIPTION_WORDS[pick % 6]} {VALUE_TEXT[pick % 6]} {pick % 997:04d}" for pick in picks],
+            "Qty": rng.integers(1, 20, rows),
+        })
+        df.to_excel(os.path.join(folder, f"BOM_{number:03d}.xlsx"), index=False)
+    return pool
+
+
+def make_records(rows=1000, seed=0):
+    """Return a frame of ``rows`` synthetic correction records."""
+    rng = np.random.default_rng(seed)
+    nominal = rng.choice([1.0, 2.2, 4.7, 10.0, 22.0, 47.0], rows)
+    unit = rng.choice(["uF", "nF", "kΩ", "uH"], rows)
+    return pd.DataFrame({
+        "Material": _materials(rng, rows),
+        "Description": [f"{DESCRIPTION_WORDS[i % 6]} {i:05d}" for i in range(rows)],
+        "File": [f"BOM_{i % 50:03d}.xlsx" for i in range(rows)],
+        "Line": rng.choice(["L1", "L2", "L3"], rows),
+        "Machine & Side": rng.choice(["NXT-1 F", "NXT-1 R", "NXT-2 F"], rows),
+        "Standard Value": [f"{value:g}{u}" for value, u in zip(nominal, unit)],
+        "Measured Value": [f"{value:.3g}" for value in nominal * rng.normal(1, 0.05, rows)],
+        "AVL": rng.choice(["A", "B"], rows),
+        "Error": "",
+        "Remarks": "",
+        "Standard Tol%": rng.choice(["5", "10", "20"], rows),
+        "Correction Tol%": rng.choice(["10", "20", "30"], rows),
+        "Timestamp": datetime.now().strftime("%Y-%m-%d %I:%M %p"),
+        "Status": "Saved",
+    }, columns=RECORD_COLUMNS)
+
+
+def _timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, result
+
+
+def bench_search(folder, pool, lookups, seed=0):
+    """Search every BOM file for ``lookups`` materials, as the Find button does."""
+    rng = np.random.default_rng(seed + 1)
+    paths = [os.path.join(folder, name) for name in list_bom_files(folder)]
+    values = [pool[pick] for pick in rng.integers(0, len(pool), lookups)]
+    hits = 0
+    started = time.perf_counter()
+    for value in values:
+        for path in paths:
+            hits += len(search_file(path, value))
+    seconds = time.perf_counter() - started
+    return {"files": len(paths), "lookups": lookups, "hits": hits, "seconds": round(seconds, 4),
+            "seconds_per_lookup": round(seconds / lookups, 4)}
+
+
+def bench_appends(path, records, appends):
+    """Append records one at a time to a record workbook that already holds ``records``."""
+    make_records(records).to_excel(path, index=False)
+    new = make_records(appends, seed=1).to_dict("records")
+    started = time.perf_counter()
+    for record in new:
+        append_record(path, dict(record))
+    seconds = time.perf_counter() - started
+    return {"existing_records": records, "appends": appends, "seconds": round(seconds, 4),
+            "seconds_per_append": round(seconds / appends, 4)}
+
+
+def bench_mail(renders):
+    """Render the correction mail text ``renders`` times."""
+    records = make_records(min(renders, 1000)).to_dict("records")
+    started = time.perf_counter()
+    for number in range(renders):
+        render_mail(records[number % len(records)])
+    seconds = time.perf_counter() - started
+    return {"renders": renders, "seconds": round(seconds, 4), "renders_per_second": round(renders / seconds)}
+
+
+def bench_calculator(rows):
+    """Time the vectorized tolerance calculator and record evaluator over ``rows`` rows."""
+    records = make_records(rows)
+    rng = np.random.default_rng(2)
+    values = rng.uniform(1, 100, rows)
+    units = rng.choice(["uF", "nF", "pF"], rows)
+    tolerance_seconds, _ = _timed(batch_tolerance, values, units, 5.0, 10.0)
+    evaluate_seconds, _ = _timed(evaluate_measurements, records)
+    return {"rows": rows,
+            "tolerance_rows_per_second": round(rows / tolerance_seconds),
+            "evaluate_rows_per_second": round(rows / evaluate_seconds)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark search, record and calculator paths on synthetic data.")
+    parser.add_argument("--files", type=int, default=10, help="Synthetic BOM files (default 10)")
+    parser.add_argument("--rows", type=int, default=5000, help="Rows per BOM file (default 5000)")
+    parser.add_argument("--lookups", type=int, default=5, help="Materials searched (default 5)")
+    parser.add_argument("--records", type=int, default=2000, help="Records already in the record file (default 2000)")
+    parser.add_argument("--appends", type=int, default=10, help="Records appended (default 10)")
+    parser.add_argument("--renders", type=int, default=100000, help="Mail bodies rendered (default 100000)")
+    parser.add_argument("--calc-rows", type=int, default=200000, help="Rows through the calculators (default 200000)")
+    parser.add_argument("--folder", help="Keep the synthetic data in this folder instead of a temporary one")
+    parser.add_argument("--label", default="", help="Release or commit the numbers belong to")
+    parser.add_argument("--output", help="Append the result as one JSON line to this file (default: stdout only)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary:
+        folder = args.folder or temporary
+        bom_folder = os.path.join(folder, "SMT_BOM")
+        generate_seconds, pool = _timed(make_bom_folder, bom_folder, args.files, args.rows)
+        print(f"Generated {args.files} x {args.rows} BOM rows in {generate_seconds:.1f} s", file=sys.stderr)
+
+        result = {
+            "label": args.label,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "pandas": pd.__version__,
+            "search": bench_search(bom_folder, pool, args.lookups),
+            "append": bench_appends(os.path.join(folder, "LCR-Correction Record.xlsx"), args.records, args.appends),
+            "mail": bench_mail(args.renders),
+            "calculator": bench_calculator(args.calc_rows),
+        }
+
+    line = json.dumps(result)
+    print(line)
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as output:
+            output.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import numpy as np
+
+from LCRunits import ALL_UNITS, COMPONENT_UNITS
+
+
+def unit_factors(units, component_type=None):
+    """Map a unit string or an array of unit strings to SI scale factors.
+
+    Unknown units give NaN so that one bad row does not stop a whole batch.
+    """
+    table = COMPONENT_UNITS[component_type] if component_type else ALL_UNITS
+    if np.ndim(units) == 0:
+        return np.float64(table.get(units, np.nan))
+
+    # Look up each distinct unit once and scatter the factors back to the rows
+    distinct, inverse = np.unique(np.asarray(units, dtype=str), return_inverse=True)
+    factors = np.array([table.get(unit, np.nan) for unit in distinct], dtype=float)
+    return factors[inverse.reshape(-1)].reshape(np.shape(units))
+
+
+def tolerance_limits(nominal, lower_tolerance, upper_tolerance):
+    """Return lower and upper bound arrays for nominal values (tolerances in percent)."""
+    nominal = np.asarray(nominal, dtype=float)
+    lower_tolerance = np.asarray(lower_tolerance, dtype=float)
+    upper_tolerance = np.asarray(upper_tolerance, dtype=float)
+    lower = nominal - (nominal * lower_tolerance / 100)
+    upper = nominal + (nominal * upper_tolerance / 100)
+    return lower, upper
+
+
+def batch_tolerance(values, units, lower_tolerance, upper_tolerance, component_type=None):
+    """Return nominal, lower and upper bound arrays in SI units.
+
+    All arguments may be scalars or array-likes (lists, NumPy arrays, pandas
+    Series) and are broadcast against each other. Tolerances are in percent.
+    """
+    values = np.asarray(values, dtype=float)
+    nominal = values * unit_factors(units, component_type)
+    lower, upper = tolerance_limits(nominal, lower_tolerance, upper_tolerance)
+    return nominal, lower, upper
+
+
+def batch_symmetric_tolerance(values, units, tolerance, component_type=None):
+    """Return nominal, min and max arrays for a symmetric +/- tolerance."""
+    return batch_tolerance(values, units, tolerance, tolerance, component_type)
+
+
+def batch_convert(values, from_units, to_units, component_type=None):
+    """Convert arrays of values between units; unknown units give NaN."""
+    values = np.asarray(values, dtype=float)
+    return values * unit_factors(from_units, component_type) / unit_factors(to_units, component_type)
@@ -0,0 +1,140 @@
+import argparse
+import re
+
+import numpy as np
+import pandas as pd
+
+from LCRunits import parse_series
+
+# Correction record columns read by the evaluator
+STANDARD_VALUE = "Standard Value"
+MEASURED_VALUE = "Measured Value"
+STANDARD_TOL = "Standard Tol%"
+CORRECTION_TOL = "Correction Tol%"
+
+# Columns added by the evaluator
+RESULT_COLUMNS = ["Deviation%", "Within Standard Tol", "Within Correction Tol", "Margin%"]
+
+_TOLERANCE_NUMBER = re.compile(r"([+-]?)\s*(\d+(?:\.\d+)?|\.\d+)")
+
+
+def _tolerance_limits(text):
+    """(lower, upper) percent of one tolerance cell; NaN for both when it is not a clean tolerance."""
+    numbers = _TOLERANCE_NUMBER.findall(text)
+    if len(numbers) == 1:  # "5", "5%", "±5 %", "+/-0.5"
+        return float(numbers[0][1]), float(numbers[0][1])
+    if len(numbers) == 2 and {numbers[0][0], numbers[1][0]} == {"+", "-"}:  # "+10/-5", "-5% +10%"
+        limits = {sign: float(number) for sign, number in numbers}
+        return limits["-"], limits["+"]
+    return float("nan"), float("nan")
+
+
+def parse_tolerance_limits(series):
+    """Parse tolerance cells into a frame of "Lower" / "Upper" percentages (both positive).
+
+    Symmetric cells ("5", "±5 %", "+/-0.5") give the same value twice;
+    "+10/-5" gives Lower 5, Upper 10. Anything else is NaN.
+    """
+    # Tolerance columns hold a handful of distinct values: parse each one once
+    codes, uniques = pd.factorize(series)
+    parsed = np.array([_tolerance_limits(str(value)) for value in uniques], dtype=float).reshape(-1, 2)
+    parsed = np.vstack([parsed, [np.nan, np.nan]])  # code -1 (missing) picks the NaN row
+    return pd.DataFrame(parsed[codes], columns=["Lower", "Upper"], index=series.index)
+
+
+def parse_tolerance(series):
+    """Parse symmetric tolerance cells such as "5", "5%", "±5 %" or "+/-0.5" into floats.
+
+    Asymmetric cells ("+10/-5") are NaN here; see parse_tolerance_limits().
+    """
+    limits = parse_tolerance_limits(series)
+    return limits["Upper"].where(limits["Upper"] == limits["Lower"])
+
+
+def evaluate_measurements(df):
+    """Evaluate measured against standard values for every row of a measurement table.
+
+    ``df`` needs the Standard Value and Measured Value columns; Standard Tol%
+    and Correction Tol% are used when present, asymmetric ones ("+10/-5")
+    included. Values may carry units ("10uF", "4k7"); a bare measured
+    number is read in the unit of its standard value. Returns a frame with
+    Deviation%, Within Standard Tol, Within Correction Tol and Margin%
+    (distance to the nearer standard tolerance limit, in percentage points)
+    aligned with ``df``.
+    """
+    standard = parse_series(df[STANDARD_VALUE])
+    measured = parse_series(df[MEASURED_VALUE])
+
+    measured_value = measured["Value"].to_numpy()
+    bare = (measured["Unit"] == "").to_numpy() & (measured["Scale"] == 1).to_numpy()
+    measured_value = np.where(bare, measured_value * standard["Scale"].to_numpy(), measured_value)
+
+    standard_value = standard["Value"].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deviation = (measured_value - standard_value) / standard_value * 100
+    # Round away float noise so that exactly-on-limit readings compare as in tolerance
+    deviation = np.round(np.where(np.isfinite(deviation), deviation, np.nan), 6)
+
+    result = pd.DataFrame({"Deviation%": deviation}, index=df.index)
+    for column, label in ((STANDARD_TOL, "Within Standard Tol"), (CORRECTION_TOL, "Within Correction Tol")):
+        if column in df.columns:
+            limits = parse_tolerance_limits(df[column])
+            lower, upper = limits["Lower"].to_numpy(), limits["Upper"].to_numpy()
+        else:
+            lower = upper = np.full(len(df), np.nan)
+        margin = np.minimum(upper - deviation, deviation + lower)
+        within = pd.array(margin >= 0, dtype="boolean")
+        within[np.isnan(margin)] = pd.NA
+        result[label] = within
+        if column == STANDARD_TOL:
+            result["Margin%"] = margin
+    return result[RESULT_COLUMNS]
+
+
+def evaluate_record(record):
+    """Evaluate a single correction record (a dict of field -> text)."""
+    row = pd.DataFrame([{field: record.get(field, "") for field in
+                         (STANDARD_VALUE, MEASURED_VALUE, STANDARD_TOL, CORRECTION_TOL)}])
+    result = evaluate_measurements(row).iloc[0]
+    return {column: (None if pd.isna(result[column]) else result[column].item()) for column in RESULT_COLUMNS}
+
+
+def format_evaluation(result):
+    """Format an evaluate_record() result as a one-line summary for the popup."""
+    if result["Deviation%"] is None:
+        return ""
+
+    def verdict(value):
+        return "-" if value is None else ("PASS" if value else "FAIL")
+
+    text = (f"Deviation: {result['Deviation%']:+.2f}% | "
+            f"Standard Tol: {verdict(result['Within Standard Tol'])} | "
+            f"Correction Tol: {verdict(result['Within Correction Tol'])}")
+    if result["Margin%"] is not None:
+        text += f" | Margin: {result['Margin%']:+.2f}%"
+    return text
+
+
+def evaluate_history(lcr_file_path, output_path=None):
+    """Evaluate every record in the LCR-Correction Record file in one pass."""
+    df = pd.read_excel(lcr_file_path, dtype=str)
+    df = df.drop(columns=[column for column in RESULT_COLUMNS if column in df.columns])
+    df = pd.concat([df, evaluate_measurements(df)], axis=1)
+    if output_path:
+        df.to_excel(output_path, index=False)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate measured vs standard values of the LCR correction history.")
+    parser.add_argument("record_file", help="LCR-Correction Record.xlsx")
+    parser.add_argument("output_file", nargs="?", help="Write the evaluated records to this xlsx file")
+    args = parser.parse_args()
+
+    df = evaluate_history(args.record_file, args.output_file)
+    failed = df["Within Standard Tol"].eq(False).sum()
+    print(f"{len(df)} records evaluated, {failed} out of standard tolerance")
+
+
+if __name__ == "__main__":
+    main()
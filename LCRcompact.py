@@ -0,0 +1,148 @@
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Cells that stand for "no value" in part-library and BOM exports, such as
+# the '-' separator rows of the LCR Help View sample
+NA_VALUES = ("-", "")
+
+_INT_DTYPES = ["Int8", "Int16", "Int32", "Int64"]
+_INTEGER_TEXT = r"[-+]?(?:0|[1-9]\d{0,17})(?:\.0+)?"  # at most 18 digits, so it fits int64
+
+
+def frame_memory(df):
+    """Bytes held by a frame, counting each shared Python object only once.
+
+    pandas' deep memory_usage counts an interned string once per row; this
+    counts the row pointers plus every distinct object, which is what the
+    process really holds.
+    """
+    total = df.index.memory_usage(deep=True)
+    for _, column in df.items():
+        if column.dtype == object:
+            values = column.to_numpy()
+            distinct = {id(value): value for value in values}
+            total += values.nbytes + sum(sys.getsizeof(value) for value in distinct.values())
+        else:
+            total += column.memory_usage(deep=True, index=False)
+    return int(total)
+
+
+def _small_int(column):
+    """Return the column as the smallest nullable integer dtype, or None if it holds other values.
+
+    Each distinct cell is checked once. Text cells only count as integers
+    when they read back unchanged, so package codes such as "0402" keep
+    their leading zero.
+    """
+    codes, uniques = pd.factorize(column)
+    if column.dtype.kind in "iu":
+        if column.dtype.kind == "u" and len(uniques) and int(np.max(uniques)) > np.iinfo(np.int64).max:
+            return None
+        numbers = np.asarray(uniques, dtype=np.int64)
+    else:
+        text = pd.Series(uniques, dtype=object).astype(str).str.strip()
+        missing = text.isin(NA_VALUES).to_numpy(dtype=bool)
+        if not text[~missing].str.fullmatch(_INTEGER_TEXT).all():
+            return None
+        numbers = np.zeros(len(text), dtype=np.int64)
+        numbers[~missing] = text[~missing].str.replace(r"\.0+$", "", regex=True).astype(np.int64).to_numpy()
+        if missing.any():
+            codes = np.where(missing[codes], -1, codes)
+        numbers = np.where(missing, 0, numbers)
+        uniques = numbers[~missing]
+    low, high = (int(np.min(uniques)), int(np.max(uniques))) if len(uniques) else (0, 0)
+
+    for dtype in _INT_DTYPES:
+        info = np.iinfo(dtype.lower())
+        if info.min <= low and high <= info.max:
+            mask = codes < 0
+            values = np.append(numbers, 0).astype(dtype.lower())[codes]  # code -1 picks the appended 0
+            return pd.Series(pd.arrays.IntegerArray(values, mask), index=column.index, name=column.name)
+    return None
+
+
+def _interned(column):
+    """Return an object column whose repeated strings share one interned object."""
+    codes, uniques = pd.factorize(column)
+    interned = np.array([sys.intern(value) if isinstance(value, str) else value for value in uniques] + [None],
+                        dtype=object)
+    return pd.Series(interned[codes], index=column.index, name=column.name, dtype=object)
+
+
+def compact_frame(df, category_ratio=0.5, int_columns=True, text_columns=()):
+    """Return a memory-compact copy of a part-library or BOM frame.
+
+    Code columns holding only small integers (plus '-' / empty cells) become
+    nullable Int8..Int64, except ``text_columns`` such as part numbers;
+    text columns whose distinct values are at most ``category_ratio`` of
+    the rows become categoricals; remaining object text columns have their
+    repeated strings interned.
+    """
+    compacted = {}
+    for name, column in df.items():
+        if column.dtype.kind in "fcmMb" or isinstance(column.dtype, pd.CategoricalDtype):
+            compacted[name] = column
+            continue
+        if int_columns and name not in text_columns:
+            small = _small_int(column)
+            if small is not None:
+                compacted[name] = small
+                continue
+        if column.dtype.kind in "iu":
+            compacted[name] = column
+            continue
+
+        non_null = column.notna().sum()
+        if non_null and column.nunique() <= category_ratio * non_null:
+            compacted[name] = column.astype("category")
+        elif column.dtype == object:
+            compacted[name] = _interned(column)
+        else:
+            compacted[name] = column
+    return pd.DataFrame(compacted, index=df.index)
+
+
+def compact_with_report(df, **kwargs):
+    """Compact a frame and return (compacted, report) with memory before and after."""
+    before = frame_memory(df)
+    compacted = compact_frame(df, **kwargs)
+    after = frame_memory(compacted)
+    report = {
+        "rows": len(df),
+        "bytes_before": before,
+        "bytes_after": after,
+        "dtypes": {str(name): str(dtype) for name, dtype in compacted.dtypes.items()},
+    }
+    return compacted, report
+
+
+def format_memory_report(report):
+    """One-line summary of a compact_with_report() report."""
+    before, after = report["bytes_before"], report["bytes_after"]
+    saved = 100 * (1 - after / before) if before else 0
+    return f"{report['rows']} rows: {before / 2**20:.1f} MB -> {after / 2**20:.1f} MB ({saved:.0f}% saved)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report memory of part-library/BOM files before and after compaction.")
+    parser.add_argument("files", nargs="+", help=".csv or .xlsx files")
+    parser.add_argument("--verbose", action="store_true", help="Also list the resulting column dtypes")
+    args = parser.parse_args()
+
+    from LCRlibrary import PART_NUMBER, VENDER_LOT
+    from LCRsearch import MATERIAL_COLUMNS
+
+    for path in args.files:
+        df = pd.read_csv(path) if path.lower().endswith(".csv") else pd.read_excel(path)
+        _, report = compact_with_report(df, text_columns=(PART_NUMBER, VENDER_LOT) + MATERIAL_COLUMNS)
+        print(f"{path}: {format_memory_report(report)}")
+        if args.verbose:
+            for name, dtype in report["dtypes"].items():
+                print(f"    {name}: {dtype}")
+
+
+if __name__ == "__main__":
+    main()
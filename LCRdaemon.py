@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from LCRsearch import BOM_FOLDER, BomIndex
+from LCRwhereused import WhereUsedMap
+
+# Optional lookup daemon: parses the SMT_BOM workbooks once, keeps them in
+# memory, re-reads files as they change and answers material lookups over
+# HTTP on localhost. LCRlog and `python LCRsearch.py` ask it first and read
+# the workbooks themselves when it is not running.
+#
+#   GET /status                               folder, files, parse errors
+#   GET /lookup?folder=F&material=M[&file=N]  {"rows": [...], "errors": {...}}
+#   POST /lookup {"folder", "material", "files"}  the same, for file lists too long for a URL
+#   GET /where-used?folder=F&material=M       {"uses": [[file, quantity, description, rows], ...]}
+HOST = "127.0.0.1"
+PORT = int(os.environ.get("LCR_DAEMON_PORT", 47650))
+
+# Clients give up quickly: a missing daemon must not slow a search down
+CLIENT_TIMEOUT = 2.0
+
+
+def _same_folder(first, second):
+    return os.path.normcase(os.path.abspath(first)) == os.path.normcase(os.path.abspath(second))
+
+
+def _json_value(value):
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    index = None  # BomIndex, set by serve()
+    where_used = None  # WhereUsedMap kept in step with the index
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload, default=_json_value).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        if url.path == "/status":
+            self._reply(200, {"folder": self.index.folder, "files": self.index.files(),
+                              "errors": self.index.read_errors()})
+        elif not _same_folder(query.get("folder", [""])[0], self.index.folder):
+            self._reply(409, {"error": f"serving {self.index.folder}"})
+        elif url.path == "/where-used":
+            if not self.where_used.files():
+                self._reply(503, {"error": "where-used map not built yet"})
+                return
+            self._reply(200, {"uses": self.where_used.query(query.get("material", [""])[0])})
+        elif url.path == "/lookup":
+            self._lookup(query.get("material", [""])[0], query.get("file"))
+        else:
+            self._reply(404, {"error": "unknown path"})
+
+    def do_POST(self):
+        if urllib.parse.urlsplit(self.path).path != "/lookup":
+            self._reply(404, {"error": "unknown path"})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError:
+            self._reply(400, {"error": "body is not JSON"})
+            return
+        if not _same_folder(request.get("folder", ""), self.index.folder):
+            self._reply(409, {"error": f"serving {self.index.folder}"})
+            return
+        self._lookup(request.get("material", ""), request.get("files"))
+
+    def _lookup(self, material, files):
+        errors = self.index.read_errors()
+        if files is not None and not set(files) <= set(self.index.files()) | set(errors):
+            # Not indexed yet (new file, first scan running): the client reads directly
+            self._reply(503, {"error": "files not indexed yet"})
+            return
+        rows = self.index.lookup(material, files)
+        errors = {name: error for name, error in errors.items() if files is None or name in files}
+        self._reply(200, {"rows": rows, "errors": errors})
+
+    def log_message(self, format, *args):
+        pass  # lookups are logged as spans by LCRperf
+
+
+def query_daemon(folder, material, files=None, timeout=CLIENT_TIMEOUT):
+    """Ask a running daemon for ``material``; returns (rows, errors), or None to read directly.
+
+    ``files`` (default all) goes in a POST body, so any number of files fits.
+    """
+    body = json.dumps({"folder": folder, "material": material, "files": files}).encode("utf-8")
+    request = urllib.request.Request(f"http://{HOST}:{PORT}/lookup", data=body,
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            answer = json.load(response)
+    except (OSError, ValueError):  # not running, other folder, not indexed yet, timeout
+        return None
+    return [tuple(row) for row in answer["rows"]], answer["errors"]
+
+
+def query_where_used(folder, material, timeout=CLIENT_TIMEOUT):
+    """Ask a running daemon where ``material`` is used; returns WhereUsedMap.query() tuples, or None."""
+    url = f"http://{HOST}:{PORT}/where-used?" + urllib.parse.urlencode({"folder": folder, "material": material})
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return [tuple(use) for use in json.load(response)["uses"]]
+    except (OSError, ValueError):
+        return None
+
+
+def _watch(index, where_used, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            changed = index.refresh()
+            where_used.sync(index)
+        except OSError as e:
+            print(f"Cannot read {index.folder}: {e}", file=sys.stderr)
+            continue
+        if changed:
+            print(f"Re-read {len(changed)} file(s): {', '.join(changed)}", file=sys.stderr)
+
+
+def serve(folder, port=PORT, interval=10.0):
+    """Index ``folder`` and serve lookups until interrupted."""
+    index = BomIndex(folder)
+    where_used = WhereUsedMap(folder)
+    _Handler.index, _Handler.where_used = index, where_used
+    server = ThreadingHTTPServer((HOST, port), _Handler)
+    print(f"Serving lookups for {folder} on http://{HOST}:{port}", file=sys.stderr)
+
+    started = time.perf_counter()
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()  # lookups for files not indexed yet get 503 and read directly
+    index.refresh()
+    where_used.sync(index)
+    print(f"Indexed {len(index.files())} file(s) in {time.perf_counter() - started:.1f} s", file=sys.stderr)
+
+    threading.Thread(target=_watch, args=(index, where_used, interval), daemon=True).start()
+    try:
+        server_thread.join()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve SMT_BOM material lookups from memory on localhost.")
+    parser.add_argument("--folder", default=BOM_FOLDER, help="BOM folder (default the SMT_BOM share)")
+    parser.add_argument("--port", type=int, default=PORT, help=f"Port on {HOST} (default {PORT}, or LCR_DAEMON_PORT)")
+    parser.add_argument("--interval", type=float, default=10.0, help="Seconds between folder checks (default 10)")
+    args = parser.parse_args()
+    serve(args.folder, args.port, args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from LCRcalc import unit_factors
+from LCRperf import span
+from LCRsearch import BOM_FOLDER, RECORD_COLUMNS, append_records, normalize_materials, timestamp
+from LCRunits import UNIT_BASES, parse_series
+
+# Bench LCR meter logs (CSV/TSV) -> readings per material. Logs are read in
+# chunks with the C parser and converted with vectorized code, so multi-MB
+# logs go through at well over 10k rows/s; LogFollower picks up rows as the
+# meter appends them. Readings are matched to BOM materials through the
+# where-used map and become pre-filled or bulk-created correction records.
+
+# Log header names, compared case-insensitively; the first found is used
+COLUMN_ALIASES = {
+    "Material": ("Material", "Internal P/N", "Part No", "Part Number", "P/N", "Part"),
+    "Value": ("Measured Value", "Value", "Reading", "Primary", "Main"),
+    "Unit": ("Unit", "Units"),
+    "Time": ("Timestamp", "Time", "Date Time", "DateTime", "Date"),
+    "Line": ("Line",),
+    "Machine & Side": ("Machine & Side", "Machine", "Station"),
+}
+
+READING_COLUMNS = ["Material", "Key", "Measured Value", "Value (SI)", "Unit", "Time", "Line", "Machine & Side"]
+
+
+def sniff_delimiter(header_line):
+    """Tab, semicolon or comma: whichever splits the header line most."""
+    return max(("\t", ";", ","), key=header_line.count)
+
+
+def map_columns(columns):
+    """Return {canonical name: log column} for the log columns named in COLUMN_ALIASES."""
+    by_name = {str(column).strip().lower(): column for column in columns}
+    mapping = {}
+    for canonical, aliases in COLUMN_ALIASES.items():
+        found = next((by_name[alias.lower()] for alias in aliases if alias.lower() in by_name), None)
+        if found is not None:
+            mapping[canonical] = found
+    if "Material" not in mapping or "Value" not in mapping:
+        raise ValueError(f"Meter log needs a material and a value column, found {list(columns)}")
+    return mapping
+
+
+def normalize_readings(chunk, mapping):
+    """Convert one chunk of raw log rows (all text) to READING_COLUMNS.
+
+    "Unit" is the base unit ("F", "Ω", "H") of "Value (SI)" in both log
+    layouts; see unreadable() for rows that gave no value.
+    """
+    values = chunk[mapping["Value"]].str.strip()
+    if "Unit" in mapping:
+        units = chunk[mapping["Unit"]].str.strip()
+        measured = values + units
+        factors = unit_factors(units.to_numpy())
+        si = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float) * factors
+        base_units = units.map(UNIT_BASES).to_numpy(dtype=object)
+        # Spellings missing from the unit table ("kOhm", "UF"): parse value and unit together
+        other = np.isnan(factors)
+        if other.any():
+            parsed = parse_series(measured[other])
+            si[other], base_units[other] = parsed["Value"].to_numpy(), parsed["Unit"].to_numpy()
+        base_units[pd.isna(base_units)] = ""
+        measured = measured.to_numpy(dtype=object)
+    else:
+        parsed = parse_series(values)  # "10.2uF"-style readings, each distinct text parsed once
+        si, measured, base_units = parsed["Value"].to_numpy(), values.to_numpy(dtype=object), parsed["Unit"].to_numpy()
+
+    def optional(name):
+        return chunk[mapping[name]].to_numpy(dtype=object) if name in mapping else np.full(len(chunk), "", dtype=object)
+
+    return pd.DataFrame({
+        "Material": chunk[mapping["Material"]].to_numpy(dtype=object),
+        "Key": normalize_materials(chunk[mapping["Material"]]),
+        "Measured Value": measured,
+        "Value (SI)": si,
+        "Unit": base_units,
+        "Time": optional("Time"),
+        "Line": optional("Line"),
+        "Machine & Side": optional("Machine & Side"),
+    }, columns=READING_COLUMNS)
+
+
+def unreadable(readings):
+    """Distinct Measured Value texts of readings that gave no SI value (unknown unit or not a number)."""
+    return sorted(map(str, pd.unique(readings.loc[readings["Value (SI)"].isna(), "Measured Value"])))
+
+
+def read_log(path, chunksize=100000):
+    """Yield normalized reading chunks of a whole meter log."""
+    with open(path, encoding="utf-8-sig", errors="replace") as log:
+        delimiter = sniff_delimiter(log.readline())
+    mapping = None
+    for chunk in pd.read_csv(path, sep=delimiter, dtype=str, keep_default_na=False, chunksize=chunksize,
+                             encoding="utf-8-sig", encoding_errors="replace", on_bad_lines="skip"):
+        mapping = mapping or map_columns(chunk.columns)
+        with span("meter log chunk", rows=len(chunk)):
+            yield normalize_readings(chunk, mapping)
+
+
+class LogFollower:
+    """Reads the rows appended to a meter log since the last poll (tail -f).
+
+    poll() never blocks: it returns a frame of new readings, empty when
+    nothing complete was appended. A log that shrinks (restarted by the
+    meter software) is read again from the start.
+    """
+
+    def __init__(self, path, from_start=True):
+        self.path = path
+        self._header = None
+        self._delimiter = None
+        self._mapping = None
+        self._offset = 0
+        self._partial = b""
+        if not from_start:
+            self._read_header()
+            self._offset = os.path.getsize(path)
+
+    def _read_header(self):
+        with open(self.path, "rb") as log:
+            line = log.readline()
+        if not line.endswith(b"\n"):
+            return False  # header still being written
+        self._header = line
+        self._offset = len(line)
+        self._delimiter = sniff_delimiter(line.decode("utf-8-sig", errors="replace"))
+        # Parsed as read_log() does, so quoted names lose their quotes
+        columns = pd.read_csv(io.BytesIO(line), sep=self._delimiter, nrows=0, encoding="utf-8-sig",
+                              encoding_errors="replace").columns
+        self._mapping = map_columns([str(name).strip() for name in columns])
+        return True
+
+    @property
+    def position(self):
+        """Byte offset of the end of the last complete row returned."""
+        return self._offset - len(self._partial)
+
+    def poll(self, until=None):
+        """Return the readings of the complete rows appended since the last poll.
+
+        With ``until`` nothing past that byte offset is read.
+        """
+        empty = pd.DataFrame(columns=READING_COLUMNS)
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return empty
+        if until is not None and until >= self._offset:
+            size = min(size, until)
+        if size < self._offset:  # truncated or replaced: start over
+            self._header, self._offset, self._partial = None, 0, b""
+        if self._header is None and not self._read_header():
+            return empty
+        if size == self._offset:
+            return empty
+
+        with open(self.path, "rb") as log:
+            log.seek(self._offset)
+            data = self._partial + log.read(size - self._offset)
+        self._offset = size
+        complete, _, self._partial = data.rpartition(b"\n")
+        if not complete:
+            self._partial = data
+            return empty
+        chunk = pd.read_csv(io.BytesIO(self._header + complete + b"\n"), sep=self._delimiter, dtype=str,
+                            keep_default_na=False, encoding="utf-8-sig", encoding_errors="replace",
+                            on_bad_lines="skip")
+        chunk.columns = [str(column).strip() for column in chunk.columns]
+        return normalize_readings(chunk, self._mapping)
+
+
+def follow_log(path, interval=1.0, from_start=True):
+    """Yield non-empty reading chunks as the meter appends them; runs until interrupted."""
+    follower = LogFollower(path, from_start)
+    while True:
+        readings = follower.poll()
+        if len(readings):
+            yield readings
+        else:
+            time.sleep(interval)
+
+
+def latest_readings(readings, latest=None):
+    """Update {material key: last reading as a dict} with a chunk of readings."""
+    latest = {} if latest is None else latest
+    last = readings[readings["Key"] != ""].drop_duplicates("Key", keep="last")
+    for reading in last.to_dict("records"):
+        latest[reading["Key"]] = reading
+    return latest
+
+
+def match_readings(readings, where_used):
+    """Add Description, File and Matched columns from a WhereUsedMap (first BOM using the material)."""
+    descriptions, files = {}, {}
+    for key in pd.unique(readings["Key"]):
+        uses = where_used.query(key) if key else []
+        if uses:
+            files[key], _, descriptions[key], _ = uses[0]
+    return readings.assign(Description=readings["Key"].map(descriptions), File=readings["Key"].map(files),
+                           Matched=readings["Key"].isin(files.keys()))
+
+
+def to_records(matched):
+    """Correction records (RECORD_COLUMNS) for matched readings; standard values are left to the operator."""
+    rows = matched[matched["Matched"]]
+    records = pd.DataFrame({
+        "Material": rows["Material"],
+        "Description": rows["Description"],
+        "File": rows["File"],
+        "Line": rows["Line"],
+        "Machine & Side": rows["Machine & Side"],
+        "Measured Value": rows["Measured Value"],
+        "Remarks": "Meter log " + rows["Time"].astype(str),
+        "Timestamp": timestamp(),
+        "Status": "Imported",
+    })
+    return records.reindex(columns=RECORD_COLUMNS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest bench LCR meter logs (CSV/TSV) and match readings to materials.")
+    parser.add_argument("log_file", help="Meter log (.csv/.tsv/.txt)")
+    parser.add_argument("--folder", default=BOM_FOLDER, help="BOM folder used for matching (default the SMT_BOM share)")
+    parser.add_argument("--records", help="Append matched readings as correction records to this workbook")
+    parser.add_argument("--output", help="Write the matched readings to this CSV")
+    parser.add_argument("--follow", action="store_true", help="Keep reading rows as the meter appends them")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between checks with --follow")
+    parser.add_argument("--chunksize", type=int, default=100000, help="Rows per chunk (default 100000)")
+    args = parser.parse_args()
+
+    from LCRwhereused import WhereUsedMap
+
+    where_used = WhereUsedMap(args.folder)
+    where_used.sync()
+    chunks = follow_log(args.log_file, args.interval) if args.follow else read_log(args.log_file, args.chunksize)
+    rows = matched_rows = 0
+    started = time.perf_counter()
+    try:
+        for readings in chunks:
+            matched = match_readings(readings, where_used)
+            if args.output:
+                matched.to_csv(args.output, mode="a" if rows else "w", header=rows == 0, index=False,
+                               encoding="utf-8-sig" if rows == 0 else "utf-8")
+            if args.records and matched["Matched"].any():
+                append_records(args.records, to_records(matched))
+            rows += len(matched)
+            matched_rows += int(matched["Matched"].sum())
+            skipped = unreadable(readings)
+            if skipped:
+                print(f"No value read from: {', '.join(skipped[:10])}", file=sys.stderr)
+            elapsed = time.perf_counter() - started
+            print(f"{rows} readings, {matched_rows} matched, {rows / elapsed if elapsed else 0:,.0f} rows/s",
+                  file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
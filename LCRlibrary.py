@@ -0,0 +1,195 @@
+import argparse
+import glob
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+# Mounter part-library export columns (see create_data in LCR-Measurement.py)
+PART_NUMBER = "PartNumberName"
+VENDER_LOT = "VenderLotName"
+SHAPE_NAME = "VENDERLOTPARTNUMBER.Basic settings_Part ShapeName"
+PACKAGE_NAME = "VENDERLOTPARTNUMBER.Basic settings_PackageName"
+LCR_CHECK = "VENDERLOTPARTNUMBER.Specify other settings_LCR Check"
+LCR_PARAMETER = "VENDERLOTPARTNUMBER.Specify other settings_LCR Check Parameter"
+LCR_NOMINAL = "VENDERLOTPARTNUMBER.Specify other settings_LCR Check Nominal Value"
+LCR_NOMINAL_UNIT = "VENDERLOTPARTNUMBER.Specify other settings_LCR Check Nominal Value Unit"
+LCR_TOLERANCE = "VENDERLOTPARTNUMBER.Specify other settings_LCR Check Tolerance"
+LCR_FREQUENCY = "VENDERLOTPARTNUMBER.Specify other settings_LCR Check Frequency"
+LCR_FREQUENCY_UNIT = "VENDERLOTPARTNUMBER.Specify other settings_LCR Check Frequency Unit"
+LCR_CURRENT = "VENDERLOTPARTNUMBER.Specify other settings_LCR Check Current"
+
+LCR_COLUMNS = [LCR_CHECK, LCR_PARAMETER, LCR_NOMINAL, LCR_NOMINAL_UNIT,
+               LCR_TOLERANCE, LCR_FREQUENCY, LCR_FREQUENCY_UNIT]
+
+# LCR Check Parameter code -> (measured quantity, base unit)
+LCR_PARAMETERS = {0: ("Inductance", "H"), 1: ("Capacitance", "F"), 2: ("Resistance", "Ω")}
+
+# Frequency Unit codes follow the same power-of-ten convention as the
+# Nominal Value Unit (0 = Hz, 3 = kHz, 6 = MHz)
+FREQUENCY_UNIT_EXPONENTS = {0: 0, 3: 3, 6: 6}
+
+# Columns added by decode_library
+DECODED_COLUMNS = ["LCR Quantity", "Nominal", "Nominal (SI)", "Lower Limit (SI)",
+                   "Upper Limit (SI)", "Tolerance Band", "Test Frequency (Hz)"]
+
+# Parsed library snapshots, so the next launch skips re-parsing the export
+SNAPSHOT_DIR = os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "LCRlog", "cache")
+
+_PREFIX_BY_EXPONENT = {-12: "p", -9: "n", -6: "µ", -3: "m", 0: "", 3: "k", 6: "M", 9: "G"}
+
+
+def _to_float(series):
+    """Convert a code column to floats, converting each distinct cell only once."""
+    codes, uniques = pd.factorize(series)
+    parsed = pd.to_numeric(pd.Series(uniques, dtype=object), errors="coerce").to_numpy(dtype=float)
+    result = np.full(len(codes), np.nan)
+    result[codes >= 0] = parsed[codes[codes >= 0]]
+    return result
+
+
+def format_si(values, units):
+    """Format arrays of SI values and base units as engineering strings ("4.7 kΩ")."""
+    values = np.asarray(values, dtype=float)
+    units = np.asarray(units, dtype=object)
+
+    # A library holds few distinct (value, unit) pairs: format each pair once
+    value_codes, distinct_values = pd.factorize(values, use_na_sentinel=False)
+    unit_codes, distinct_units = pd.factorize(units, use_na_sentinel=False)
+    pair_codes, pairs = pd.factorize(value_codes * len(distinct_units) + unit_codes)
+    text = _format_si(distinct_values[pairs // len(distinct_units)], distinct_units[pairs % len(distinct_units)])
+    return text[pair_codes]
+
+
+def _format_si(values, units):
+    finite = np.isfinite(values) & (values != 0)
+    exponents = np.zeros(len(values), dtype=int)
+    exponents[finite] = np.clip(np.floor(np.log10(np.abs(values[finite])) / 3) * 3, -12, 9)
+    mantissas = pd.Series(values / 10.0 ** exponents).round(6)
+    prefixes = pd.Series(exponents).map(_PREFIX_BY_EXPONENT)
+    text = mantissas.map("{:g}".format) + " " + prefixes + pd.Series(units, dtype=object).fillna("").astype(str)
+    return text.where(np.isfinite(values), "").to_numpy(dtype=object)
+
+
+def decode_library(df):
+    """Decode the raw LCR check code columns of a part-library frame.
+
+    Returns a frame aligned with ``df`` holding the measured quantity, the
+    nominal value as text and in SI units, the tolerance band and the test
+    frequency in Hz. Separator and non-numeric rows decode to NaN / "".
+    """
+    codes = {column: _to_float(df[column]) for column in LCR_COLUMNS if column in df.columns}
+    missing = [column for column in LCR_COLUMNS if column not in codes]
+    if missing:
+        raise KeyError(f"Part library is missing columns: {', '.join(missing)}")
+
+    parameter = pd.Series(codes[LCR_PARAMETER], index=df.index)
+    quantity = parameter.map({code: name for code, (name, _) in LCR_PARAMETERS.items()})
+    base_unit = parameter.map({code: unit for code, (_, unit) in LCR_PARAMETERS.items()}).to_numpy(dtype=object)
+
+    nominal = codes[LCR_NOMINAL] * 10.0 ** codes[LCR_NOMINAL_UNIT]
+    tolerance = codes[LCR_TOLERANCE]
+    lower = nominal - (nominal * tolerance / 100)
+    upper = nominal + (nominal * tolerance / 100)
+
+    frequency_exponent = pd.Series(codes[LCR_FREQUENCY_UNIT]).map(FREQUENCY_UNIT_EXPONENTS).to_numpy(dtype=float)
+    frequency = codes[LCR_FREQUENCY] * 10.0 ** frequency_exponent
+
+    band = format_si(lower, base_unit) + " ~ " + format_si(upper, base_unit)
+    band[~(np.isfinite(lower) & np.isfinite(upper))] = ""
+
+    return pd.DataFrame({
+        "LCR Quantity": quantity.fillna("").to_numpy(dtype=object),
+        "Nominal": format_si(nominal, base_unit),
+        "Nominal (SI)": nominal,
+        "Lower Limit (SI)": lower,
+        "Upper Limit (SI)": upper,
+        "Tolerance Band": band,
+        "Test Frequency (Hz)": frequency,
+    }, index=df.index)
+
+
+def iter_table_chunks(path, chunksize=50000):
+    """Yield a CSV or xlsx table (e.g. a part-library export) as DataFrames of at most ``chunksize`` rows."""
+    if path.lower().endswith((".csv", ".txt")):
+        yield from pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False)
+        return
+
+    # pandas has no chunked xlsx reader; stream rows through openpyxl instead
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(name) for name in next(rows, ())]
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunksize:
+                yield pd.DataFrame(chunk, columns=header)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=header)
+    finally:
+        workbook.close()
+
+
+def iter_decoded_library(path, chunksize=50000):
+    """Yield decoded chunks (raw columns plus DECODED_COLUMNS) of a part-library export."""
+    for chunk in iter_table_chunks(path, chunksize):
+        yield pd.concat([chunk, decode_library(chunk)], axis=1)
+
+
+def decode_library_file(path, output_path, chunksize=50000):
+    """Decode a part-library export to CSV chunk by chunk; returns the row count."""
+    if os.path.exists(output_path):
+        os.remove(output_path)
+    rows = 0
+    for chunk in iter_decoded_library(path, chunksize):
+        chunk.to_csv(output_path, mode="a", header=rows == 0, index=False,
+                     encoding="utf-8-sig" if rows == 0 else "utf-8")
+        rows += len(chunk)
+    return rows
+
+
+def _snapshot_path(path):
+    """Snapshot file for the current version (path, size, mtime) of an export."""
+    stat = os.stat(path)
+    key = hashlib.sha1(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}".encode()).hexdigest()[:16]
+    return os.path.join(SNAPSHOT_DIR, f"{os.path.basename(path)}-{key}.pkl")
+
+
+def load_snapshot(path):
+    """Return the cached decoded frame of an export, or None if there is no current snapshot."""
+    try:
+        return pd.read_pickle(_snapshot_path(path))
+    except (OSError, EOFError, ValueError, ImportError, AttributeError):
+        return None
+
+
+def save_snapshot(path, df):
+    """Cache a decoded export, replacing snapshots of its older versions."""
+    snapshot_path = _snapshot_path(path)
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    for old_snapshot in glob.glob(os.path.join(SNAPSHOT_DIR, glob.escape(os.path.basename(path)) + "-*.pkl")):
+        if old_snapshot != snapshot_path:
+            os.remove(old_snapshot)
+    temp_path = snapshot_path + ".tmp"
+    df.to_pickle(temp_path)
+    os.replace(temp_path, snapshot_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode the LCR check fields of a mounter part-library export.")
+    parser.add_argument("library_file", help="Part-library export (.csv or .xlsx)")
+    parser.add_argument("output_file", help="Decoded CSV to write")
+    parser.add_argument("--chunksize", type=int, default=50000, help="Rows per chunk (default 50000)")
+    args = parser.parse_args()
+
+    rows = decode_library_file(args.library_file, args.output_file, args.chunksize)
+    print(f"{rows} parts decoded to {args.output_file}")
+
+
+if __name__ == "__main__":
+    main()
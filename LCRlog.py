@@ -1,11 +1,25 @@
+from LCRstartup import StartupTimer, warm_imports
+startup = StartupTimer("LCRlog")
 import os
 import tkinter as tk
-from tkinter import ttk, messagebox
-import pandas as pd
-import win32com.client as win32
-from datetime import datetime
+from tkinter import ttk, messagebox, filedialog
 import json
+import threading
+import LCRperf
+from LCRperf import operation, span
+from LCRsearch import (BOM_FOLDER, PART_LIBRARY, RECORD_FIELDS, STREAM_MEMORY_CAP_MB, append_record, list_bom_files,
+                       lookup, normalize_material, render_mail, stream_lookup, timestamp)
+from LCRview import VirtualTreeview
 
+# pandas (inside LCRsearch), the record evaluator and win32com are imported
+# where they are first used so the window opens without waiting for them;
+# pandas and the evaluator are warmed in the background once the window is
+# painted.
+
+
+
+# How often a loaded meter log is checked for new readings
+METER_POLL_MS = 1000
 
 
 class ExcelSearchApp:
@@ -14,7 +28,7 @@ class ExcelSearchApp:
         self.root.title("Excel Search Application")
         self.root.state("zoomed")
         self.root.geometry("1000x600")  # Default window size
-        self.folder_path = r"D:\NX_BACKWORK\Database_File\SMT_BOM"
+        self.folder_path = BOM_FOLDER
         self.lcr_file_path = r"D:\NX_BACKWORK\Database_File\SMT_LCR\LCR-Correction Record.xlsx"
         self.email_config_file_path = "email_config.json"
         self.file_list = []
@@ -63,6 +77,10 @@ class ExcelSearchApp:
         ttk.Label(self.search_frame, text="Enter Value to Search:").grid(row=0, column=0, padx=5)
         self.search_entry = ttk.Entry(self.search_frame, font=("Arial", 12))
         self.search_entry.grid(row=0, column=1, padx=5, sticky="ew")
+        # Low memory: read the selected files chunk by chunk under a memory cap (slower)
+        self.low_memory = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.search_frame, text=f"Low memory (max {STREAM_MEMORY_CAP_MB:g} MB)",
+                        variable=self.low_memory).grid(row=0, column=2, padx=5)
 
         # Buttons
         self.button_frame = ttk.Frame(self.main_frame)
@@ -75,6 +93,26 @@ class ExcelSearchApp:
         # Settings Button (now in the same row)
         #ttk.Button(self.main_frame, text="Settings", command=self.open_settings).grid(row=0, column=1, padx=5, pady=10)
         ttk.Button(self.button_frame, text="Settings", command=self.open_settings).grid(row=0, column=2, padx=5)
+        ttk.Button(self.button_frame, text="Where Used", command=self.show_where_used).grid(row=0, column=3, padx=5)
+        ttk.Button(self.button_frame, text="Export Cross-Reference", command=self.export_cross_reference).grid(row=0, column=4, padx=5)
+        ttk.Button(self.button_frame, text="Profile Next Action", command=self.profile_next_action).grid(row=0, column=5, padx=5)
+        self.where_used = None  # LCRwhereused.WhereUsedMap, built on first use
+        self.where_used_lock = threading.Lock()  # held by the worker thread syncing or reading the map
+        ttk.Button(self.button_frame, text="Load Meter Log", command=self.load_meter_log).grid(row=1, column=2, padx=5, pady=(5, 0))
+        ttk.Button(self.button_frame, text="Create Records From Log", command=self.import_meter_records).grid(row=1, column=3, padx=5, pady=(5, 0))
+        ttk.Button(self.button_frame, text="Export SPC Summary", command=self.export_spc_summary).grid(row=1, column=4, padx=5, pady=(5, 0))
+        ttk.Button(self.button_frame, text="Missing LCR Data Report", command=self.export_missing_lcr_data).grid(row=1, column=5, padx=5, pady=(5, 0))
+        self.spc = None  # LCRspc.SPCStore, loaded on first use
+        self.spc_lock = threading.Lock()  # the meter log thread adds readings too
+        self.spc_alarms = {}  # (stream key, rule) -> times broken since last acknowledged
+        self.alarm_window = None  # the open SPC Alarms window, if any
+        self.library_path = PART_LIBRARY
+        self.part_index = None  # LCRpartindex.PartIndex, loaded in the background after startup
+        self.part_index_lock = threading.Lock()
+        self.part_index_error = None  # why the part index could not be loaded; not retried
+        self.meter_log = None  # LCRingest.LogFollower of the loaded meter log
+        self.meter_readings = {}  # material key -> latest reading from the meter log
+        self.meter_stop = None  # threading.Event ending the thread following the meter log
 
         # Results Table with Scrollbars
         self.results_frame = ttk.Frame(self.main_frame, borderwidth=1, relief="solid")
@@ -82,14 +120,16 @@ class ExcelSearchApp:
         self.results_frame.columnconfigure(0, weight=1)
         self.results_frame.rowconfigure(0, weight=1)
 
-        self.tree = ttk.Treeview(
+        # Only the visible rows are real Treeview items, see LCRview
+        self.tree = VirtualTreeview(
             self.results_frame,
-            columns=("Material", "Long Description", "File"),
+            columns=("Material", "Long Description", "File", "Sheet"),
             show="headings",
         )
         self.tree.heading("Material", text="Material", anchor="w")
         self.tree.heading("Long Description", text="Long Description", anchor="w")
         self.tree.heading("File", text="File", anchor="w")
+        self.tree.heading("Sheet", text="Sheet", anchor="w")
 
         # Set bold font for table headers
         bold_font = ("Arial", 12, "bold")
@@ -105,6 +145,14 @@ class ExcelSearchApp:
 
         self.tree.bind("<Double-1>", self.on_double_click)
 
+        # Status bar: timing of the last action (details in LCRperf.PERF_LOG)
+        self.status_label = ttk.Label(self.main_frame, text="", anchor="w")
+        self.status_label.grid(row=5, column=0, sticky="ew", padx=10)
+        # Unacknowledged SPC alarms; a click opens the SPC Alarms list
+        self.alarm_label = ttk.Label(self.main_frame, text="", anchor="w", foreground="red", cursor="hand2")
+        self.alarm_label.grid(row=6, column=0, sticky="ew", padx=10)
+        self.alarm_label.bind("<Button-1>", lambda event: self.open_spc_alarms())
+
         # Load Files
         self.load_files_from_folder()
 
@@ -195,8 +243,7 @@ class ExcelSearchApp:
             messagebox.showerror("Error", f"Folder not found: {self.folder_path}")
             return
 
-        all_files = os.listdir(self.folder_path)
-        self.file_list = [f for f in all_files if f.lower().endswith(".xlsx")]
+        self.file_list = list_bom_files(self.folder_path)
 
         if not self.file_list:
             messagebox.showwarning("No Files", f"No Excel files found in the folder: {self.folder_path}")
@@ -219,37 +266,45 @@ class ExcelSearchApp:
             return
 
         self.clear_results()
-        found = False
-
-        for index in selected_indices:
-            file_name = self.file_list[index]
-            file_path = os.path.join(self.folder_path, file_name)
-
-            try:
-                df = pd.read_excel(file_path)
-                if "Material" in df.columns or "Internal P/N" in df.columns:
-                    material_col = "Material" if "Material" in df.columns else "Internal P/N"
-                    desc_col = "Long. Description" if "Long. Description" in df.columns else "Description"
-
-                    filtered_data = df[df[material_col].astype(str) == search_value]
-                    for _, row in filtered_data.iterrows():
-                        self.tree.insert("", "end", values=(row[material_col], row[desc_col], file_name))
-                        found = True
-            except Exception as e:
-                messagebox.showerror("Error", f"Error reading file {file_name}: {str(e)}")
 
-        if not found:
-            messagebox.showinfo("No Results", "No matching data found.")
+        # Answered by the lookup daemon when one serves this folder (LCRdaemon), else read in a
+        # worker thread; the low-memory search is about 4x slower and must not freeze the window
+        files = [self.file_list[index] for index in selected_indices]
+        low_memory = self.low_memory.get()
+
+        def work():
+            with operation("Find", files=len(files), low_memory=low_memory) as timing:
+                if low_memory:
+                    found = stream_lookup(self.folder_path, search_value, files)
+                else:
+                    found = lookup(self.folder_path, search_value, files) + (None,)
+            return found + (timing["summary"],)
+
+        def done(result):
+            rows, errors, peak, summary = result
+            if rows:
+                with span("treeview", rows=len(rows)):
+                    self.tree.append_rows(rows)
+            if peak is not None:
+                summary += f"; peak memory {peak / 2**20:.1f} MB"
+            self.show_last_action(summary)
+            for file_name, error in errors.items():
+                messagebox.showerror("Error", f"Error reading file {file_name}: {error}")
+            if not rows:
+                messagebox.showinfo("No Results", "No matching data found.")
+
+        self.run_in_background(work, done, f"Find: searching {len(files)} file(s) ...")
 
     def on_double_click(self, event):
             """Handle double-click on result row."""
-            selected_item = self.tree.selection()
-            if not selected_item:
+            from LCRcheck import evaluate_record, format_evaluation
+
+            row_values = self.tree.selected_row()
+            if row_values is None:
                 return
 
             # Get the values of the selected row
-            row_values = self.tree.item(selected_item[0], "values")
-            material, long_description, file_name = row_values
+            material, long_description, file_name, sheet = (str(value) for value in row_values)
 
             # Open a popup window for data entry
             popup = tk.Toplevel(self.root)
@@ -261,17 +316,7 @@ class ExcelSearchApp:
             ttk.Label(popup, text=f"Description: {long_description}", font=("Arial", 12)).pack(pady=5)
 
             # Input fields for additional data
-            fields = [
-                "Line",
-                "Machine & Side",
-                "Standard Value",
-                "Measured Value",
-                "AVL",
-                "Error",
-                "Remarks",
-                "Standard Tol%",
-                "Correction Tol%",
-            ]
+            fields = RECORD_FIELDS
             entries = {}
             for field in fields:
                 frame = ttk.Frame(popup)
@@ -281,6 +326,35 @@ class ExcelSearchApp:
                 entry.pack(side="right", padx=5, fill="x", expand=True)
                 entries[field] = entry
 
+            # Live deviation check from the standard / measured / tolerance fields
+            evaluation_label = ttk.Label(popup, text="", font=("Arial", 12, "bold"))
+            evaluation_label.pack(pady=5)
+            auto_error = {"text": ""}
+
+            def update_evaluation(event=None):
+                """Recompute the deviation and pre-fill Error unless the operator typed one."""
+                result = evaluate_record({field: entries[field].get().strip() for field in fields})
+                evaluation_label.config(text=format_evaluation(result))
+                error_text = "" if result["Deviation%"] is None else f"{result['Deviation%']:+.2f}%"
+                if entries["Error"].get() == auto_error["text"]:
+                    entries["Error"].delete(0, "end")
+                    entries["Error"].insert(0, error_text)
+                    auto_error["text"] = error_text
+
+            for field in ("Standard Value", "Measured Value", "Standard Tol%", "Correction Tol%"):
+                entries[field].bind("<KeyRelease>", update_evaluation)
+
+            # Pre-fill the standard from the part library and the latest reading from the meter log
+            for field, text in self.part_defaults(material).items():
+                entries[field].insert(0, text)
+            reading = self.meter_readings.get(normalize_material(material))
+            if reading is not None:
+                entries["Measured Value"].insert(0, reading["Measured Value"])
+                for field in ("Line", "Machine & Side"):
+                    if reading[field]:
+                        entries[field].insert(0, reading[field])
+            update_evaluation()
+
             # Save button
             def save_data():
                 """Save the entered data to the LCR-Correction Record file."""
@@ -290,63 +364,33 @@ class ExcelSearchApp:
                 data["File"] = file_name
                 
                 # Add a timestamp for when the data was saved and mailed
-                data["Timestamp"] = datetime.now().strftime("%Y-%m-%d %I:%M %p")
+                data["Timestamp"] = timestamp()
                 data["Status"] = "Saved"
                 
                 # Store the data in a global variable so that send_mail can access it
                 self.data = data
 
-                # Save to Excel file
-                if not os.path.exists(self.lcr_file_path):
-                    # Create the file if it doesn't exist
-                    df = pd.DataFrame(columns=["Material", "Description", "File"] + fields + ["Timestamp", "Status"])
-                    df.to_excel(self.lcr_file_path, index=False)
-                    
-                df = pd.read_excel(self.lcr_file_path)
-
-                # Ensure the columns in the data dictionary match the DataFrame columns
-                columns = df.columns.tolist()
-                for col in columns:
-                    if col not in data:
-                        data[col] = None  # If any column is missing, add None
-
-                # Convert the data dictionary to a DataFrame
-                new_row = pd.DataFrame([data])
-                df = pd.concat([df, new_row], ignore_index=True)  # Append new data to the existing DataFrame
-                df.to_excel(self.lcr_file_path, index=False)
+                # Save to Excel file (created if it doesn't exist)
+                with operation("Save") as timing:
+                    append_record(self.lcr_file_path, data)
+                    with self.spc_lock:
+                        alarms = self.spc_store().add_record(data)
+                        self.spc.save()
+                self.show_last_action(timing["summary"])
 
                 messagebox.showinfo("Success", "Data saved successfully!")
+                self.show_spc_alarms(alarms)
 
             # Send Mail button
             def send_email():
                 try:
                     # Initialize Outlook application
+                    import win32com.client as win32
                     outlook = win32.Dispatch('Outlook.Application')
                     mail = outlook.CreateItem(0)  # 0 represents a mail item
 
                     # Configure email fields
-                    subject = "LCR Correction Data for Material"
-                    body = f"""
-                    Dear Concerned,
-
-                    Please find the following LCR correction details:
-
-                    Material: {self.data['Material']}
-                    Description: {self.data['Description']}
-                    File: {self.data['File']}
-                    Line: {self.data['Line']}
-                    Machine & Side: {self.data['Machine & Side']}
-                    Standard Value: {self.data['Standard Value']}
-                    Measured Value: {self.data['Measured Value']}
-                    AVL: {self.data['AVL']}
-                    Error: {self.data['Error']}
-                    Remarks: {self.data['Remarks']}
-                    Standard Tol%: {self.data['Standard Tol%']}
-                    Correction Tol%: {self.data['Correction Tol%']}
-
-                    Best regards,
-                    Your Team
-                    """
+                    subject, body = render_mail(self.data)
                     
                     # Add recipients from your settings (can be loaded from JSON)
                     recipients = self.email_config.get("recipients", [])
@@ -364,24 +408,16 @@ class ExcelSearchApp:
                     mail.Subject = subject
                     mail.Body = body
                     
-                    # Send the email
-                    mail.Send()
-
-                    # After sending the email, update the Excel with status and timestamp
-                    self.data["Timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    self.data["Status"] = "Sent"
-                    df = pd.read_excel(self.lcr_file_path)
-
-                    # Ensure the columns in the data dictionary match the DataFrame columns
-                    columns = df.columns.tolist()
-                    for col in columns:
-                        if col not in self.data:
-                            self.data[col] = None  # If any column is missing, add None
+                    with operation("Send Mail") as timing:
+                        # Send the email
+                        with span("mail send", recipients=len(recipients)):
+                            mail.Send()
 
-                    # Convert the data dictionary to a DataFrame
-                    new_row = pd.DataFrame([self.data])
-                    df = pd.concat([df, new_row], ignore_index=True)
-                    df.to_excel(self.lcr_file_path, index=False)
+                        # After sending the email, update the Excel with status and timestamp
+                        self.data["Timestamp"] = timestamp(seconds=True)
+                        self.data["Status"] = "Sent"
+                        append_record(self.lcr_file_path, self.data)
+                    self.show_last_action(timing["summary"])
 
                     messagebox.showinfo("Mail Sent", "The data has been emailed to the concerned persons.")
                     popup.destroy()
@@ -394,16 +430,372 @@ class ExcelSearchApp:
 
     def clear_results(self):
         """Clear the results table."""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.tree.clear()
+
+    def run_in_background(self, work, done, busy_text=""):
+        """Run ``work()`` in a worker thread, then ``done(result)`` on the Tk thread.
+
+        An exception raised by ``work`` is shown in an error box instead.
+        """
+        def run():
+            try:
+                result = work()
+            except Exception as e:
+                message = str(e) or type(e).__name__
+                self.root.after(0, lambda: messagebox.showerror("Error", message))
+            else:
+                self.root.after(0, lambda: done(result))
+
+        if busy_text:
+            self.status_label.config(text=busy_text)
+        threading.Thread(target=run, daemon=True).start()
+
+    def sync_where_used(self):
+        """Bring the where-used map up to date; only new or changed BOMs are read.
+
+        Called from worker threads holding ``where_used_lock``; returns the
+        read errors by file for show_read_errors().
+        """
+        from LCRwhereused import WhereUsedMap
+
+        if self.where_used is None:
+            self.where_used = WhereUsedMap(self.folder_path)
+        self.where_used.sync()
+        return dict(self.where_used.errors)
+
+    def show_read_errors(self, errors):
+        """Report the BOMs sync_where_used() could not read."""
+        for file_name, error in errors.items():
+            messagebox.showerror("Error", f"Error reading file {file_name}: {error}")
+
+    def show_where_used(self):
+        """List every BOM using the entered material, from the where-used map."""
+        from LCRdaemon import query_where_used
+
+        material = self.search_entry.get().strip()
+        if not material:
+            messagebox.showwarning("Warning", "Please enter a value to search.")
+            return
+
+        def work():
+            with operation("Where Used") as timing:
+                uses, errors = query_where_used(self.folder_path, material), {}
+                if uses is None:
+                    with self.where_used_lock:
+                        errors = self.sync_where_used()
+                        uses = self.where_used.query(material)
+            return uses, errors, timing["summary"]
+
+        self.run_in_background(work, lambda result: self.show_uses(material, *result),
+                               f"Where Used: looking up {material} ...")
+
+    def show_uses(self, material, uses, errors, summary):
+        """Show the where-used result of show_where_used()."""
+        self.show_last_action(summary)
+        self.show_read_errors(errors)
+        window = tk.Toplevel(self.root)
+        window.title(f"Where Used: {material}")
+        window.geometry("900x400")
+        ttk.Label(window, text=f"{material} is used in {len(uses)} BOM(s)", font=("Arial", 12, "bold")).pack(pady=5)
+        columns = ("File", "Quantity", "Description", "Rows")
+        tree = VirtualTreeview(window, columns=columns, show="headings")
+        for column in columns:
+            tree.heading(column, text=column, anchor="w")
+        tree.pack(fill="both", expand=True, padx=10, pady=10)
+        tree.set_rows((file_name, f"{quantity:g}", description, rows) for file_name, quantity, description, rows in uses)
+
+    def export_cross_reference(self):
+        """Export the material x BOM quantity matrix of the whole folder."""
+        path = filedialog.asksaveasfilename(title="Export Cross-Reference", defaultextension=".xlsx",
+                                            filetypes=[("Excel", "*.xlsx"), ("CSV", "*.csv")])
+        if not path:
+            return
+
+        def work():
+            with operation("Export Cross-Reference") as timing, self.where_used_lock:
+                errors = self.sync_where_used()
+                materials, boms = len(self.where_used.export_matrix(path)), len(self.where_used.files())
+            return materials, boms, errors, timing["summary"]
+
+        def done(result):
+            materials, boms, errors, summary = result
+            self.show_last_action(summary)
+            self.show_read_errors(errors)
+            messagebox.showinfo("Exported", f"{materials} materials across {boms} BOMs written to {path}")
+
+        self.run_in_background(work, done, "Export Cross-Reference: reading BOMs ...")
+
+    def load_meter_log(self):
+        """Load a bench meter log (CSV/TSV) and keep following it for new readings."""
+        from LCRingest import LogFollower
+
+        path = filedialog.askopenfilename(title="Load Meter Log",
+                                          filetypes=[("Meter logs", "*.csv *.tsv *.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        if self.meter_stop is not None:
+            self.meter_stop.set()
+        self.meter_log = LogFollower(path)
+        self.meter_readings = {}
+        self.meter_stop = threading.Event()
+        threading.Thread(target=self.follow_meter_log, args=(self.meter_log, self.meter_stop), daemon=True).start()
+
+    def follow_meter_log(self, follower, stop):
+        """Worker thread: read the rows appended to the meter log every METER_POLL_MS until ``stop`` is set.
+
+        The first poll reads the whole existing log. Readings go into the
+        SPC statistics here, except those an earlier load of the same log
+        already added, and are handed to the Tk thread with root.after.
+        """
+        from LCRingest import latest_readings, unreadable
+
+        with self.spc_lock:
+            added = self.spc_store().log_position(follower.path)
+        try:
+            if os.path.getsize(follower.path) < added:
+                added = 0  # the log was restarted since
+        except OSError:
+            pass
+        while not stop.is_set():
+            try:
+                # The rows added before are only read for the latest readings
+                counted = follower.position >= added
+                readings = follower.poll() if counted else follower.poll(until=added)
+            except ValueError as e:  # no material / value column
+                self.root.after(0, self.meter_log_failed, follower, str(e))
+                return
+            if not counted:
+                added = follower.position
+            if len(readings):
+                alarms = []
+                if counted:
+                    with self.spc_lock:
+                        alarms = self.spc_store().add_readings(readings, follower.path, follower.position)
+                        self.spc.save()
+                last = f"{readings['Material'].iloc[-1]} = {readings['Measured Value'].iloc[-1]}"
+                skipped = unreadable(readings)
+                if skipped:
+                    last += f"; no value read from {', '.join(skipped[:5])}"
+                self.root.after(0, self.show_meter_readings, follower, latest_readings(readings), last, alarms)
+            if counted:
+                stop.wait(METER_POLL_MS / 1000)
+
+    def show_meter_readings(self, follower, latest, last, alarms):
+        """Take in the latest readings by material that follow_meter_log() found."""
+        if follower is not self.meter_log:
+            return  # another log was loaded meanwhile
+        self.meter_readings.update(latest)
+        self.status_label.config(text=f"Meter log: {len(self.meter_readings)} materials, last {last}")
+        self.show_spc_alarms(alarms)
+
+    def meter_log_failed(self, follower, error):
+        """Stop following a meter log follow_meter_log() cannot read."""
+        if follower is self.meter_log:
+            messagebox.showerror("Error", f"Cannot read meter log {follower.path}: {error}")
+            self.meter_log = self.meter_stop = None
+
+    def import_meter_records(self):
+        """Create correction records for every meter log reading of a BOM material."""
+        import pandas as pd
+        from LCRingest import match_readings, read_log, to_records
+        from LCRsearch import append_records
+
+        if self.meter_log is None:
+            messagebox.showwarning("Warning", "Please load a meter log first.")
+            return
+        log_path = self.meter_log.path
+
+        def work():
+            with operation("Create Records From Log") as timing, self.where_used_lock:
+                errors = self.sync_where_used()
+                records, total = [], 0
+                for readings in read_log(log_path):
+                    matched = match_readings(readings, self.where_used)
+                    total += len(matched)
+                    records.append(to_records(matched))
+                imported = append_records(self.lcr_file_path, pd.concat(records)) if total else 0
+            return imported, total, errors, timing["summary"]
+
+        def done(result):
+            imported, total, errors, summary = result
+            self.show_last_action(summary)
+            self.show_read_errors(errors)
+            messagebox.showinfo("Records Created", f"{imported} of {total} readings matched a BOM material and "
+                                                   f"were added to {self.lcr_file_path}")
+
+        self.run_in_background(work, done, "Create Records From Log: matching readings ...")
+
+    def load_part_index(self):
+        """Load the material -> LCR check index of the part library; returns it, or None when unusable.
+
+        Runs in worker threads. A library that is missing or cannot be
+        decoded is reported once in the status bar and not tried again.
+        """
+        from LCRpartindex import PartIndex
+
+        with self.part_index_lock:
+            if self.part_index is None and self.part_index_error is None:
+                self.part_index = PartIndex(self.library_path)
+            index = self.part_index
+        if index is None:
+            return None
+        try:
+            return index.load()
+        except Exception as e:
+            with self.part_index_lock:
+                if self.part_index is None:
+                    return None  # already reported by another thread
+                self.part_index, self.part_index_error = None, str(e) or type(e).__name__
+            self.root.after(0, lambda: self.status_label.config(
+                text=f"Part library not loaded, standards are not pre-filled: {self.part_index_error}"))
+            return None
+
+    def part_defaults(self, material):
+        """Standard Value / Standard Tol% of ``material`` from the part library (empty when unknown).
+
+        Never waits for the index: until the background load has finished
+        there is nothing to pre-fill.
+        """
+        index = self.part_index
+        if index is None or index.parts is None:
+            return {}
+        return index.defaults(material)
+
+    def export_missing_lcr_data(self):
+        """Export the BOM materials that have no LCR check data in the part library."""
+        path = filedialog.asksaveasfilename(title="Missing LCR Data Report", defaultextension=".xlsx",
+                                            filetypes=[("Excel", "*.xlsx"), ("CSV", "*.csv")])
+        if not path:
+            return
+
+        def work():
+            index = self.load_part_index()
+            if index is None:
+                return None
+            with operation("Missing LCR Data Report") as timing, self.where_used_lock:
+                errors = self.sync_where_used()
+                report = index.missing_report(self.where_used)
+                if path.lower().endswith(".csv"):
+                    report.to_csv(path, index=False, encoding="utf-8-sig")
+                else:
+                    report.to_excel(path, index=False)
+            return len(report), errors, timing["summary"]
+
+        def done(result):
+            if result is None:
+                messagebox.showerror("Error", f"Cannot load part library {self.library_path}: {self.part_index_error}")
+                return
+            missing, errors, summary = result
+            self.show_last_action(summary)
+            self.show_read_errors(errors)
+            messagebox.showinfo("Exported", f"{missing} BOM materials without LCR check data written to {path}")
+
+        self.run_in_background(work, done, "Missing LCR Data Report: reading BOMs ...")
+
+    def spc_store(self):
+        """The SPC statistics, loaded from their saved state on first use."""
+        from LCRspc import SPCStore
+
+        if self.spc is None:
+            self.spc = SPCStore()
+        return self.spc
+
+    def show_spc_alarms(self, alarms):
+        """Note measurements that broke an SPC rule, without a modal box.
+
+        A stream / rule already waiting for acknowledgement is only counted,
+        so a meter log breaking the same rule every poll does not flood the
+        operator.
+        """
+        from LCRspc import format_alarms
+
+        if not alarms:
+            return
+        new = [alarm for alarm in dict.fromkeys(alarms) if alarm not in self.spc_alarms]
+        for alarm in alarms:
+            self.spc_alarms[alarm] = self.spc_alarms.get(alarm, 0) + 1
+        if new:
+            self.alarm_label.config(text=f"SPC: {len(self.spc_alarms)} unacknowledged alarm(s), last "
+                                         f"{format_alarms(new[-1:])} (click to review)")
+        self.refresh_spc_alarms()
+
+    def open_spc_alarms(self):
+        """Open the non-modal list of unacknowledged SPC alarms."""
+        if self.alarm_window is not None:
+            self.alarm_window.lift()
+            return
+        window = self.alarm_window = tk.Toplevel(self.root)
+        window.title("SPC Alarms")
+        window.geometry("900x400")
+        window.protocol("WM_DELETE_WINDOW", self.close_spc_alarms)
+        columns = ("Stream", "Rule", "Count")
+        window.tree = VirtualTreeview(window, columns=columns, show="headings")
+        for column in columns:
+            window.tree.heading(column, text=column, anchor="w")
+        window.tree.pack(fill="both", expand=True, padx=10, pady=10)
+        ttk.Button(window, text="Acknowledge All", command=self.acknowledge_spc_alarms).pack(pady=(0, 10))
+        self.refresh_spc_alarms()
+
+    def refresh_spc_alarms(self):
+        if self.alarm_window is not None:
+            self.alarm_window.tree.set_rows((" ".join(part for part in key[:3] if part), rule, count)
+                                            for (key, rule), count in self.spc_alarms.items())
+
+    def acknowledge_spc_alarms(self):
+        """Clear the listed alarms; a stream / rule breaking again is reported anew."""
+        self.spc_alarms = {}
+        self.alarm_label.config(text="")
+        self.refresh_spc_alarms()
+
+    def close_spc_alarms(self):
+        self.alarm_window.destroy()
+        self.alarm_window = None
+
+    def export_spc_summary(self):
+        """Export Cp/Cpk and control limits of every material / line / machine."""
+        path = filedialog.asksaveasfilename(title="Export SPC Summary", defaultextension=".xlsx",
+                                            filetypes=[("Excel", "*.xlsx"), ("CSV", "*.csv")])
+        if not path:
+            return
+        with self.spc_lock:
+            summary = self.spc_store().summary()
+        if path.lower().endswith(".csv"):
+            summary.to_csv(path, index=False, encoding="utf-8-sig")
+        else:
+            summary.to_excel(path, index=False)
+        messagebox.showinfo("Exported", f"{len(summary)} SPC streams written to {path}")
+
+    def show_last_action(self, summary):
+        """Show the timing summary of an action (see LCRperf.operation) in the status bar."""
+        self.status_label.config(text=summary)
+
+    def profile_next_action(self):
+        """Run the next Find / Save / Send Mail under cProfile."""
+        LCRperf.profile_next()
+        self.status_label.config(text=f"The next action will be profiled to {LCRperf.PROFILE_DIR}")
 
     def on_resize(self, event):
         """Handle window resize event to adjust layout."""
         self.main_frame.update_idletasks()
 
 def main():
+    import multiprocessing
+    multiprocessing.freeze_support()  # large multi-sheet BOMs are parsed in worker processes (LCRsearch)
+
     root = tk.Tk()
     app = ExcelSearchApp(root)
+    startup.mark("window built")
+
+    def on_first_paint():
+        if startup.first_paint():
+            root.destroy()
+            return
+        warm_imports(["pandas", "LCRcheck"])
+        # Built or read from its cache in the background, so the first popup pre-fills at once
+        threading.Thread(target=app.load_part_index, daemon=True).start()
+
+    # after_idle from inside the event loop runs once the pending redraws are done
+    root.after(0, lambda: root.after_idle(on_first_paint))
     root.mainloop()
 
 if __name__ == "__main__":
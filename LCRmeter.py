@@ -0,0 +1,310 @@
+import argparse
+import asyncio
+import csv
+import random
+import sys
+import time
+import urllib.parse
+from datetime import datetime
+
+from LCRlibrary import LCR_PARAMETERS
+
+# SCPI driver for bench LCR meters (E4980A-style command set) over TCP or a
+# serial port. Measurements are pipelined: up to ``depth`` triggers are
+# outstanding while earlier results are read, so the loop runs at the
+# meter's own measurement rate instead of one round trip per reading.
+# SimulatedMeter answers the same commands on a local socket.
+#
+#   tcp://192.168.1.50:5025     LAN (raw socket, port 5025 on most meters)
+#   serial://COM3?baud=9600     RS-232/USB serial (needs pyserial-asyncio)
+#   sim://                      simulated meter started in this process
+
+# Measured quantity (LCRlibrary.LCR_PARAMETERS) -> :FUNC:IMP code
+IMPEDANCE_FUNCTIONS = {"Capacitance": "CPD", "Inductance": "LSRS", "Resistance": "RX"}
+
+DEFAULT_LEVEL = 1.0  # V rms test signal; the part library holds no level
+DEFAULT_FREQUENCY = 1000.0  # Hz, when the library has no LCR Check Frequency
+# Simulated reading of a quantity when the library gives no nominal value
+DEFAULT_NOMINALS = {"Capacitance": 10e-9, "Inductance": 1e-6, "Resistance": 1e3}
+LOG_FLUSH_SECONDS = 0.5  # a following LCRlog sees readings at least this often
+TERMINATOR = b"\n"
+LOG_COLUMNS = ["Timestamp", "Material", "Value", "Unit", "Secondary", "Status"]
+
+
+class MeterError(Exception):
+    """The meter reported an error or answered something that is not a reading."""
+
+
+def test_settings(decoded_row, level=DEFAULT_LEVEL):
+    """Meter settings (function, frequency, level) for one decoded part-library row.
+
+    ``decoded_row`` carries LCRlibrary.DECODED_COLUMNS; the test frequency
+    comes from the LCR Check Frequency fields.
+    """
+    quantity = decoded_row.get("LCR Quantity") or "Capacitance"
+    frequency = decoded_row.get("Test Frequency (Hz)")
+    if frequency is None or frequency != frequency or frequency <= 0:
+        frequency = DEFAULT_FREQUENCY
+    return {"function": IMPEDANCE_FUNCTIONS[quantity], "frequency": float(frequency), "level": float(level),
+            "unit": next(unit for name, unit in LCR_PARAMETERS.values() if name == quantity),
+            "nominal": decoded_row.get("Nominal (SI)"), "quantity": quantity}
+
+
+def parse_reading(line):
+    """Parse a fetch answer "+1.00E-08,+2.0E-03,+0" into (primary, secondary, status)."""
+    fields = line.strip().split(",")
+    try:
+        return float(fields[0]), float(fields[1]) if len(fields) > 1 else float("nan"), \
+            int(float(fields[2])) if len(fields) > 2 else 0
+    except ValueError:
+        raise MeterError(f"Not a reading: {line.strip()!r}") from None
+
+
+async def open_transport(url):
+    """Return an asyncio (reader, writer) pair for a tcp:// or serial:// meter address."""
+    parts = urllib.parse.urlsplit(url if "://" in url else "serial://" + url)
+    if parts.scheme == "tcp":
+        return await asyncio.open_connection(parts.hostname, parts.port or 5025)
+    if parts.scheme == "serial":
+        try:
+            import serial_asyncio
+        except ImportError:
+            raise MeterError("Serial meters need pyserial-asyncio (pip install pyserial-asyncio)") from None
+        options = urllib.parse.parse_qs(parts.query)
+        return await serial_asyncio.open_serial_connection(url=parts.netloc or parts.path,
+                                                           baudrate=int(options.get("baud", ["9600"])[0]))
+    raise MeterError(f"Unknown meter address {url!r} (use tcp://host:port or serial://PORT)")
+
+
+class SCPIMeter:
+    """Asyncio SCPI client of one LCR meter."""
+
+    def __init__(self, reader, writer, timeout=5.0):
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+
+    @classmethod
+    async def open(cls, url, timeout=5.0):
+        reader, writer = await asyncio.wait_for(open_transport(url), timeout)
+        return cls(reader, writer, timeout)
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (OSError, NotImplementedError):
+            pass
+
+    async def write(self, command):
+        self.writer.write(command.encode("ascii") + TERMINATOR)
+        await self.writer.drain()
+
+    async def read_line(self):
+        line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+        if not line:
+            raise MeterError("Meter closed the connection")
+        return line.decode("ascii", errors="replace").strip()
+
+    async def query(self, command):
+        await self.write(command)
+        return await self.read_line()
+
+    async def identify(self):
+        return await self.query("*IDN?")
+
+    async def configure(self, function, frequency, level, **_):
+        """Set the measurement function, test frequency (Hz) and level (V), then check for errors."""
+        await self.write(f":FUNC:IMP {function};:FREQ {frequency:g};:VOLT {level:g};:TRIG:SOUR BUS")
+        error = await self.query(":SYST:ERR?")
+        if not error.startswith(("+0", "0")):
+            raise MeterError(f"Meter rejected the settings: {error}")
+
+    async def readings(self, count=None, depth=8):
+        """Yield (primary, secondary, status) readings, keeping ``depth`` triggers in flight.
+
+        ``count=None`` measures until the consumer stops iterating.
+        """
+        sent = received = 0
+        try:
+            while count is None or received < count:
+                while sent - received < depth and (count is None or sent < count):
+                    self.writer.write(b"*TRG" + TERMINATOR)
+                    sent += 1
+                await self.writer.drain()
+                line = await self.read_line()
+                received += 1
+                yield parse_reading(line)
+        finally:
+            # Drain the answers of triggers still in flight so the next query lines up
+            for _ in range(sent - received):
+                try:
+                    await self.read_line()
+                except (MeterError, asyncio.TimeoutError, OSError):
+                    break
+
+
+class SimulatedMeter:
+    """Local socket server answering the SCPI subset used by SCPIMeter.
+
+    Readings scatter around ``nominal`` (SI units of the configured
+    function) with ``spread`` relative standard deviation. Triggers are
+    measured one after another, ``measure_time`` seconds each, as a meter's
+    aperture does, and every answer arrives ``latency`` seconds after it is
+    ready, as over a LAN or serial link.
+    """
+
+    def __init__(self, nominal=10e-9, spread=0.01, measure_time=0.002, latency=0.002, seed=None):
+        self.nominal = nominal
+        self.spread = spread
+        self.measure_time = measure_time
+        self.latency = latency
+        self.random = random.Random(seed)
+        self.settings = {":FUNC:IMP": "CPD", ":FREQ": "1000", ":VOLT": "1", ":TRIG:SOUR": "INT"}
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        self.server = await asyncio.start_server(self._serve, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def _answer(self, command):
+        name, _, argument = command.strip().partition(" ")
+        name = name.upper()
+        if name == "*IDN?":
+            return "LCRlog,Simulated LCR Meter,0,1.0"
+        if name in ("*TRG", ":FETC?", "FETC?"):
+            value = self.random.gauss(self.nominal, abs(self.nominal) * self.spread)
+            return f"{value:+.5E},{self.random.uniform(0, 0.01):+.5E},+0"
+        if name == ":SYST:ERR?":
+            return '+0,"No error"'
+        if name.endswith("?"):
+            return self.settings.get(name[:-1], "0")
+        if name == ":SIM:NOM":
+            self.nominal = float(argument)
+        else:
+            self.settings[name] = argument
+        return None
+
+    async def _serve(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        busy_until = 0.0  # the end of the last queued measurement
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                for command in line.decode("ascii", errors="replace").split(";"):
+                    busy_until = max(busy_until, loop.time())
+                    if command.strip().upper() == "*TRG":
+                        busy_until += self.measure_time
+                    answer = self._answer(command)
+                    if answer is not None:
+                        loop.call_at(busy_until + self.latency, writer.write, answer.encode("ascii") + TERMINATOR)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+
+async def acquire(url, settings, material="", count=None, depth=8, on_reading=None, simulator=None):
+    """Configure the meter for ``settings`` and stream readings to ``on_reading(row)``.
+
+    Each row is a LOG_COLUMNS dict; returns the number of readings taken.
+    A sim:// address is served locally by ``simulator``, by default a
+    SimulatedMeter around the nominal value of ``settings``.
+    """
+    if url.startswith("sim://"):
+        nominal = settings.get("nominal")
+        if not nominal or nominal != nominal:
+            nominal = DEFAULT_NOMINALS[settings.get("quantity") or "Capacitance"]
+        simulator = simulator or SimulatedMeter(nominal)
+        url = f"tcp://127.0.0.1:{await simulator.start()}"
+    else:
+        simulator = None
+    meter = await SCPIMeter.open(url)
+    taken = 0
+    try:
+        await meter.configure(**settings)
+        async for primary, secondary, status in meter.readings(count, depth):
+            taken += 1
+            if on_reading:
+                on_reading({"Timestamp": datetime.now().isoformat(timespec="milliseconds"), "Material": material,
+                            "Value": f"{primary:.6g}", "Unit": settings["unit"], "Secondary": f"{secondary:.6g}",
+                            "Status": status})
+    finally:
+        await meter.close()
+        if simulator:
+            await simulator.stop()
+    return taken
+
+
+def _library_settings(library_path, part_number, level):
+    from LCRlibrary import PART_NUMBER, decode_library, iter_table_chunks
+
+    for chunk in iter_table_chunks(library_path):
+        rows = chunk[chunk[PART_NUMBER].astype(str) == part_number]
+        if len(rows):
+            return test_settings(decode_library(rows).iloc[0].to_dict(), level)
+    raise SystemExit(f"{part_number} is not in {library_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure with a SCPI LCR meter and write a meter log LCRlog can follow.")
+    parser.add_argument("address", help="tcp://host:port, serial://PORT?baud=N or sim:// for the simulated meter")
+    parser.add_argument("--material", default="", help="Material written with each reading")
+    parser.add_argument("--library", help="Part-library export to take the test frequency from")
+    parser.add_argument("--part", help="Part number in --library (default --material)")
+    parser.add_argument("--quantity", choices=sorted(IMPEDANCE_FUNCTIONS), default="Capacitance",
+                        help="Measured quantity without --library")
+    parser.add_argument("--frequency", type=float, help="Test frequency in Hz (overrides the library)")
+    parser.add_argument("--level", type=float, default=DEFAULT_LEVEL, help=f"Test level in V (default {DEFAULT_LEVEL:g})")
+    parser.add_argument("--count", type=int, help="Readings to take (default: until interrupted)")
+    parser.add_argument("--depth", type=int, default=8, help="Triggers kept in flight (default 8)")
+    parser.add_argument("--log", help="Append readings to this meter log (CSV)")
+    args = parser.parse_args()
+
+    if args.library:
+        settings = _library_settings(args.library, args.part or args.material, args.level)
+    else:
+        settings = test_settings({"LCR Quantity": args.quantity, "Test Frequency (Hz)": DEFAULT_FREQUENCY}, args.level)
+    if args.frequency:
+        settings["frequency"] = args.frequency
+
+    output = open(args.log, "a", newline="", encoding="utf-8") if args.log else sys.stdout
+    writer = csv.DictWriter(output, LOG_COLUMNS)
+    if not args.log or output.tell() == 0:
+        writer.writeheader()
+    started = flushed = time.perf_counter()
+    taken = 0
+
+    def on_reading(row):
+        nonlocal taken, flushed
+        writer.writerow(row)
+        taken += 1
+        # Let a following LCRlog see the rows, also when the meter is slow
+        if taken % 100 == 0 or time.perf_counter() - flushed >= LOG_FLUSH_SECONDS:
+            output.flush()
+            flushed = time.perf_counter()
+
+    try:
+        asyncio.run(acquire(args.address, settings, args.material or args.part or "", args.count, args.depth,
+                            on_reading))
+    except KeyboardInterrupt:
+        pass
+    except (MeterError, OSError, asyncio.TimeoutError) as e:
+        raise SystemExit(f"Meter {args.address}: {e or 'no answer'}")
+    finally:
+        output.flush()
+        if args.log:
+            output.close()
+    elapsed = time.perf_counter() - started
+    print(f"{taken} readings at {settings['frequency']:g} Hz / {settings['level']:g} V, "
+          f"{taken / elapsed if elapsed else 0:,.0f} readings/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
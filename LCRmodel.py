@@ -0,0 +1,364 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QThread, pyqtSignal
+
+from LCRcompact import compact_with_report, format_memory_report
+from LCRlibrary import PART_NUMBER, VENDER_LOT, iter_decoded_library, load_snapshot, save_snapshot
+
+
+# Model for displaying large Pandas DataFrames in QTableView.
+# Cells are never read through DataFrame.iloc: every column is held as a
+# NumPy array, rows are exposed to the view in batches (canFetchMore /
+# fetchMore) and display strings are formatted a block of rows at a time
+# into a bounded LRU cache, so painting a cell is a dict lookup.
+#
+# Sorting and filtering never call back into Python per row: both are
+# computed with NumPy over per-column sort keys and produce an array of row
+# positions that the model renders through.
+class PandasModel(QAbstractTableModel):
+    def __init__(self, data, batch_size=5000, block_size=256, max_cached_blocks=64):
+        super().__init__()
+        self.batch_size = batch_size
+        self.block_size = block_size
+        self.max_cached_blocks = max_cached_blocks
+        self._blocks = OrderedDict()
+        self._set_data(data)
+        self._loaded = min(self._total, batch_size)
+
+    def _set_data(self, data):
+        self._data = data
+        self._columns = [str(column) for column in data.columns]
+        self._arrays = [self._column_array(data.iloc[:, position]) for position in range(data.shape[1])]
+        self._index = data.index.to_numpy()
+        self._keys = {}
+        self._sort_order = None  # full-table permutation of the active sort
+        self._sort_state = None  # (column, order) of the active sort
+        self._filters = {}
+        self._mask = None  # rows passing the active filters
+        self._rows = None  # row positions shown, None for all rows in frame order
+        self._total = data.shape[0]
+        self._pending = []  # chunks appended while loading: (first row, rows, chunk, column arrays)
+        self._blocks.clear()
+
+    def set_frame(self, data):
+        """Replace the shown frame."""
+        self.beginResetModel()
+        self._set_data(data)
+        self._loaded = min(self._total, self.batch_size)
+        self.endResetModel()
+
+    def append_frame(self, chunk):
+        """Append rows (e.g. a chunk from LibraryLoader) without copying the rows already held.
+
+        Chunks are kept as they are and joined to the frame once, by
+        finish_loading(). Without a sort or filter the new rows are shown
+        straight away; a sorted or filtered view takes them in at
+        finish_loading().
+        """
+        if chunk.empty:
+            return
+        if self._data.shape[1] == 0 or list(chunk.columns) != list(self._data.columns):
+            self.set_frame(chunk.reset_index(drop=True))
+            return
+
+        arrays = [self._column_array(chunk.iloc[:, position]) for position in range(chunk.shape[1])]
+        self._pending.append((self.total_rows(), len(chunk), chunk, arrays))
+        if self._rows is None:
+            # Plain append: the new rows are fetched as the view scrolls
+            self._total += len(chunk)
+            count = min(self._total, self.batch_size) - self._loaded
+            if count > 0:
+                self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+                self._loaded += count
+                self.endInsertRows()
+
+    def finish_loading(self):
+        """Join the appended chunks to the frame in one concat; returns the full frame.
+
+        The active sort and filters are reapplied to the joined rows.
+        """
+        if not self._pending:
+            return self._data
+        data = pd.concat([self._data] + [chunk for _, _, chunk, _ in self._pending], ignore_index=True)
+        sort_state, filters, loaded = self._sort_state, dict(self._filters), self._loaded
+        self._set_data(data)
+        if sort_state is None and not filters:
+            self._loaded = loaded  # same rows in the same order
+            return data
+        self._filters = filters
+        if sort_state is not None:
+            self.sort(*sort_state)
+        self._apply_filters()
+        return data
+
+    def replace_frame(self, data):
+        """Swap in a frame holding the same rows in another representation.
+
+        Used when the loaded library is replaced by its compacted copy: row
+        positions stay valid, so the active sort, filters and fetched rows
+        are kept and only the cached keys and display strings are dropped.
+        """
+        if data.shape != self._data.shape:
+            self.set_frame(data)
+            return
+        self._data = data
+        self._arrays = [self._column_array(data.iloc[:, position]) for position in range(data.shape[1])]
+        self._keys = {}
+        self._blocks.clear()
+        if self._loaded:
+            self.dataChanged.emit(self.index(0, 0), self.index(self._loaded - 1, len(self._columns) - 1))
+
+    @staticmethod
+    def _column_array(column):
+        # Datetime arrays would turn into integers through tolist(), and
+        # categorical / nullable integer columns would be expanded into one
+        # object per row; keep the Series and convert only the rows of a block
+        if column.dtype.kind in "mM" or not isinstance(column.dtype, np.dtype):
+            return column
+        return column.to_numpy()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.batch_size, self._total - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def _block(self, block_number):
+        """Return the formatted strings of one block of rows as a list of columns."""
+        block = self._blocks.get(block_number)
+        if block is not None:
+            self._blocks.move_to_end(block_number)
+            return block
+
+        start = block_number * self.block_size
+        stop = min(start + self.block_size, self._total)
+        if self._rows is not None:
+            block = [self._format_rows(array, self._rows[start:stop]) for array in self._arrays]
+        else:
+            # In frame order the block may reach into chunks not joined yet
+            block = [[] for _ in self._arrays]
+            for first, count, arrays in [(0, len(self._index), self._arrays)] + \
+                    [(first, count, arrays) for first, count, _, arrays in self._pending]:
+                rows = slice(max(start, first) - first, min(stop, first + count) - first)
+                if rows.start < rows.stop:
+                    for cells, array in zip(block, arrays):
+                        cells.extend(self._format_rows(array, rows))
+        self._blocks[block_number] = block
+        if len(self._blocks) > self.max_cached_blocks:
+            self._blocks.popitem(last=False)
+        return block
+
+    @staticmethod
+    def _format_rows(array, rows):
+        if hasattr(array, "iloc"):  # Series kept by _column_array; missing cells shown empty
+            values = array.iloc[rows].astype(object)
+            return list(map(str, values.where(values.notna(), "").tolist()))
+        return list(map(str, array[rows].tolist()))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        row = index.row()
+        return self._block(row // self.block_size)[index.column()][row % self.block_size]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            if orientation == Qt.Horizontal:
+                return self._columns[section]
+            if orientation == Qt.Vertical:
+                row = section if self._rows is None else self._rows[section]
+                return str(self._index[row]) if row < len(self._index) else str(row)  # appended rows
+        return None
+
+    def total_rows(self):
+        """Number of rows in the underlying frame and appended chunks, ignoring filters."""
+        return len(self._index) + sum(count for _, count, _, _ in self._pending)
+
+    def visible_rows(self):
+        """Number of rows passing the active filters."""
+        return self._total
+
+    def _column_keys(self, column):
+        """Return the cached sort/filter keys of a column as a dict.
+
+        Every distinct cell is converted once. "codes" maps rows to distinct
+        cells (-1 for missing cells) and "numeric" holds each distinct cell as
+        a float (NaN when not a number). "text" and "text_rank" (position in
+        case-insensitive string order) are added by _text_keys when needed.
+        """
+        keys = self._keys.get(column)
+        if keys is None:
+            series = self._data.iloc[:, column]
+            codes, uniques = pd.factorize(series)
+            if series.dtype.kind in "iufb":
+                numeric = np.asarray(uniques, dtype=float)
+            else:
+                uniques = pd.Series(uniques, dtype=object)
+                numeric = np.full(len(uniques), np.nan)
+                # Only cells that start like a number are worth a to_numeric call
+                candidates = uniques.astype(str).str.match(r"\s*[-+]?\.?\d").to_numpy(dtype=bool)
+                numeric[candidates] = pd.to_numeric(uniques[candidates], errors="coerce").to_numpy(dtype=float)
+            keys = self._keys[column] = {"codes": codes, "uniques": uniques, "numeric": numeric}
+        return keys
+
+    def _text_keys(self, column):
+        """Add the display strings and their string-order rank to a column's keys."""
+        keys = self._column_keys(column)
+        if "text" not in keys:
+            text = pd.Series(keys["uniques"], dtype=object).astype(str)
+            text_rank = np.empty(len(text), dtype=np.int64)
+            text_rank[np.argsort(text.str.lower().to_numpy(dtype=str), kind="stable")] = np.arange(len(text))
+            keys["text"], keys["text_rank"] = text, text_rank
+        return keys
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort by one column: numbers in numeric order, then text, then empty cells."""
+        if column < 0:  # sort indicator cleared: back to frame order
+            self._sort_order = self._sort_state = None
+            self._refresh_rows()
+            return
+        keys = self._column_keys(column)
+        codes, numeric = keys["codes"], keys["numeric"]
+        missing = codes < 0
+        safe_codes = np.where(missing, 0, codes)
+        row_numeric = np.where(missing, np.nan, numeric[safe_codes]) if len(numeric) else np.full(len(codes), np.nan)
+        row_rank = np.zeros(len(codes), dtype=np.int64)
+        if np.isnan(numeric).any():
+            row_rank = np.where(missing, 0, self._text_keys(column)["text_rank"][safe_codes])
+        is_text = np.isnan(row_numeric)
+
+        self._sort_state = (column, order)
+        sign = -1 if order == Qt.DescendingOrder else 1
+        # np.lexsort sorts by the last key first
+        self._sort_order = np.lexsort((
+            sign * row_rank,
+            sign * np.where(is_text, 0, row_numeric),
+            is_text,
+            missing,
+        ))
+        self._refresh_rows()
+
+    def set_filter(self, column, value):
+        """Filter one column by a substring or a (minimum, maximum) numeric range.
+
+        Either range end may be None. An empty value removes the column's filter.
+        """
+        if value is None or value == "":
+            self._filters.pop(column, None)
+        else:
+            self._filters[column] = value
+        self._apply_filters()
+
+    def clear_filters(self):
+        """Remove all column filters."""
+        self._filters.clear()
+        self._apply_filters()
+
+    def _apply_filters(self):
+        mask = None
+        for column, value in self._filters.items():
+            keys = self._column_keys(column)
+            codes, numeric = keys["codes"], keys["numeric"]
+            if isinstance(value, tuple):
+                minimum, maximum = value
+                hits = ~np.isnan(numeric)
+                if minimum is not None:
+                    hits &= numeric >= minimum
+                if maximum is not None:
+                    hits &= numeric <= maximum
+            else:
+                text = self._text_keys(column)["text"]
+                hits = text.str.contains(str(value), case=False, regex=False).to_numpy(dtype=bool)
+            column_mask = np.zeros(len(codes), dtype=bool)
+            present = codes >= 0
+            column_mask[present] = hits[codes[present]]
+            mask = column_mask if mask is None else mask & column_mask
+        self._mask = mask
+        self._refresh_rows()
+
+    def _refresh_rows(self):
+        """Rebuild the shown row positions from the active sort and filters."""
+        self.beginResetModel()
+        if self._sort_order is None:
+            self._rows = None if self._mask is None else np.flatnonzero(self._mask)
+        elif self._mask is None:
+            self._rows = self._sort_order
+        else:
+            self._rows = self._sort_order[self._mask[self._sort_order]]
+        self._total = self.total_rows() if self._rows is None else len(self._rows)
+        self._loaded = min(self._total, self.batch_size)
+        self._blocks.clear()
+        self.endResetModel()
+
+
+# Loads a part-library export in a background thread so the window can show
+# immediately: decoded chunks are emitted as they are parsed and handed over,
+# the loader keeps no copy. The receiving PandasModel joins them once
+# (finish_loading) and LibraryCompactor then compacts the full frame (see
+# LCRcompact) and caches it as a snapshot, which later launches load in one
+# step.
+class LibraryLoader(QThread):
+    chunk_loaded = pyqtSignal(object)
+    loading_finished = pyqtSignal(int, bool)  # rows, loaded from snapshot
+    loading_failed = pyqtSignal(str)
+
+    def __init__(self, path, chunksize=50000, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.chunksize = chunksize
+
+    def run(self):
+        try:
+            snapshot = load_snapshot(self.path)
+            if snapshot is not None:
+                self.chunk_loaded.emit(snapshot)
+                self.loading_finished.emit(len(snapshot), True)
+                return
+
+            rows = 0
+            for chunk in iter_decoded_library(self.path, self.chunksize):
+                rows += len(chunk)
+                self.chunk_loaded.emit(chunk)
+            self.loading_finished.emit(rows, False)
+        except Exception as e:
+            self.loading_failed.emit(str(e))
+
+
+class LibraryCompactor(QThread):
+    """Compacts a loaded part library and saves it as the snapshot of its export."""
+
+    library_compacted = pyqtSignal(object, str)  # compact copy of all rows, memory report
+
+    def __init__(self, path, library, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.library = library
+
+    def run(self):
+        try:
+            # Numbered part numbers and lots stay text
+            library, report = compact_with_report(self.library, text_columns=(PART_NUMBER, VENDER_LOT))
+        except Exception:
+            return  # the loaded frame stays as it is
+        finally:
+            self.library = None
+        self.library_compacted.emit(library, format_memory_report(report))
+        try:
+            save_snapshot(self.path, library)
+        except OSError:
+            pass  # no cache this time; the export is parsed again on the next launch
@@ -0,0 +1,151 @@
+import argparse
+import hashlib
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from LCRlibrary import (LCR_CHECK, LCR_TOLERANCE, PART_NUMBER, SNAPSHOT_DIR, decode_library, iter_table_chunks,
+                        load_snapshot)
+from LCRperf import span
+from LCRsearch import BOM_FOLDER, PART_LIBRARY, normalize_material, normalize_materials
+
+# Material -> LCR check parameters of the mounter part library, for
+# pre-filling Standard Value / Standard Tol% in the correction popup and
+# for reporting BOM materials without LCR check data. The library is
+# decoded and reduced to one row per material once per library version
+# and kept as a pickle; lookups are dict hits on normalize_material() keys.
+
+PART_COLUMNS = ["Key", "Part Number", "LCR Check", "LCR Quantity", "Standard Value", "Standard Tol%",
+                "Nominal (SI)", "Test Frequency (Hz)"]
+REPORT_COLUMNS = ["Material", "Description", "BOMs", "Quantity", "Reason"]
+
+
+def part_frame(library):
+    """Reduce a part-library frame (raw columns, decoded or not) to PART_COLUMNS, one row per material.
+
+    Of several vendor lots of a part, the first with LCR check data wins.
+    """
+    decoded = library if "Nominal (SI)" in library.columns else pd.concat([library, decode_library(library)], axis=1)
+    tolerance = pd.to_numeric(decoded[LCR_TOLERANCE], errors="coerce")
+    check = pd.to_numeric(decoded[LCR_CHECK], errors="coerce")
+    parts = pd.DataFrame({
+        "Key": normalize_materials(decoded[PART_NUMBER]),
+        "Part Number": decoded[PART_NUMBER].astype(str).to_numpy(),
+        "LCR Check": (check == 1).to_numpy(),
+        "LCR Quantity": decoded["LCR Quantity"].astype(str).to_numpy(),
+        "Standard Value": pd.Series(decoded["Nominal"], dtype=object).fillna("").str.replace(" ", "").to_numpy(),
+        "Standard Tol%": np.where(tolerance.notna(), tolerance.map("{:g}".format), ""),
+        "Nominal (SI)": decoded["Nominal (SI)"].to_numpy(dtype=float),
+        "Test Frequency (Hz)": decoded["Test Frequency (Hz)"].to_numpy(dtype=float),
+    })
+    return _one_per_material(parts[parts["Key"] != ""])
+
+
+def _one_per_material(parts):
+    # Lots with LCR check data first, so drop_duplicates keeps them
+    usable = parts["LCR Check"] & np.isfinite(parts["Nominal (SI)"])
+    parts = parts.assign(_usable=usable).sort_values("_usable", ascending=False, kind="stable")
+    return parts.drop_duplicates("Key").drop(columns="_usable").reset_index(drop=True)[PART_COLUMNS]
+
+
+class PartIndex:
+    """Material -> LCR check parameters of one part-library export, built once per export version."""
+
+    def __init__(self, library_path=PART_LIBRARY, cache_dir=SNAPSHOT_DIR):
+        self.library_path = library_path
+        self.cache_dir = cache_dir
+        self.parts = None  # PART_COLUMNS frame
+        self._by_key = {}
+        self._lock = threading.Lock()
+
+    def _cache_path(self):
+        stat = os.stat(self.library_path)
+        version = f"{os.path.abspath(self.library_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        key = hashlib.sha1(version.encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"partindex-{key}.pkl")
+
+    def load(self):
+        """Load the index of the current export (built when the export changed); returns self."""
+        with self._lock:
+            if self.parts is not None:
+                return self
+            cache_path = self._cache_path() if self.cache_dir else None
+            try:
+                parts = pd.read_pickle(cache_path)
+            except (TypeError, OSError, EOFError, ValueError, ImportError, AttributeError):
+                parts = self._build()
+                if cache_path:
+                    try:
+                        os.makedirs(self.cache_dir, exist_ok=True)
+                        parts.to_pickle(cache_path + ".tmp")
+                        os.replace(cache_path + ".tmp", cache_path)
+                    except OSError:
+                        pass  # rebuilt next time
+            self._by_key = dict(zip(parts["Key"], parts.to_dict("records")))
+            self.parts = parts
+        return self
+
+    def _build(self):
+        with span("part index build", library=os.path.basename(self.library_path)):
+            # The help view's decoded snapshot saves decoding the export again
+            library = load_snapshot(self.library_path)
+            if library is not None:
+                return part_frame(library)
+            return _one_per_material(pd.concat([part_frame(chunk) for chunk in iter_table_chunks(self.library_path)],
+                                               ignore_index=True))
+
+    def get(self, material):
+        """The PART_COLUMNS dict of ``material``, or None when the library does not list it."""
+        return self._by_key.get(normalize_material(material))
+
+    def defaults(self, material):
+        """{"Standard Value", "Standard Tol%"} to pre-fill for ``material``; empty without LCR check data."""
+        part = self.get(material)
+        if part is None or not part["LCR Check"] or not part["Standard Value"]:
+            return {}
+        return {"Standard Value": part["Standard Value"], "Standard Tol%": part["Standard Tol%"]}
+
+    def missing_report(self, where_used):
+        """BOM materials (from a synced WhereUsedMap) without LCR check data, as REPORT_COLUMNS."""
+        usage = where_used.usage()
+        joined = usage.merge(self.parts, how="left", left_on="Material", right_on="Key")
+        listed = joined["Key"].notna()
+        checked = listed & joined["LCR Check"].fillna(False).astype(bool) & np.isfinite(joined["Nominal (SI)"])
+        report = joined[~checked].assign(Reason=np.where(listed[~checked], "No LCR check data", "Not in part library"))
+        return report.sort_values(["BOMs", "Material"], ascending=[False, True])[REPORT_COLUMNS].reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report BOM materials without LCR check data in the part library.")
+    parser.add_argument("--library", default=PART_LIBRARY, help="Part-library export (default the SMT_LCR share)")
+    parser.add_argument("--folder", default=BOM_FOLDER, help="BOM folder (default the SMT_BOM share)")
+    parser.add_argument("--output", help="Write the report to this .xlsx/.csv")
+    parser.add_argument("materials", nargs="*", help="Only show the LCR check parameters of these materials")
+    args = parser.parse_args()
+
+    index = PartIndex(args.library).load()
+    print(f"{len(index.parts)} materials in {args.library}")
+    if args.materials:
+        for material in args.materials:
+            print(f"{material}: {index.get(material) or 'not in the part library'}")
+        return
+
+    from LCRwhereused import WhereUsedMap
+
+    where_used = WhereUsedMap(args.folder)
+    where_used.sync()
+    report = index.missing_report(where_used)
+    print(f"{len(report)} BOM materials without LCR check data")
+    if args.output:
+        if args.output.lower().endswith(".csv"):
+            report.to_csv(args.output, index=False, encoding="utf-8-sig")
+        else:
+            report.to_excel(args.output, index=False)
+    else:
+        print(report.to_string(index=False, max_rows=50))
+
+
+if __name__ == "__main__":
+    main()
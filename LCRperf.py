@@ -0,0 +1,130 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+# Timing spans for the hot paths (folder listing, BOM parsing, filtering,
+# result display, record read/write, mail send). Every span is written as a
+# JSON line to a rotating log; spans inside an operation() are also summed
+# into a one-line summary for the status bar, handed back with the result
+# of the action rather than through shared state (actions run in worker
+# threads). profile_next() captures a
+# cProfile of the next operation only.
+PERF_DIR = os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "LCRlog")
+PERF_LOG = os.path.join(PERF_DIR, "perf.log")
+PROFILE_DIR = os.path.join(PERF_DIR, "profiles")
+
+_logger = logging.getLogger("LCRperf")
+_logger.propagate = False
+_state = threading.local()
+_profile_armed = threading.Event()
+
+
+def _log(entry):
+    if not _logger.handlers:
+        try:
+            os.makedirs(PERF_DIR, exist_ok=True)
+            handler = RotatingFileHandler(PERF_LOG, maxBytes=1_000_000, backupCount=5, encoding="utf-8")
+        except OSError:
+            handler = logging.NullHandler()  # timing is informative only
+        _logger.addHandler(handler)
+        _logger.setLevel(logging.INFO)
+    _logger.info(json.dumps(entry, default=str))
+
+
+@contextmanager
+def span(name, **fields):
+    """Time a block and log it as {"span": name, "ms": ..., **fields}."""
+    started = time.perf_counter()
+    ok = True
+    try:
+        yield
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        seconds = time.perf_counter() - started
+        entry = {"ts": datetime.now().isoformat(timespec="milliseconds"), "span": name,
+                 "ms": round(seconds * 1000, 2), "ok": ok}
+        entry.update(fields)
+        operation_spans = getattr(_state, "spans", None)
+        if operation_spans is not None:
+            entry["operation"] = _state.name
+            total, count = operation_spans.get(name, (0.0, 0))
+            operation_spans[name] = (total + seconds, count + 1)
+        _log(entry)
+
+
+def _format_seconds(seconds):
+    return f"{seconds:.2f} s" if seconds >= 1 else f"{seconds * 1000:.0f} ms"
+
+
+def profile_next():
+    """Capture a cProfile of the next operation()."""
+    _profile_armed.set()
+
+
+@contextmanager
+def operation(name, **fields):
+    """Time a user action; yields a dict whose "summary" is set to its timing on exit.
+
+    The spans of the action are summed into the summary. When
+    profile_next() was called, the action runs under cProfile and the
+    stats are written to PROFILE_DIR.
+    """
+    timing = {"summary": ""}
+    profiler = None
+    if _profile_armed.is_set():
+        _profile_armed.clear()
+        import cProfile
+        profiler = cProfile.Profile()
+
+    _state.name, _state.spans = name, {}
+    started = time.perf_counter()
+    ok = True
+    if profiler:
+        profiler.enable()
+    try:
+        yield timing
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        if profiler:
+            profiler.disable()
+        seconds = time.perf_counter() - started
+        spans, _state.spans = _state.spans, None
+        entry = {"ts": datetime.now().isoformat(timespec="milliseconds"), "operation": name,
+                 "ms": round(seconds * 1000, 2), "ok": ok,
+                 "spans": {span_name: round(total * 1000, 2) for span_name, (total, _) in spans.items()}}
+        entry.update(fields)
+
+        parts = [_format_seconds(total) + f" {span_name}" + (f" x{count}" if count > 1 else "")
+                 for span_name, (total, count) in spans.items()]
+        summary = f"{name}: {_format_seconds(seconds)}"
+        if parts:
+            summary += " (" + ", ".join(parts) + ")"
+        if profiler:
+            entry["profile"] = _save_profile(profiler, name)
+            summary += f"; profile saved to {entry['profile']}"
+        timing["summary"] = summary
+        _log(entry)
+
+
+def _save_profile(profiler, name):
+    """Write .prof stats plus a text top-30 by cumulative time; returns the .prof path."""
+    import io
+    import pstats
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stem = os.path.join(PROFILE_DIR, f"{name.replace(' ', '_')}-{datetime.now():%Y%m%d-%H%M%S}")
+    profiler.dump_stats(stem + ".prof")
+    text = io.StringIO()
+    pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(30)
+    with open(stem + ".txt", "w", encoding="utf-8") as output:
+        output.write(text.getvalue())
+    return stem + ".prof"
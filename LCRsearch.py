@@ -0,0 +1,655 @@
+import argparse
+import fnmatch
+import json
+import numbers
+import os
+import re
+import sys
+import threading
+from datetime import datetime
+from decimal import Decimal
+
+from LCRperf import span
+
+# Headless part of the Excel Search Application: BOM lookup, correction
+# record appends and mail text. LCRlog's window calls these, and so do the
+# benchmarks in LCRbench. BomIndex keeps parsed workbooks in memory for
+# the lookup daemon (LCRdaemon).
+
+# Default SMT_BOM share searched by the window and the command line
+BOM_FOLDER = r"D:\NX_BACKWORK\Database_File\SMT_BOM"
+
+# Mounter part-library export holding the LCR check data (see LCRpartindex)
+PART_LIBRARY = os.environ.get("LCR_PART_LIBRARY", r"D:\NX_BACKWORK\Database_File\SMT_LCR\PartLibrary.csv")
+
+# SMT_BOM exports come with one of two header layouts
+MATERIAL_COLUMNS = ("Material", "Internal P/N")
+DESCRIPTION_COLUMNS = ("Long. Description", "Description")
+# Quantity column names seen in SMT_BOM exports (used by the where-used map)
+QUANTITY_COLUMNS = ("Quantity", "Qty", "Comp. Qty", "Component quantity")
+
+# Rows scanned for the header; BOMs may start with title rows
+HEADER_SCAN_ROWS = 30
+
+# Sheets searched (fnmatch pattern, case-insensitive), e.g. "TOP*" via LCR_BOM_SHEETS
+BOM_SHEET_PATTERN = os.environ.get("LCR_BOM_SHEETS", "*")
+
+# Workbooks at least this large have their sheets parsed in parallel processes
+PARALLEL_MIN_BYTES = 2_000_000
+
+# Streaming search (stream_lookup): rows per chunk and the Python heap cap in MB
+STREAM_CHUNK_ROWS = 5000
+STREAM_MEMORY_CAP_MB = float(os.environ.get("LCR_SEARCH_MEMORY_MB", 200))
+
+# Detected BOM schemas per file version, see bom_schema()
+SCHEMA_CACHE = os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "LCRlog", "cache",
+                            "bom-schemas-v2.json")  # v2: one entry per sheet
+
+# Fields entered in the correction popup, in display order
+RECORD_FIELDS = [
+    "Line",
+    "Machine & Side",
+    "Standard Value",
+    "Measured Value",
+    "AVL",
+    "Error",
+    "Remarks",
+    "Standard Tol%",
+    "Correction Tol%",
+]
+RECORD_COLUMNS = ["Material", "Description", "File"] + RECORD_FIELDS + ["Timestamp", "Status"]
+
+MAIL_SUBJECT = "LCR Correction Data for Material"
+
+# Part numbers Excel stored as numbers: "123456.0", "00123456", "1.23456E+5"
+_NUMERIC_MATERIAL = re.compile(r"\d+(?:\.0*)?|\d+\.\d+E\+?\d+")
+
+
+def list_bom_files(folder):
+    """Return the .xlsx file names of a BOM folder."""
+    with span("folder listing", folder=folder):
+        return [name for name in os.listdir(folder) if name.lower().endswith(".xlsx")]
+
+
+def find_columns(columns):
+    """Return (material column, description column) of a BOM header, or None when it has no material column."""
+    material_col = next((column for column in MATERIAL_COLUMNS if column in columns), None)
+    if material_col is None:
+        return None
+    desc_col = DESCRIPTION_COLUMNS[0] if DESCRIPTION_COLUMNS[0] in columns else DESCRIPTION_COLUMNS[1]
+    return material_col, desc_col
+
+
+def normalize_material(value):
+    """Canonical lookup key of a material number.
+
+    Whitespace is removed and letters upper-cased; numeric part numbers
+    lose float suffixes, exponents and leading zeros, so 123456, "123456.0",
+    " 00123456" and "1.23456E+5" share the key "123456".
+    """
+    if isinstance(value, str):
+        text = "".join(value.split()).upper()
+        if text.isdigit() and text.isascii():
+            return text.lstrip("0") or "0"
+        if _NUMERIC_MATERIAL.fullmatch(text):
+            number = Decimal(text)
+            if number == number.to_integral_value():
+                return str(int(number))
+        return text
+    if value is None or value != value:  # None / NaN
+        return ""
+    if isinstance(value, numbers.Integral):
+        return str(int(value))
+    if isinstance(value, numbers.Real) and float(value).is_integer():
+        return str(int(value))
+    return normalize_material(str(value))
+
+
+def normalize_materials(series):
+    """normalize_material() over a column, converting each distinct value once; returns an object array."""
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(series)
+    uniques = np.asarray(uniques)
+    if uniques.dtype.kind in "iu":
+        keys = uniques.astype(str).astype(object)
+    else:
+        keys = np.array([normalize_material(value) for value in uniques], dtype=object)
+    return np.append(keys, "")[codes]  # code -1 (missing) picks the appended ""
+
+
+class MaterialKeys:
+    """Normalized material keys of one BOM frame, hashed once for any number of lookups."""
+
+    def __init__(self, df):
+        import numpy as np
+        import pandas as pd
+
+        self.columns = find_columns(df.columns)
+        self._codes = np.empty(0, dtype=np.intp)  # row -> key number
+        self._numbers = {}  # key -> key number
+        if self.columns is None:
+            return
+        self._codes, uniques = pd.factorize(normalize_materials(df[self.columns[0]]))
+        self._numbers = {key: number for number, key in enumerate(uniques) if key}
+
+    def positions(self, value):
+        """Row positions whose material matches ``value`` after normalization."""
+        import numpy as np
+
+        number = self._numbers.get(normalize_material(value))
+        return [] if number is None else np.flatnonzero(self._codes == number)
+
+
+def search_frame(df, value, file_name, keys=None):
+    """Return (material, description, file, sheet) tuples of the rows whose material matches ``value``.
+
+    Materials are compared by normalize_material(); pass the frame's
+    MaterialKeys to skip building them again.
+    """
+    keys = MaterialKeys(df) if keys is None else keys
+    if keys.columns is None:
+        return []
+    material_col, desc_col = keys.columns
+    hits = df.iloc[keys.positions(value)]
+    sheets = hits["Sheet"] if "Sheet" in hits.columns else [""] * len(hits)
+    return list(zip(hits[material_col], hits[desc_col], [file_name] * len(hits), sheets))
+
+
+def search_file(path, value, sheet_pattern=None):
+    """Read one BOM workbook and return its rows matching ``value`` (see search_frame)."""
+    file_name = os.path.basename(path)
+    df = read_bom(path, sheet_pattern)
+    with span("filter", file=file_name, rows=len(df)):
+        return search_frame(df, value, file_name)
+
+
+def detect_schema(path, scan_rows=HEADER_SCAN_ROWS):
+    """Find the header row and column names of every sheet of a BOM workbook.
+
+    Only the first ``scan_rows`` rows of each sheet are read (openpyxl
+    read-only). Returns a list of {"sheet", "header_row" (0-based),
+    "columns": {canonical name: name as written}} covering the material,
+    description and quantity columns; sheets where no row names a
+    material column are left out.
+    """
+    from openpyxl import load_workbook
+
+    wanted = MATERIAL_COLUMNS + DESCRIPTION_COLUMNS + QUANTITY_COLUMNS
+    sheets = []
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            for row_number, row in enumerate(sheet.iter_rows(max_row=scan_rows, values_only=True)):
+                names = {str(cell).strip(): cell for cell in row if isinstance(cell, str)}
+                if any(name in names for name in MATERIAL_COLUMNS):
+                    sheets.append({"sheet": sheet.title, "header_row": row_number,
+                                   "columns": {name: names[name] for name in wanted if name in names}})
+                    break
+    finally:
+        workbook.close()
+    return sheets
+
+
+_schemas = None  # path -> {"version": [size, mtime_ns], "schema": detect_schema() result}
+_schemas_dirty = False  # schemas detected since SCHEMA_CACHE was last written
+_schemas_lock = threading.Lock()
+
+
+def bom_schema(path):
+    """detect_schema() of the current version of a workbook, cached in memory and in SCHEMA_CACHE.
+
+    New schemas are written to SCHEMA_CACHE by save_schemas(), once per pass
+    over a folder.
+    """
+    global _schemas_dirty
+    global _schemas
+    stat = os.stat(path)
+    version = [stat.st_size, stat.st_mtime_ns]
+    key = os.path.abspath(path)
+    with _schemas_lock:
+        if _schemas is None:
+            try:
+                with open(SCHEMA_CACHE, encoding="utf-8") as cache:
+                    _schemas = json.load(cache)
+            except (OSError, ValueError):
+                _schemas = {}
+        cached = _schemas.get(key)
+    if cached is not None and cached["version"] == version:
+        return cached["schema"]
+
+    with span("header probe", file=os.path.basename(path)):
+        schema = detect_schema(path)
+    with _schemas_lock:
+        _schemas[key] = {"version": version, "schema": schema}
+        _schemas_dirty = True
+    return schema
+
+
+def save_schemas():
+    """Write the schemas detected since the last save to SCHEMA_CACHE."""
+    global _schemas_dirty
+    with _schemas_lock:
+        if not _schemas_dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(SCHEMA_CACHE), exist_ok=True)
+            with open(SCHEMA_CACHE + ".tmp", "w", encoding="utf-8") as cache:
+                json.dump(_schemas, cache)
+            os.replace(SCHEMA_CACHE + ".tmp", SCHEMA_CACHE)
+            _schemas_dirty = False
+        except OSError:
+            pass  # detected again next session
+
+
+def _material_cells(values):
+    """Material cells as an object Series; whole numbers as int, so 123456 never shows as "123456.0"."""
+    import pandas as pd
+
+    return pd.Series([int(value) if isinstance(value, float) and value.is_integer() else value for value in values],
+                     dtype=object)
+
+
+def _read_sheet(path, sheet):
+    """Parse the mapped columns of one sheet described by detect_schema().
+
+    Columns are renamed to the first name of their group ("Material",
+    "Long. Description", "Quantity") so sheets of either layout line up.
+    The material column is read as objects: a blank cell would otherwise
+    turn numeric part numbers into floats.
+    """
+    import pandas as pd
+
+    renames = {}
+    for group in (MATERIAL_COLUMNS, DESCRIPTION_COLUMNS, QUANTITY_COLUMNS):
+        found = next((name for name in group if name in sheet["columns"]), None)
+        if found is not None:
+            renames[sheet["columns"][found]] = group[0]
+    materials = {name: object for name, canonical in renames.items() if canonical == MATERIAL_COLUMNS[0]}
+    df = pd.read_excel(path, sheet_name=sheet["sheet"], header=sheet["header_row"], usecols=list(renames),
+                       dtype=materials)
+    df = df.rename(columns=renames)
+    if MATERIAL_COLUMNS[0] in df.columns:
+        df[MATERIAL_COLUMNS[0]] = _material_cells(df[MATERIAL_COLUMNS[0]]).to_numpy()
+    df["Sheet"] = sheet["sheet"]
+    return df
+
+
+_pool = None
+
+
+def _sheet_pool():
+    """Process pool shared by all workbooks, started on first use."""
+    global _pool
+    if _pool is None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        _pool = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+    return _pool
+
+
+def read_bom(path, sheet_pattern=None):
+    """Parse the material, description and quantity columns of every BOM sheet of a workbook.
+
+    Header rows and columns come from bom_schema(); sheets whose name does
+    not match ``sheet_pattern`` (default BOM_SHEET_PATTERN) or that have
+    no material column are not parsed. Columns get their canonical names
+    (see _read_sheet) and the frame a "Sheet" column.
+    Sheets of large workbooks are parsed in parallel processes.
+    """
+    import pandas as pd
+
+    pattern = (sheet_pattern or BOM_SHEET_PATTERN).lower()
+    sheets = [sheet for sheet in bom_schema(path) if fnmatch.fnmatchcase(sheet["sheet"].lower(), pattern)]
+    if not sheets:
+        return pd.DataFrame()
+    with span("parse", file=os.path.basename(path), sheets=len(sheets)):
+        if len(sheets) > 1 and os.path.getsize(path) >= PARALLEL_MIN_BYTES:
+            frames = list(_sheet_pool().map(_read_sheet, [path] * len(sheets), sheets))
+        else:
+            frames = [_read_sheet(path, sheet) for sheet in sheets]
+    return pd.concat(frames, ignore_index=True)
+
+
+def iter_bom_chunks(path, sheet_pattern=None, chunk_rows=STREAM_CHUNK_ROWS):
+    """Yield the BOM sheets of a workbook as frames of at most ``chunk_rows`` rows.
+
+    Rows are streamed with openpyxl in read-only mode, so only the current
+    chunk (and the workbook's shared strings) is in memory. Frames have the
+    same canonical columns and "Sheet" column as read_bom().
+    """
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    pattern = (sheet_pattern or BOM_SHEET_PATTERN).lower()
+    sheets = [sheet for sheet in bom_schema(path) if fnmatch.fnmatchcase(sheet["sheet"].lower(), pattern)]
+    if not sheets:
+        return
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in sheets:
+            rows = workbook[sheet["sheet"]].iter_rows(min_row=sheet["header_row"] + 1, values_only=True)
+            header = list(next(rows, ()))
+            positions, names = [], []
+            for group in (MATERIAL_COLUMNS, DESCRIPTION_COLUMNS, QUANTITY_COLUMNS):
+                found = next((name for name in group if name in sheet["columns"]), None)
+                if found is not None and sheet["columns"][found] in header:
+                    positions.append(header.index(sheet["columns"][found]))
+                    names.append(group[0])
+            def frame(chunk):
+                # Built column by column so the material column stays objects, as in read_bom()
+                columns = zip(*chunk)
+                return pd.DataFrame({name: _material_cells(values) if name == MATERIAL_COLUMNS[0]
+                                     else pd.Series(values) for name, values in zip(names, columns)}
+                                    ).assign(Sheet=sheet["sheet"])
+
+            chunk = []
+            for row in rows:
+                chunk.append([row[position] if position < len(row) else None for position in positions])
+                if len(chunk) >= chunk_rows:
+                    yield frame(chunk)
+                    chunk = []
+            if chunk:
+                yield frame(chunk)
+    finally:
+        workbook.close()
+
+
+class MemoryCapExceeded(MemoryError):
+    """A streaming search needed more memory than its cap."""
+
+
+def _other_threads():
+    """True while threads other than the main and the calling thread run."""
+    current, main = threading.current_thread(), threading.main_thread()
+    return any(thread not in (current, main) for thread in threading.enumerate())
+
+
+class PeakMemory:
+    """Track the Python heap (tracemalloc) inside a with block.
+
+    ``peak`` is the most memory allocated since entering, in bytes; check()
+    raises MemoryCapExceeded once it passes ``cap_bytes``. tracemalloc
+    counts the whole process, so while other threads besides the main
+    thread run (e.g. LCRlog following a meter log) the peak includes
+    their allocations and the cap is not enforced.
+    """
+
+    def __init__(self, cap_bytes=None):
+        self.cap_bytes = cap_bytes
+        self.peak = 0
+        self._base = 0
+        self._started = False
+
+    def __enter__(self):
+        import tracemalloc
+
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+        else:
+            tracemalloc.reset_peak()
+        self._base = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def check(self):
+        import tracemalloc
+
+        self.peak = max(self.peak, tracemalloc.get_traced_memory()[1] - self._base)
+        if self.cap_bytes and self.peak > self.cap_bytes and not _other_threads():
+            raise MemoryCapExceeded(f"search needed {self.peak / 2**20:.0f} MB, over the "
+                                    f"{self.cap_bytes / 2**20:.0f} MB cap")
+
+    def __exit__(self, *exc_info):
+        import tracemalloc
+
+        self.peak = max(self.peak, tracemalloc.get_traced_memory()[1] - self._base)
+        if self._started:
+            tracemalloc.stop()
+
+
+def stream_search_file(path, value, sheet_pattern=None, chunk_rows=STREAM_CHUNK_ROWS, memory=None):
+    """search_file() reading one chunk at a time; ``memory`` (a PeakMemory) is checked after every chunk."""
+    file_name = os.path.basename(path)
+    key = normalize_material(value)
+    rows = []
+    with span("stream filter", file=file_name):
+        for chunk in iter_bom_chunks(path, sheet_pattern, chunk_rows):
+            if "Material" in chunk.columns:
+                rows.extend(search_frame(chunk[normalize_materials(chunk["Material"]) == key], value, file_name))
+            del chunk
+            if memory is not None:
+                memory.check()
+    return rows
+
+
+def stream_lookup(folder, value, files=None, sheet_pattern=None, memory_cap_mb=STREAM_MEMORY_CAP_MB,
+                  chunk_rows=STREAM_CHUNK_ROWS, measure=True):
+    """Memory-bounded lookup(): workbooks are read one chunk at a time and released before the next.
+
+    Returns (rows, errors, peak bytes). Once the search passes
+    ``memory_cap_mb`` it stops, and the file being read reports the error.
+    Tracing the heap makes reading about 4x slower; with no cap and
+    ``measure=False`` it is skipped and the peak is None.
+    """
+    from contextlib import nullcontext
+
+    if files is None:
+        files = list_bom_files(folder)
+    rows, errors = [], {}
+    traced = bool(memory_cap_mb) or measure
+    with PeakMemory(memory_cap_mb * 2**20 if memory_cap_mb else None) if traced else nullcontext() as memory:
+        for name in files:
+            try:
+                rows.extend(stream_search_file(os.path.join(folder, name), value, sheet_pattern, chunk_rows, memory))
+            except MemoryCapExceeded as e:
+                errors[name] = str(e)
+                break
+            except Exception as e:
+                errors[name] = str(e)
+    save_schemas()
+    return rows, errors, memory.peak if traced else None
+
+
+class BomIndex:
+    """Parsed BOM workbooks of one folder, re-read only when a file changes.
+
+    Frames are compacted (categorical text columns) and their material keys
+    hashed (MaterialKeys) when parsed, then swapped in under a lock, so
+    lookups from other threads never see a half-parsed folder.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self._frames = {}  # file name -> ((size, mtime_ns), frame, MaterialKeys)
+        self.errors = {}  # file name -> parse error of its current version
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Parse new and changed files and forget removed ones; returns the names re-read."""
+        from LCRcompact import compact_frame
+
+        names = list_bom_files(self.folder)
+        changed = []
+        for name in names:
+            try:
+                stat = os.stat(os.path.join(self.folder, name))
+            except OSError:
+                continue  # removed while listing
+            signature = (stat.st_size, stat.st_mtime_ns)
+            with self._lock:
+                current = self._frames.get(name)
+            if current is not None and current[0] == signature:
+                continue
+            try:
+                # Integers stay as read so lookups match direct reads exactly
+                frame = compact_frame(read_bom(os.path.join(self.folder, name)), int_columns=False)
+                keys = MaterialKeys(frame)
+            except Exception as e:
+                with self._lock:
+                    self._frames.pop(name, None)
+                    self.errors[name] = str(e)
+                continue
+            with self._lock:
+                self._frames[name] = (signature, frame, keys)
+                self.errors.pop(name, None)
+            changed.append(name)
+
+        with self._lock:
+            for name in set(self._frames) - set(names):
+                del self._frames[name]
+            for name in set(self.errors) - set(names):
+                del self.errors[name]
+        save_schemas()
+        return changed
+
+    def version(self, name):
+        """(size, mtime_ns) of the parsed version of a workbook, or None."""
+        with self._lock:
+            current = self._frames.get(name)
+        return None if current is None else current[0]
+
+    def files(self):
+        """Names of the parsed workbooks."""
+        with self._lock:
+            return sorted(self._frames)
+
+    def read_errors(self):
+        """Return {file name: parse error}, copied under the lock."""
+        with self._lock:
+            return dict(self.errors)
+
+    def frames(self):
+        """Return {file name: frame} of the parsed workbooks."""
+        with self._lock:
+            return {name: frame for name, (_, frame, _) in self._frames.items()}
+
+    def lookup(self, value, files=None):
+        """Return (material, description, file, sheet) rows matching ``value`` in ``files`` (default all)."""
+        with self._lock:
+            entries = dict(self._frames)
+        rows = []
+        for name in (sorted(entries) if files is None else files):
+            if name in entries:
+                _, frame, keys = entries[name]
+                with span("filter", file=name, rows=len(frame)):
+                    rows.extend(search_frame(frame, value, name, keys))
+        return rows
+
+
+def append_record(path, record):
+    """Append one correction record to the record workbook, creating it if needed."""
+    import pandas as pd
+
+    if not os.path.exists(path):
+        pd.DataFrame(columns=RECORD_COLUMNS).to_excel(path, index=False)
+    with span("record read"):
+        df = pd.read_excel(path)
+
+    # Columns of the workbook that the record does not fill are left empty
+    for column in df.columns:
+        record.setdefault(column, None)
+    df = pd.concat([df, pd.DataFrame([record])], ignore_index=True)
+    with span("record write", rows=len(df)):
+        df.to_excel(path, index=False)
+
+
+def append_records(path, records):
+    """Append a frame of correction records in one read and one write; returns the rows written."""
+    import pandas as pd
+
+    if not os.path.exists(path):
+        pd.DataFrame(columns=RECORD_COLUMNS).to_excel(path, index=False)
+    with span("record read"):
+        df = pd.read_excel(path)
+    df = pd.concat([df, records.reindex(columns=list(df.columns) + [column for column in records.columns
+                                                                    if column not in df.columns])],
+                   ignore_index=True)
+    with span("record write", rows=len(df)):
+        df.to_excel(path, index=False)
+    return len(records)
+
+
+def timestamp(seconds=False):
+    """Record timestamp: "2024-05-01 02:30 PM" when saved, with seconds (24 h) when mailed."""
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S" if seconds else "%Y-%m-%d %I:%M %p")
+
+
+def render_mail(data):
+    """Return (subject, body) of the correction mail for a saved record."""
+    body = f"""
+                    Dear Concerned,
+
+                    Please find the following LCR correction details:
+
+                    Material: {data['Material']}
+                    Description: {data['Description']}
+                    File: {data['File']}
+                    Line: {data['Line']}
+                    Machine & Side: {data['Machine & Side']}
+                    Standard Value: {data['Standard Value']}
+                    Measured Value: {data['Measured Value']}
+                    AVL: {data['AVL']}
+                    Error: {data['Error']}
+                    Remarks: {data['Remarks']}
+                    Standard Tol%: {data['Standard Tol%']}
+                    Correction Tol%: {data['Correction Tol%']}
+
+                    Best regards,
+                    Your Team
+                    """
+    return MAIL_SUBJECT, body
+
+
+def lookup(folder, value, files=None, use_daemon=True, sheet_pattern=None):
+    """Search BOM files for a material: through the lookup daemon when it serves ``folder``, else directly.
+
+    Returns (rows, errors) where errors maps file names to read errors.
+    """
+    if use_daemon:
+        from LCRdaemon import query_daemon
+
+        answer = query_daemon(folder, value, files)  # None asks for the whole folder
+        if answer is not None:
+            return answer
+
+    if files is None:
+        files = list_bom_files(folder)
+    rows, errors = [], {}
+    for name in files:
+        try:
+            rows.extend(search_file(os.path.join(folder, name), value, sheet_pattern))
+        except Exception as e:
+            errors[name] = str(e)
+    save_schemas()
+    return rows, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find a material in the SMT_BOM workbooks.")
+    parser.add_argument("material", help="Material / Internal P/N to look for")
+    parser.add_argument("--folder", default=BOM_FOLDER, help="BOM folder (default the SMT_BOM share)")
+    parser.add_argument("--file", action="append", dest="files", help="Only search this workbook (repeatable)")
+    parser.add_argument("--sheets", help="Only search sheets matching this pattern, e.g. TOP* (default all)")
+    parser.add_argument("--no-daemon", action="store_true", help="Read the workbooks even if a lookup daemon runs")
+    parser.add_argument("--stream", action="store_true", help="Read the workbooks chunk by chunk and report peak memory")
+    parser.add_argument("--memory-cap", type=float, default=STREAM_MEMORY_CAP_MB,
+                        help=f"Stop a --stream search above this many MB (default {STREAM_MEMORY_CAP_MB:g})")
+    args = parser.parse_args()
+
+    if args.stream:
+        rows, errors, peak = stream_lookup(args.folder, args.material, args.files, args.sheets, args.memory_cap)
+        print(f"Peak memory {peak / 2**20:.1f} MB", file=sys.stderr)
+    else:
+        # The daemon indexes BOM_SHEET_PATTERN; another pattern is read directly
+        rows, errors = lookup(args.folder, args.material, args.files, use_daemon=not (args.no_daemon or args.sheets),
+                              sheet_pattern=args.sheets)
+    for material, description, file_name, sheet in rows:
+        print(f"{material}\t{description}\t{file_name}\t{sheet}")
+    for file_name, error in errors.items():
+        print(f"Error reading file {file_name}: {error}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import math
+from bisect import bisect_left
+
+import numpy as np
+
+# IEC 60063 preferred numbers as integer significant digits. E6-E24 are
+# historical two-digit values and must be listed; E48-E192 follow
+# round(10 ** (i / n), 2) except for the single E192 exception 9.20.
+_E24 = [10, 11, 12, 13, 15, 16, 18, 20, 22, 24, 27, 30, 33, 36, 39, 43, 47, 51, 56, 62, 68, 75, 82, 91]
+
+
+def _three_digit_series(count):
+    digits = [round(100 * 10 ** (i / count)) for i in range(count)]
+    return [920 if value == 919 else value for value in digits]
+
+
+E_SERIES_DIGITS = {
+    "E6": _E24[::4],
+    "E12": _E24[::2],
+    "E24": _E24,
+    "E48": _three_digit_series(48),
+    "E96": _three_digit_series(96),
+    "E192": _three_digit_series(192),
+}
+
+E_SERIES_NAMES = list(E_SERIES_DIGITS)
+
+
+class _SeriesTable:
+    """Precomputed lookup table for one E-series."""
+
+    def __init__(self, digits):
+        self.digits = np.array(digits + [digits[0] * 10], dtype=float)  # next decade closes the range
+        self.scale_exponent = len(str(digits[0])) - 1  # 1 for two-digit, 2 for three-digit series
+        log_mantissas = np.log10(self.digits / 10 ** self.scale_exponent)
+        # Geometric midpoints between neighbours: a value snaps down below its midpoint
+        self.log_midpoints = (log_mantissas[:-1] + log_mantissas[1:]) / 2
+        self.log_midpoint_list = self.log_midpoints.tolist()
+
+
+_TABLES = {name: _SeriesTable(digits) for name, digits in E_SERIES_DIGITS.items()}
+
+
+def _from_digits(digits, decade, scale_exponent):
+    """Build digits * 10**(decade - scale_exponent) without float noise for small decades."""
+    power = decade - scale_exponent
+    return np.where(power >= 0, digits * 10.0 ** np.maximum(power, 0), digits / 10.0 ** np.maximum(-power, 0))
+
+
+def nearest_standard_value(value, series="E24"):
+    """Return the E-series value nearest to ``value`` (same sign), or nan for zero/invalid input."""
+    if not value or not math.isfinite(value):
+        return float("nan")
+    table = _TABLES[series]
+    log_value = math.log10(abs(value))
+    decade = math.floor(log_value)
+    index = bisect_left(table.log_midpoint_list, log_value - decade)
+    result = float(_from_digits(table.digits[index], decade, table.scale_exponent))
+    return math.copysign(result, value)
+
+
+def snap_to_series(values, series="E24"):
+    """Snap an array of SI values to their nearest E-series values.
+
+    Returns (snapped, deviation%) arrays where deviation is how far each
+    input lies from its standard value. Zero and non-finite inputs give
+    nan.
+    """
+    table = _TABLES[series]
+    values = np.asarray(values, dtype=float)
+    magnitude = np.abs(values)
+    valid = np.isfinite(values) & (magnitude > 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_value = np.log10(np.where(valid, magnitude, 1.0))
+    decade = np.floor(log_value)
+    index = np.searchsorted(table.log_midpoints, log_value - decade)
+
+    snapped = np.sign(values) * _from_digits(table.digits[index], decade, table.scale_exponent)
+    snapped[~valid] = np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deviation = (values - snapped) / snapped * 100
+    return snapped, deviation
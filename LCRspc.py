@@ -0,0 +1,329 @@
+import argparse
+import json
+import math
+import os
+from collections import deque
+
+from LCRlibrary import SNAPSHOT_DIR
+
+# Running SPC statistics per material and per material / line / machine.
+# Every measurement updates the statistics in O(1): Welford mean and
+# variance, the current X-bar/R subgroup and the out-of-control run
+# counters. Control limits are set from the first BASELINE_SUBGROUPS
+# subgroups and then held, so drift shows up against them. The state is
+# kept as JSON so it survives restarts without replaying the history.
+#
+# Correction records are charted as Deviation% from their standard value,
+# with the standard tolerance as the specification limits; meter log
+# readings (no standard) are charted in SI units.
+SPC_STATE = os.path.join(SNAPSHOT_DIR, "spc-state.json")
+SUBGROUP_SIZE = 5
+BASELINE_SUBGROUPS = 20
+
+# Shewhart constants by subgroup size: (A2, D3, D4, d2)
+CONTROL_CONSTANTS = {
+    2: (1.880, 0.0, 3.267, 1.128), 3: (1.023, 0.0, 2.574, 1.693), 4: (0.729, 0.0, 2.282, 2.059),
+    5: (0.577, 0.0, 2.114, 2.326), 6: (0.483, 0.0, 2.004, 2.534), 7: (0.419, 0.076, 1.924, 2.704),
+    8: (0.373, 0.136, 1.864, 2.847), 9: (0.337, 0.184, 1.816, 2.970), 10: (0.308, 0.223, 1.777, 3.078),
+}
+
+SUMMARY_COLUMNS = ["Material", "Line", "Machine & Side", "Measure", "N", "Mean", "Std Dev", "Min", "Max",
+                   "Cp", "Cpk", "X-bar LCL", "X-bar CL", "X-bar UCL", "R CL", "R UCL", "Alarms", "Last Alarm"]
+
+_STATE_FIELDS = ("subgroup_size", "baseline", "lower", "upper", "count", "mean", "m2", "minimum", "maximum",
+                 "subgroup", "subgroups", "xbar_sum", "range_sum", "limits", "side_run", "trend_run",
+                 "last_xbar", "beyond_two_sigma", "alarms", "last_alarm")
+
+
+class RunningStats:
+    """SPC statistics of one measurement stream, updated one value at a time.
+
+    ``lower`` / ``upper`` are the specification limits (None when unknown).
+    add() returns the out-of-control rules the value or the subgroup it
+    completes breaks.
+    """
+
+    def __init__(self, lower=None, upper=None, subgroup_size=SUBGROUP_SIZE, baseline=BASELINE_SUBGROUPS):
+        self.subgroup_size = subgroup_size
+        self.baseline = baseline
+        self.lower = lower
+        self.upper = upper
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.subgroup = []
+        self.subgroups = 0  # baseline subgroups summed so far
+        self.xbar_sum = 0.0
+        self.range_sum = 0.0
+        self.limits = None  # set once the baseline is complete
+        self.side_run = 0  # consecutive subgroup means above (+) / below (-) the center line
+        self.trend_run = 0  # consecutive rising (+) / falling (-) subgroup means
+        self.last_xbar = None
+        self.beyond_two_sigma = deque(maxlen=3)  # +1 / -1 / 0 for the last three subgroup means
+        self.alarms = 0
+        self.last_alarm = ""
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else float("nan")
+
+    @property
+    def sigma(self):
+        """Within-subgroup sigma (R-bar / d2) once the limits are set, the overall std before."""
+        if self.limits:
+            return self.limits["r_cl"] / CONTROL_CONSTANTS[self.subgroup_size][3]
+        return self.std
+
+    @property
+    def cp(self):
+        if self.lower is None or self.upper is None or not self.sigma > 0:
+            return float("nan")
+        return (self.upper - self.lower) / (6 * self.sigma)
+
+    @property
+    def cpk(self):
+        if self.lower is None or self.upper is None or not self.sigma > 0:
+            return float("nan")
+        return min(self.upper - self.mean, self.mean - self.lower) / (3 * self.sigma)
+
+    def add(self, value):
+        """Add one measurement; returns the list of rules broken (empty when in control)."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+        broken = []
+        if (self.lower is not None and value < self.lower) or (self.upper is not None and value > self.upper):
+            broken.append("Outside tolerance")
+        self.subgroup.append(value)
+        if len(self.subgroup) == self.subgroup_size:
+            broken += self._close_subgroup(sum(self.subgroup) / self.subgroup_size, max(self.subgroup) - min(self.subgroup))
+            self.subgroup = []
+        if broken:
+            self.alarms += 1
+            self.last_alarm = "; ".join(broken)
+        return broken
+
+    def _close_subgroup(self, xbar, spread):
+        if self.limits is None:
+            self.subgroups += 1
+            self.xbar_sum += xbar
+            self.range_sum += spread
+            if self.subgroups >= self.baseline:
+                self._set_limits()
+            return []
+
+        limits = self.limits
+        broken = []
+        if not limits["xbar_lcl"] <= xbar <= limits["xbar_ucl"]:
+            broken.append("X-bar beyond control limits")
+        if spread > limits["r_ucl"] or spread < limits["r_lcl"]:
+            broken.append("R beyond control limits")
+
+        side = (xbar > limits["xbar_cl"]) - (xbar < limits["xbar_cl"])
+        self.side_run = self.side_run + side if side and self.side_run * side > 0 else side
+        if abs(self.side_run) >= 8:
+            broken.append("8 subgroups on one side of the center line")
+
+        if self.last_xbar is not None and xbar != self.last_xbar:
+            step = 1 if xbar > self.last_xbar else -1
+            self.trend_run = self.trend_run + step if self.trend_run * step > 0 else step
+            if abs(self.trend_run) >= 6:
+                broken.append("6 subgroups steadily " + ("rising" if step > 0 else "falling"))
+        self.last_xbar = xbar
+
+        two_sigma = 2 * (limits["xbar_ucl"] - limits["xbar_cl"]) / 3
+        self.beyond_two_sigma.append(side if abs(xbar - limits["xbar_cl"]) > two_sigma else 0)
+        if side and list(self.beyond_two_sigma).count(side) >= 2:
+            broken.append("2 of 3 subgroups beyond 2 sigma")
+        return broken
+
+    def _set_limits(self):
+        a2, d3, d4, _ = CONTROL_CONSTANTS[self.subgroup_size]
+        center = self.xbar_sum / self.subgroups
+        r_bar = self.range_sum / self.subgroups
+        self.limits = {"xbar_lcl": center - a2 * r_bar, "xbar_cl": center, "xbar_ucl": center + a2 * r_bar,
+                       "r_lcl": d3 * r_bar, "r_cl": r_bar, "r_ucl": d4 * r_bar}
+
+    def reset_limits(self):
+        """Collect a new baseline, e.g. after a process change."""
+        self.limits = self.last_xbar = None
+        self.subgroups, self.xbar_sum, self.range_sum = 0, 0.0, 0.0
+        self.side_run = self.trend_run = 0
+        self.beyond_two_sigma.clear()
+
+    def to_dict(self):
+        state = {field: getattr(self, field) for field in _STATE_FIELDS}
+        state["beyond_two_sigma"] = list(self.beyond_two_sigma)
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        stats = cls()
+        for field in _STATE_FIELDS:
+            if field in state:
+                setattr(stats, field, state[field])
+        stats.beyond_two_sigma = deque(stats.beyond_two_sigma, maxlen=3)
+        return stats
+
+
+class SPCStore:
+    """RunningStats per (material, line, machine & side, measure), persisted as JSON.
+
+    Each measurement updates the material-wide stream (line and machine
+    blank) and its line / machine stream. For meter logs the store keeps
+    how many bytes of each log were added, so a log loaded again is not
+    counted twice.
+    """
+
+    def __init__(self, path=SPC_STATE, subgroup_size=SUBGROUP_SIZE, baseline=BASELINE_SUBGROUPS):
+        self.path = path
+        self.subgroup_size = subgroup_size
+        self.baseline = baseline
+        self.streams = {}
+        self.logs = {}  # meter log path -> bytes of the log already added
+        self.changed = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as state:
+                entries = json.load(state)
+        except (TypeError, OSError, ValueError):
+            return
+        if isinstance(entries, dict):
+            self.logs = entries.get("logs", {})
+            entries = entries.get("streams", [])
+        for entry in entries:
+            self.streams[tuple(entry["key"])] = RunningStats.from_dict(entry["stats"])
+
+    def save(self):
+        """Write the state if anything changed since the last save."""
+        if not self.path or not self.changed:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".tmp", "w", encoding="utf-8") as state:
+            json.dump({"streams": [{"key": list(key), "stats": stats.to_dict()} for key, stats in self.streams.items()],
+                       "logs": self.logs}, state)
+        os.replace(self.path + ".tmp", self.path)
+        self.changed = False
+
+    def stream(self, key, lower=None, upper=None):
+        stats = self.streams.get(key)
+        if stats is None:
+            stats = self.streams[key] = RunningStats(lower, upper, self.subgroup_size, self.baseline)
+        elif lower is not None and upper is not None:
+            stats.lower, stats.upper = lower, upper  # follow a changed standard tolerance
+        return stats
+
+    def add(self, material, line, machine, value, lower=None, upper=None, measure="Deviation%"):
+        """Add one measurement; returns [(stream key, rule)] for every rule broken."""
+        if value is None or value != value:
+            return []
+        self.changed = True
+        alarms = []
+        keys = [(material, "", "", measure)]
+        if line or machine:
+            keys.append((material, line, machine, measure))
+        for key in keys:
+            alarms += [(key, rule) for rule in self.stream(key, lower, upper).add(value)]
+        return alarms
+
+    def add_records(self, records):
+        """Add correction records (a frame of RECORD_COLUMNS); returns the alarms."""
+        from LCRcheck import evaluate_measurements, parse_tolerance_limits
+        from LCRsearch import normalize_materials
+
+        deviation = evaluate_measurements(records)["Deviation%"].to_numpy()
+        tolerance = (parse_tolerance_limits(records["Standard Tol%"]).to_numpy() if "Standard Tol%" in records.columns
+                     else [(float("nan"), float("nan"))] * len(records))
+        text = {column: records[column].fillna("").astype(str).str.strip().to_numpy() if column in records.columns
+                else [""] * len(records) for column in ("Line", "Machine & Side")}
+        alarms = []
+        for material, line, machine, value, tol in zip(normalize_materials(records["Material"]), text["Line"],
+                                                       text["Machine & Side"], deviation, tolerance):
+            lower, upper = tol
+            limits = (-lower, upper) if lower == lower else (None, None)
+            alarms += self.add(material, line, machine, float(value), *limits)
+        return alarms
+
+    def add_record(self, record):
+        """Add one correction record (a dict of field -> text); returns the alarms."""
+        import pandas as pd
+
+        return self.add_records(pd.DataFrame([record]))
+
+    def log_position(self, log_path):
+        """Bytes of a meter log already added with add_readings(), 0 for a new log."""
+        return self.logs.get(os.path.abspath(log_path), 0)
+
+    def add_readings(self, readings, log_path=None, position=None):
+        """Add meter log readings (LCRingest.READING_COLUMNS), charted in SI units; returns the alarms.
+
+        ``position`` is where the readings end in ``log_path``, kept for
+        log_position().
+        """
+        if log_path is not None:
+            self.logs[os.path.abspath(log_path)] = position
+            self.changed = True
+        alarms = []
+        for key, line, machine, value, unit in zip(readings["Key"], readings["Line"], readings["Machine & Side"],
+                                                   readings["Value (SI)"], readings["Unit"]):
+            if key:
+                alarms += self.add(key, line, machine, float(value), measure=unit or "SI")
+        return alarms
+
+    def summary(self):
+        """One row per stream (see SUMMARY_COLUMNS)."""
+        import pandas as pd
+
+        rows = []
+        for (material, line, machine, measure), stats in self.streams.items():
+            limits = stats.limits or {}
+            rows.append([material, line, machine, measure, stats.count, stats.mean, stats.std, stats.minimum,
+                         stats.maximum, stats.cp, stats.cpk, limits.get("xbar_lcl"), limits.get("xbar_cl"),
+                         limits.get("xbar_ucl"), limits.get("r_cl"), limits.get("r_ucl"), stats.alarms,
+                         stats.last_alarm])
+        return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+
+
+def format_alarms(alarms):
+    """One line per alarm: "material line machine: rule"."""
+    return "\n".join(" ".join(part for part in key[:3] if part) + f": {rule}" for key, rule in alarms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Running SPC statistics (Cp/Cpk, X-bar/R) of correction records.")
+    parser.add_argument("record_files", nargs="*", help="Correction record workbooks to add")
+    parser.add_argument("--state", default=SPC_STATE, help="SPC state file (default in the LCRlog cache)")
+    parser.add_argument("--reset", action="store_true", help="Start from empty statistics")
+    parser.add_argument("--output", help="Write the per-stream summary to this .xlsx/.csv")
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    if args.reset and os.path.exists(args.state):
+        os.remove(args.state)
+    store = SPCStore(args.state)
+    for path in args.record_files:
+        alarms = store.add_records(pd.read_excel(path, dtype=str))
+        print(f"{path}: {len(alarms)} alarm(s)")
+        if alarms:
+            print(format_alarms(alarms))
+    store.save()
+    summary = store.summary()
+    if args.output:
+        if args.output.lower().endswith(".csv"):
+            summary.to_csv(args.output, index=False, encoding="utf-8-sig")
+        else:
+            summary.to_excel(args.output, index=False)
+    print(summary.to_string(index=False, max_rows=50))
+
+
+if __name__ == "__main__":
+    main()
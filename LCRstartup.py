@@ -0,0 +1,153 @@
+import argparse
+import importlib
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+# Startup timing shared by LCRlog and LCR-Measurement. Each launch appends
+# one JSON line (seconds to window built / first paint) to STARTUP_LOG,
+# which is rotated at 1 MB like LCRperf's log; `python LCRstartup.py`
+# benchmarks cold imports and launches in fresh interpreters so the
+# numbers can be compared across releases.
+STARTUP_LOG = os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "LCRlog", "startup.jsonl")
+
+# Set by the benchmark: the app records its startup and quits after first paint
+EXIT_AFTER_PAINT = "LCR_STARTUP_EXIT"
+
+# Modules whose cold import time the benchmark tracks
+BENCHMARK_MODULES = [
+    "numpy", "pandas", "openpyxl", "PyQt5.QtWidgets", "PySimpleGUI", "win32com.client",
+    "LCRunits", "LCRseries", "LCRcheck", "LCRlibrary", "LCRmodel", "LCRsearch", "LCRview",
+]
+
+# Apps launched by the benchmark to measure time to first paint
+BENCHMARK_APPS = ["LCRlog.py", "LCR-Measurement.py"]
+
+
+class StartupTimer:
+    """Records how long an app takes to import its modules and paint its window."""
+
+    def __init__(self, app_name):
+        self.app_name = app_name
+        self.start = time.perf_counter()
+        self.marks = {}
+        self.exiting = False  # set when the benchmark asked the app to quit after first paint
+
+    def mark(self, name):
+        """Record the seconds since the timer started under ``name``."""
+        self.marks[name] = round(time.perf_counter() - self.start, 4)
+
+    def report(self):
+        return {
+            "app": self.app_name,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "marks": self.marks,
+        }
+
+    def first_paint(self):
+        """Mark first paint and log the report; returns True when the benchmark asked the app to quit."""
+        self.mark("first paint")
+        try:
+            os.makedirs(os.path.dirname(STARTUP_LOG), exist_ok=True)
+            handler = RotatingFileHandler(STARTUP_LOG, maxBytes=1_000_000, backupCount=2, encoding="utf-8")
+            try:
+                handler.emit(logging.makeLogRecord({"msg": json.dumps(self.report())}))
+            finally:
+                handler.close()
+        except OSError:
+            pass  # timing is informative only
+        if os.environ.get(EXIT_AFTER_PAINT):
+            print(json.dumps(self.report()))
+            self.exiting = True
+        return self.exiting
+
+
+def warm_imports(names):
+    """Import modules in a background thread so the first action after startup does not wait for them."""
+    def run():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def _cold_import(module, runs):
+    """Median seconds to import ``module`` in a fresh interpreter, or None if it is not installed."""
+    code = ("import time; started = time.perf_counter(); import " + module +
+            "; print(time.perf_counter() - started)")
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        if result.returncode != 0:
+            return None
+        timings.append(float(result.stdout.split()[-1]))
+    return round(statistics.median(timings), 4)
+
+
+def _launch(app, runs, timeout):
+    """Median seconds to first paint of an app script, or None if it could not start."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    for _ in range(runs):
+        try:
+            result = subprocess.run([sys.executable, os.path.join(here, app)], capture_output=True, text=True,
+                                    cwd=here, timeout=timeout, env=dict(os.environ, **{EXIT_AFTER_PAINT: "1"}))
+        except subprocess.TimeoutExpired:
+            return None
+        reports = [line for line in result.stdout.splitlines() if line.startswith("{")]
+        if not reports:
+            return None
+        timings.append(json.loads(reports[-1])["marks"]["first paint"])
+    return round(statistics.median(timings), 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold imports and time to first paint.")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per measurement (default 3)")
+    parser.add_argument("--label", default="", help="Release or commit the numbers belong to")
+    parser.add_argument("--output", default="startup_benchmark.jsonl", help="JSON lines file results are appended to")
+    parser.add_argument("--no-apps", action="store_true", help="Only time imports; do not launch the windows")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds to wait for an app to paint")
+    args = parser.parse_args()
+
+    imports = {}
+    for module in BENCHMARK_MODULES:
+        imports[module] = _cold_import(module, args.runs)
+        shown = "not available" if imports[module] is None else f"{imports[module] * 1000:.0f} ms"
+        print(f"import {module}: {shown}")
+
+    first_paint = {}
+    if not args.no_apps:
+        for app in BENCHMARK_APPS:
+            first_paint[app] = _launch(app, args.runs, args.timeout)
+            shown = "could not start" if first_paint[app] is None else f"{first_paint[app] * 1000:.0f} ms"
+            print(f"{app} first paint: {shown}")
+
+    result = {
+        "label": args.label,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "imports": imports,
+        "first_paint": first_paint,
+    }
+    with open(args.output, "a", encoding="utf-8") as output:
+        output.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
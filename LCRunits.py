@@ -0,0 +1,147 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# Unit registry shared by the calculator, converter and parser.
+# Order matters: the calculator tabs fill their unit combos from these keys.
+COMPONENT_UNITS = {
+    "Capacitor": {"F": 1, "mF": 1e-3, "µF": 1e-6, "uF": 1e-6, "nF": 1e-9, "pF": 1e-12},
+    "Resistor": {"Ω": 1, "ohm": 1, "mΩ": 1e-3, "kΩ": 1e3, "MΩ": 1e6},
+    "Inductor": {"H": 1, "mH": 1e-3, "µH": 1e-6, "uH": 1e-6, "nH": 1e-9, "kH": 1e3},
+}
+
+# Converter tab names ("Capacitance", ...) for the same component types
+QUANTITY_TYPES = {"Capacitance": "Capacitor", "Resistance": "Resistor", "Inductance": "Inductor"}
+
+BASE_UNITS = {"Capacitor": "F", "Resistor": "Ω", "Inductor": "H"}
+
+ALL_UNITS = {unit: factor for units in COMPONENT_UNITS.values() for unit, factor in units.items()}
+
+# Unit -> base unit of its quantity, e.g. "nF" -> "F"
+UNIT_BASES = {unit: BASE_UNITS[kind] for kind, units in COMPONENT_UNITS.items() for unit in units}
+
+# Engineering prefixes accepted by the parser. Uppercase U/N/P show up in
+# SAP-style descriptions ("CAP 10UF"); M is always mega, m is always milli.
+PREFIXES = {
+    "": 1, "p": 1e-12, "P": 1e-12, "n": 1e-9, "N": 1e-9,
+    "u": 1e-6, "U": 1e-6, "µ": 1e-6, "μ": 1e-6,
+    "m": 1e-3, "k": 1e3, "K": 1e3, "M": 1e6, "G": 1e9,
+    "R": 1, "r": 1,
+}
+
+# Unit spellings (lowercased) mapped to the base unit symbol
+UNIT_SYMBOLS = {"f": "F", "h": "H", "ω": "Ω", "r": "Ω", "ohm": "Ω", "ohms": "Ω"}
+
+_NUMBER = r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+_PREFIX = r"[pPnNuUµμmkKMG]"
+_UNIT = r"(?i:ohms?|f|h)|[ΩΩ]|R"
+
+# RKM code ("4k7", "1R5", "R47", "4n7") or engineering notation ("2.2nH", "1 kΩ", "10R")
+_RKM = rf"(?P<rkm_int>\d*)(?P<rkm_mult>{_PREFIX}|[Rr])(?P<rkm_frac>\d{{1,3}})\s?(?P<rkm_unit>{_UNIT})?"
+_ENG = rf"(?P<num>{_NUMBER})\s?(?P<prefix>{_PREFIX})?\s?(?P<unit>{_UNIT})?"
+
+VALUE_PATTERN = re.compile(rf"^\s*(?:{_RKM}|{_ENG})\s*$")
+
+# Inside free text (BOM descriptions) a bare number is not a value: require a
+# unit symbol for engineering notation and word boundaries around the token.
+_ENG_IN_TEXT = rf"(?P<num>{_NUMBER})\s?(?P<prefix>{_PREFIX})?\s?(?P<unit>{_UNIT})"
+TEXT_PATTERN = re.compile(rf"(?<![\w.])(?:{_RKM}|{_ENG_IN_TEXT})(?![\w.])")
+
+
+def get_units(component_type):
+    """Return a list of units based on the component type."""
+    return list(COMPONENT_UNITS.get(component_type, {}))
+
+
+def unit_factor(unit, component_type=None):
+    """Return the SI scale factor of a unit, optionally restricted to one component type."""
+    table = COMPONENT_UNITS[component_type] if component_type else ALL_UNITS
+    return table[unit]
+
+
+def convert_units(value, from_unit, to_unit, component_type=None):
+    """Convert between different units."""
+    return value * unit_factor(from_unit, component_type) / unit_factor(to_unit, component_type)
+
+
+def _quantity(groups):
+    """Build (SI value, base unit) from the named groups of a parser match."""
+    if groups["rkm_mult"] is not None:
+        mantissa = float(f"{groups['rkm_int'] or '0'}.{groups['rkm_frac']}")
+        prefix, unit = groups["rkm_mult"], groups["rkm_unit"]
+        if unit is None and prefix in "Rr":
+            unit = "R"
+    else:
+        mantissa = float(groups["num"])
+        prefix, unit = groups["prefix"] or "", groups["unit"]
+    return mantissa * PREFIXES[prefix], UNIT_SYMBOLS.get(unit.lower(), "") if unit else ""
+
+
+@lru_cache(maxsize=65536)
+def parse_quantity(text):
+    """Parse a component value string into (SI value, base unit).
+
+    Accepts engineering notation ("10uF", "2.2 nH", "1kΩ"), RKM codes ("4k7",
+    "1R5", "R47") and the µ/μ/u and Ω/Ω/ohm/R spelling variants. The unit is
+    "" when the text carries none. Returns (nan, "") for unparseable text.
+    """
+    match = VALUE_PATTERN.match(str(text))
+    if match is None:
+        return float("nan"), ""
+    return _quantity(match.groupdict())
+
+
+def parse_value(text):
+    """Parse a component value string into its SI value (nan if unparseable)."""
+    return parse_quantity(text)[0]
+
+
+def find_quantity(text):
+    """Find the first component value inside free text such as a BOM description."""
+    match = TEXT_PATTERN.search(str(text))
+    if match is None:
+        return float("nan"), ""
+    return _quantity(match.groupdict())
+
+
+def parse_series(series, search=False):
+    """Parse a pandas Series of value strings into a DataFrame of SI values.
+
+    Returns a frame with "Value" (float, NaN when unparseable), "Unit" and
+    "Scale" (the prefix factor, 1 for a bare number) columns aligned with
+    ``series``. Each distinct string is parsed once; with
+    ``search=True`` values are looked for inside free text instead.
+    """
+    import pandas as pd
+
+    codes, uniques = pd.factorize(series)
+    if len(uniques) == 0:
+        return pd.DataFrame({"Value": np.full(len(series), np.nan), "Unit": "", "Scale": np.nan},
+                            index=series.index)
+
+    text = pd.Series(uniques).astype(str)
+    pattern = TEXT_PATTERN if search else VALUE_PATTERN
+    parts = text.str.extract(pattern)
+
+    # RKM and engineering matches fill different groups; merge them column-wise
+    is_rkm = parts["rkm_mult"].notna()
+    rkm_number = parts["rkm_int"].fillna("").replace("", "0") + "." + parts["rkm_frac"].fillna("0")
+    mantissa = pd.to_numeric(parts["num"].where(~is_rkm, rkm_number), errors="coerce")
+    prefix = parts["prefix"].where(~is_rkm, parts["rkm_mult"]).fillna("")
+    unit = parts["unit"].where(~is_rkm, parts["rkm_unit"])
+    unit = unit.where(~(is_rkm & unit.isna() & prefix.isin(["R", "r"])), "R")
+
+    scales = prefix.map(PREFIXES).to_numpy(dtype=float)
+    values = mantissa.to_numpy(dtype=float) * scales
+    units = unit.str.lower().map(UNIT_SYMBOLS).fillna("").to_numpy(dtype=object)
+
+    valid = codes >= 0
+    result_values = np.full(len(codes), np.nan)
+    result_values[valid] = values[codes[valid]]
+    result_units = np.full(len(codes), "", dtype=object)
+    result_units[valid] = units[codes[valid]]
+    result_scales = np.full(len(codes), np.nan)
+    result_scales[valid] = scales[codes[valid]]
+    return pd.DataFrame({"Value": result_values, "Unit": result_units, "Scale": result_scales},
+                        index=series.index)
@@ -0,0 +1,142 @@
+from tkinter import ttk
+
+
+class VirtualTreeview(ttk.Treeview):
+    """Treeview that only holds items for the rows currently on screen.
+
+    Results live in a plain list (``rows``); the widget keeps one item per
+    visible line and rewrites their values when scrolled. Filling 100k hits
+    is a list extend and clearing them is O(visible rows), however many
+    results there are. Use set_rows/append_rows/clear instead of insert and
+    delete, and row_values/selected_row for the data behind an item.
+    """
+
+    def __init__(self, master=None, **kw):
+        super().__init__(master, **kw)
+        self.rows = []
+        self._offset = 0
+        self._window = 0
+        self._selected = None
+        self._yscrollcommand = None
+
+        self.bind("<Configure>", self._on_configure, add="+")
+        self.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        self.bind("<MouseWheel>", self._on_mousewheel, add="+")
+        self.bind("<Button-4>", lambda event: self._scroll_to(self._offset - 3), add="+")
+        self.bind("<Button-5>", lambda event: self._scroll_to(self._offset + 3), add="+")
+        self.bind("<Up>", lambda event: self._move_selection(-1), add="+")
+        self.bind("<Down>", lambda event: self._move_selection(1), add="+")
+        self.bind("<Prior>", lambda event: self._scroll_to(self._offset - self._window), add="+")
+        self.bind("<Next>", lambda event: self._scroll_to(self._offset + self._window), add="+")
+
+    def configure(self, cnf=None, **kw):
+        # The scrollbar must track the virtual rows, not the handful of real items
+        if "yscrollcommand" in kw:
+            self._yscrollcommand = kw.pop("yscrollcommand")
+            self._update_scrollbar()
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    def set_rows(self, rows):
+        """Replace all results with ``rows`` (a list of value tuples)."""
+        self.rows = list(rows)
+        self._offset = 0
+        self._selected = None
+        self._refresh()
+
+    def append_rows(self, rows):
+        """Add a batch of results; only the visible window is redrawn."""
+        start = len(self.rows)
+        self.rows.extend(rows)
+        if start < self._offset + self._window:
+            self._refresh()
+        else:
+            self._update_scrollbar()
+
+    def clear(self):
+        """Drop all results."""
+        self.set_rows([])
+
+    def row_values(self, item):
+        """Return the result tuple shown by a visible item."""
+        return self.rows[self._offset + int(item)]
+
+    def selected_row(self):
+        """Return the selected result tuple, or None."""
+        selection = self.selection()
+        if selection:
+            return self.row_values(selection[0])
+        return None if self._selected is None else self.rows[self._selected]
+
+    def yview(self, *args):
+        if not args:
+            return self._fractions()
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * len(self.rows)))
+        elif args[0] == "scroll":
+            step = self._window if args[2] == "pages" else 1
+            self._scroll_to(self._offset + int(args[1]) * step)
+
+    def _fractions(self):
+        if not self.rows:
+            return 0.0, 1.0
+        return self._offset / len(self.rows), min(1.0, (self._offset + self._window) / len(self.rows))
+
+    def _update_scrollbar(self):
+        if self._yscrollcommand:
+            self._yscrollcommand(*self._fractions())
+
+    def _scroll_to(self, offset):
+        offset = max(0, min(offset, len(self.rows) - self._window))
+        if offset != self._offset:
+            self._offset = offset
+            self._refresh()
+        return "break"
+
+    def _on_mousewheel(self, event):
+        return self._scroll_to(self._offset - int(event.delta / 120) * 3)
+
+    def _on_configure(self, event):
+        style = ttk.Style(self)
+        row_height = int(style.lookup("Treeview", "rowheight") or 20)
+        window = max(1, event.height // row_height)
+        if window != self._window:
+            self._window = window
+            self._scroll_to(self._offset)
+            self._refresh()
+
+    def _on_select(self, event):
+        selection = self.selection()
+        if selection:
+            self._selected = self._offset + int(selection[0])
+
+    def _move_selection(self, step):
+        if not self.rows:
+            return "break"
+        current = self._offset - 1 if self._selected is None else self._selected
+        self._selected = max(0, min(len(self.rows) - 1, current + step))
+        if self._selected < self._offset:
+            self._scroll_to(self._selected)
+        elif self._selected >= self._offset + self._window:
+            self._scroll_to(self._selected - self._window + 1)
+        self._refresh()
+        return "break"
+
+    def _refresh(self):
+        """Rewrite the visible items from the backing rows."""
+        visible = self.rows[self._offset:self._offset + self._window]
+        items = super().get_children()
+        for slot, values in enumerate(visible):
+            if slot < len(items):
+                self.item(items[slot], values=values)
+            else:
+                self.insert("", "end", iid=str(slot), values=values)
+        if len(items) > len(visible):
+            self.delete(*items[len(visible):])
+
+        if self._selected is not None and self._offset <= self._selected < self._offset + len(visible):
+            self.selection_set(str(self._selected - self._offset))
+        elif self.selection():
+            self.selection_remove(*self.selection())
+        self._update_scrollbar()
@@ -0,0 +1,205 @@
+import argparse
+import hashlib
+import os
+import pickle
+import threading
+
+import pandas as pd
+
+from LCRlibrary import SNAPSHOT_DIR
+from LCRperf import span
+from LCRsearch import (BOM_FOLDER, QUANTITY_COLUMNS, find_columns, list_bom_files, normalize_material,
+                       normalize_materials, read_bom, save_schemas)
+
+# Where-used map of a BOM folder: material -> every workbook using it, with
+# the summed quantity and description. Each workbook is reduced to one row
+# per material when it is parsed; the per-file summaries are cached on
+# disk, so after the first build only new or changed workbooks are read.
+# Materials are keyed by LCRsearch.normalize_material().
+
+SUMMARY_COLUMNS = ["Material", "Description", "Quantity", "Rows"]
+
+
+def summarize_bom(df):
+    """Reduce one BOM frame to one row per material (see SUMMARY_COLUMNS)."""
+    found = find_columns(df.columns)
+    if found is None:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    material_col, desc_col = found
+    # Rows without a quantity (no QUANTITY_COLUMNS column, e.g. on one sheet) count as 1
+    quantity_col = next((column for column in QUANTITY_COLUMNS if column in df.columns), None)
+    quantity = pd.Series(1.0, index=df.index)
+    if quantity_col:
+        quantity = pd.to_numeric(df[quantity_col], errors="coerce").fillna(quantity)
+
+    keys = pd.Series(normalize_materials(df[material_col]), index=df.index)
+    usable = keys != ""
+    parts = pd.DataFrame({
+        "Material": keys[usable],
+        "Description": df.loc[usable, desc_col] if desc_col in df.columns else "",
+        "Quantity": quantity[usable],
+    })
+    grouped = parts.groupby("Material", sort=False)
+    return pd.DataFrame({
+        "Description": grouped["Description"].first(),
+        "Quantity": grouped["Quantity"].sum(),
+        "Rows": grouped.size(),
+    }).reset_index()[SUMMARY_COLUMNS]
+
+
+class WhereUsedMap:
+    """Material -> [(file, quantity, description, rows)] for every workbook of a BOM folder."""
+
+    def __init__(self, folder, cache_dir=SNAPSHOT_DIR):
+        self.folder = folder
+        self.cache_path = None
+        if cache_dir:
+            key = hashlib.sha1(os.path.abspath(folder).encode()).hexdigest()[:16]
+            self.cache_path = os.path.join(cache_dir, f"whereused-v2-{key}.pkl")  # v2: normalized keys
+        self._summaries = {}  # file name -> ((size, mtime_ns), summary frame)
+        self._materials = {}  # material -> {file name: (quantity, description, rows)}
+        self.errors = {}
+        self._lock = threading.Lock()  # sync() may run beside queries (LCRdaemon)
+        self._load_cache()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, "rb") as cache:
+                self._summaries = pickle.load(cache)
+        except (TypeError, OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return
+        for name, (_, summary) in self._summaries.items():
+            self._add(name, summary)
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path + ".tmp", "wb") as cache:
+                pickle.dump(self._summaries, cache, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(self.cache_path + ".tmp", self.cache_path)
+        except OSError:
+            pass  # rebuilt from the workbooks next time
+
+    def _add(self, name, summary):
+        for material, description, quantity, rows in zip(summary["Material"], summary["Description"],
+                                                         summary["Quantity"], summary["Rows"]):
+            self._materials.setdefault(material, {})[name] = (quantity, description, rows)
+
+    def _remove(self, name):
+        _, summary = self._summaries.pop(name)
+        for material in summary["Material"]:
+            uses = self._materials.get(material)
+            if uses is not None:
+                uses.pop(name, None)
+                if not uses:
+                    del self._materials[material]
+
+    def sync(self, index=None):
+        """Summarize new and changed workbooks and drop removed ones; returns the names re-read.
+
+        With a BomIndex of the same folder, its already parsed frames are
+        used instead of reading the workbooks again.
+        """
+        names = list_bom_files(self.folder)
+        frames = index.frames() if index is not None else {}
+        changed = []
+        for name in names:
+            path = os.path.join(self.folder, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            current = self._summaries.get(name)
+            if current is not None and current[0] == signature:
+                continue
+            try:
+                frame = frames[name] if index is not None and index.version(name) == signature else read_bom(path)
+                with span("where-used summary", file=name, rows=len(frame)):
+                    summary = summarize_bom(frame)
+            except Exception as e:
+                self.errors[name] = str(e)
+                continue
+            with self._lock:
+                if current is not None:
+                    self._remove(name)
+                self._summaries[name] = (signature, summary)
+                self._add(name, summary)
+            self.errors.pop(name, None)
+            changed.append(name)
+
+        removed = set(self._summaries) - set(names)
+        with self._lock:
+            for name in removed:
+                self._remove(name)
+        for name in set(self.errors) - set(names):
+            del self.errors[name]
+        if changed or removed:
+            self._save_cache()
+        save_schemas()
+        return changed
+
+    def files(self):
+        with self._lock:
+            return sorted(self._summaries)
+
+    def query(self, material):
+        """Return (file, quantity, description, rows) tuples of the workbooks using ``material``."""
+        with self._lock:
+            uses = dict(self._materials.get(normalize_material(material), {}))
+        return [(name,) + uses[name] for name in sorted(uses)]
+
+    def usage(self):
+        """One row per material: Material, Description, BOMs (workbooks using it) and total Quantity."""
+        with self._lock:
+            rows = [(material, next(iter(uses.values()))[1], len(uses), sum(use[0] for use in uses.values()))
+                    for material, uses in self._materials.items()]
+        return pd.DataFrame(rows, columns=["Material", "Description", "BOMs", "Quantity"])
+
+    def matrix(self):
+        """Cross-reference matrix: one row per material, one quantity column per workbook."""
+        with self._lock:
+            summaries = {name: summary for name, (_, summary) in self._summaries.items()}
+        if not summaries:
+            return pd.DataFrame(columns=["Material", "Description", "BOMs"])
+        combined = pd.concat([summary.assign(File=name) for name, summary in summaries.items()], ignore_index=True)
+        quantities = combined.pivot_table(index="Material", columns="File", values="Quantity", aggfunc="sum")
+        described = combined.groupby("Material")["Description"].first()
+        matrix = pd.concat([described, quantities.notna().sum(axis=1).rename("BOMs"), quantities], axis=1)
+        matrix.columns.name = None
+        return matrix.reset_index()
+
+    def export_matrix(self, path):
+        """Write the cross-reference matrix to .xlsx or .csv."""
+        matrix = self.matrix()
+        if path.lower().endswith(".csv"):
+            matrix.to_csv(path, index=False, encoding="utf-8-sig")
+        else:
+            matrix.to_excel(path, index=False)
+        return matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Where-used lookup and cross-reference matrix of the SMT_BOM workbooks.")
+    parser.add_argument("materials", nargs="*", help="Materials to look up")
+    parser.add_argument("--folder", default=BOM_FOLDER, help="BOM folder (default the SMT_BOM share)")
+    parser.add_argument("--matrix", help="Write the full cross-reference matrix to this .xlsx/.csv")
+    args = parser.parse_args()
+
+    where_used = WhereUsedMap(args.folder)
+    changed = where_used.sync()
+    print(f"{len(where_used.files())} workbooks, {len(changed)} re-read")
+    for material in args.materials:
+        uses = where_used.query(material)
+        print(f"{material}: used in {len(uses)} BOM(s)")
+        for file_name, quantity, description, rows in uses:
+            print(f"    {file_name}\t{quantity:g}\t{description}")
+    if args.matrix:
+        matrix = where_used.export_matrix(args.matrix)
+        print(f"{len(matrix)} materials written to {args.matrix}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import math
+import statistics
+
+import pandas as pd
+import pytest
+
+import LCRperf
+import LCRsearch
+from LCRcheck import evaluate_measurements, parse_tolerance, parse_tolerance_limits
+from LCRingest import LogFollower, read_log, unreadable
+from LCRsearch import normalize_material, normalize_materials, read_bom
+from LCRspc import RunningStats
+from LCRunits import parse_quantity, parse_series
+
+
+def _write(path, text):
+    with open(path, "a", newline="", encoding="utf-8") as log:
+        log.write(text)
+
+
+@pytest.mark.parametrize("header", ["Material,Value,Unit\n", '"Material","Value","Unit"\n', "Material\tValue\tUnit\n"])
+def test_log_follower_reads_header_like_read_log(tmp_path, header):
+    path = tmp_path / "meter.csv"
+    delimiter = "\t" if "\t" in header else ","
+    _write(path, header + delimiter.join(["C100", "10.1", "nF"]) + "\n")
+    follower = LogFollower(str(path))
+    readings = follower.poll()
+    assert list(readings["Material"]) == ["C100"]
+    assert readings["Value (SI)"].iloc[0] == pytest.approx(10.1e-9)
+    assert list(next(read_log(str(path)))["Material"]) == ["C100"]
+
+
+def test_log_follower_returns_only_complete_appended_rows(tmp_path):
+    path = tmp_path / "meter.csv"
+    _write(path, "Material,Value\nC100,10nF\nC2")
+    follower = LogFollower(str(path))
+    assert list(follower.poll()["Material"]) == ["C100"]
+    assert follower.poll().empty
+    _write(path, "00,4.7uF\n")
+    readings = follower.poll()
+    assert list(readings["Material"]) == ["C200"]
+    assert readings["Value (SI)"].iloc[0] == pytest.approx(4.7e-6)
+
+
+def test_log_follower_poll_stops_at_until(tmp_path):
+    path = tmp_path / "meter.csv"
+    _write(path, "Material,Value\nC100,10nF\n")
+    end_of_first = path.stat().st_size
+    _write(path, "C200,22nF\n")
+    follower = LogFollower(str(path))
+    assert list(follower.poll(until=end_of_first)["Material"]) == ["C100"]
+    assert follower.position == end_of_first
+    assert list(follower.poll()["Material"]) == ["C200"]
+
+
+def test_spc_store_keeps_meter_log_position(tmp_path):
+    from LCRspc import SPCStore
+
+    log_path = tmp_path / "meter.csv"
+    _write(log_path, "Material,Value\nC100,10nF\nC100,10.2nF\n")
+    follower = LogFollower(str(log_path))
+    store = SPCStore(str(tmp_path / "spc.json"))
+    store.add_readings(follower.poll(), str(log_path), follower.position)
+    store.save()
+
+    reloaded = SPCStore(str(tmp_path / "spc.json"))
+    assert reloaded.log_position(str(log_path)) == log_path.stat().st_size
+    assert reloaded.streams[("C100", "", "", "F")].count == 2
+
+
+def test_meter_log_units_are_base_units_in_both_layouts(tmp_path):
+    with_unit = tmp_path / "unit.csv"
+    _write(with_unit, "Material,Value,Unit\nC100,10,uF\nR100,4.7,kOhm\nX1,1,zz\n")
+    as_text = tmp_path / "text.csv"
+    _write(as_text, "Material,Value\nC100,10uF\n")
+    readings = next(read_log(str(with_unit)))
+    assert list(readings["Unit"]) == ["F", "Ω", ""]
+    assert readings["Value (SI)"].iloc[1] == pytest.approx(4700)
+    assert unreadable(readings) == ["1zz"]
+    assert list(next(read_log(str(as_text)))["Unit"]) == ["F"]
+
+
+@pytest.mark.parametrize("value", [123456, 123456.0, "123456.0", " 00123456", "1.23456E+5", "123 456"])
+def test_normalize_material_numeric_spellings_share_a_key(value):
+    assert normalize_material(value) == "123456"
+
+
+def test_normalize_materials_keeps_text_and_blanks():
+    keys = normalize_materials(pd.Series(["abc-1", None, 42, "0042"], dtype=object))
+    assert list(keys) == ["ABC-1", "", "42", "42"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("10uF", (10e-6, "F")), ("2.2 nH", (2.2e-9, "H")), ("1kΩ", (1e3, "Ω")), ("4k7", (4.7e3, "")),
+    ("1R5", (1.5, "Ω")), ("R47", (0.47, "Ω")), ("4.7kOhm", (4.7e3, "Ω")), ("100", (100, "")),
+])
+def test_parse_quantity(text, expected):
+    value, unit = parse_quantity(text)
+    assert value == pytest.approx(expected[0])
+    assert unit == expected[1]
+
+
+def test_parse_quantity_rejects_text():
+    value, unit = parse_quantity("not a value")
+    assert math.isnan(value) and unit == ""
+
+
+def test_parse_series_matches_parse_quantity():
+    texts = pd.Series(["10uF", "4k7", "10uF", "junk", "2.2nH"])
+    parsed = parse_series(texts)
+    for text, value, unit in zip(texts, parsed["Value"], parsed["Unit"]):
+        expected_value, expected_unit = parse_quantity(text)
+        assert unit == expected_unit
+        assert value == pytest.approx(expected_value, nan_ok=True)
+
+
+def test_running_stats_match_batch_statistics():
+    values = [10.0, 10.2, 9.9, 10.1, 10.3, 9.8, 10.0]
+    stats = RunningStats(lower=9.0, upper=11.0)
+    for value in values:
+        assert stats.add(value) == []
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.std == pytest.approx(statistics.stdev(values))
+    assert stats.cp == pytest.approx(2.0 / (6 * statistics.stdev(values)))
+    assert RunningStats.from_dict(stats.to_dict()).mean == pytest.approx(stats.mean)
+
+
+def test_running_stats_alarms():
+    assert RunningStats(lower=9.0, upper=11.0).add(12.0) == ["Outside tolerance"]
+
+    stats = RunningStats(subgroup_size=2, baseline=2)
+    for value in (10.0, 10.1, 9.9, 10.0):
+        assert stats.add(value) == []
+    assert stats.limits["xbar_cl"] == pytest.approx(10.0)
+    assert stats.add(10.9) == []
+    assert stats.add(10.9) == ["X-bar beyond control limits"]
+
+
+def test_read_bom_finds_header_below_title_rows(tmp_path, monkeypatch):
+    from openpyxl import Workbook
+
+    monkeypatch.setattr(LCRsearch, "SCHEMA_CACHE", str(tmp_path / "cache" / "schemas.json"))
+    monkeypatch.setattr(LCRsearch, "_schemas", None)
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "TOP"
+    sheet.append(["Board X BOM"])
+    sheet.append([])
+    sheet.append(["Item", "Internal P/N", "Description", "Qty"])
+    sheet.append([1, 123456, "CAP 10uF", 2])
+    sheet.append([2, None, "blank", 1])
+    sheet.append([3, "R-100", "RES 1k", 4])
+    path = tmp_path / "bom.xlsx"
+    workbook.save(path)
+
+    bom = read_bom(str(path))
+    assert list(bom.columns) == ["Material", "Long. Description", "Quantity", "Sheet"]
+    assert list(bom["Material"].iloc[[0, 2]]) == [123456, "R-100"]
+    assert list(bom["Quantity"]) == [2, 1, 4]
+
+
+def test_tolerance_limits():
+    cells = pd.Series(["5", "±5 %", "+/-0.5", "+10/-5", "-5% +10%", "+10/+5", "5-10", None])
+    limits = parse_tolerance_limits(cells)
+    assert limits.iloc[:5].values.tolist() == [[5, 5], [5, 5], [0.5, 0.5], [5, 10], [5, 10]]
+    assert limits.iloc[5:].isna().all().all()
+    assert parse_tolerance(cells).iloc[:3].tolist() == [5, 5, 0.5]
+    assert math.isnan(parse_tolerance(cells).iloc[3])
+
+
+def test_evaluate_asymmetric_tolerance():
+    records = pd.DataFrame({"Standard Value": ["10uF"] * 3, "Measured Value": ["10.8uF", "9.4uF", "9.6uF"],
+                            "Standard Tol%": ["+10/-5"] * 3})
+    result = evaluate_measurements(records)
+    assert result["Within Standard Tol"].tolist() == [True, False, True]
+    assert result["Margin%"].tolist() == pytest.approx([2, -1, 1])
+
+
+def test_operation_hands_back_its_summary(monkeypatch):
+    monkeypatch.setattr(LCRperf, "_log", lambda entry: None)
+    with LCRperf.operation("Find") as timing:
+        with LCRperf.span("read"):
+            pass
+        with LCRperf.span("read"):
+            pass
+    assert timing["summary"].startswith("Find: ")
+    assert "read x2" in timing["summary"]
+
+
+def test_batch_convert_blanks_other_quantities():
+    from argparse import Namespace
+
+    from LCRbatch import convert_chunk
+
+    chunk = pd.DataFrame({"Value": ["4.7", "2.2", "10"], "Unit": ["kΩ", "nH", "uF"]})
+    args = Namespace(value_col="Value", unit_col="Unit", to_unit="nF", component=None)
+    converted = convert_chunk(chunk, args)["Value (nF)"]
+    assert converted.iloc[:2].isna().all()
+    assert converted.iloc[2] == pytest.approx(10000)